@@ -0,0 +1,97 @@
+"""
+Batch job-listing analyzer.
+
+Reads job listings as JSONL from a file or stdin and streams analysis results
+as JSONL. Each input line is either a JSON string or an object with a "text"
+(or "job_listing") field and an optional "id".
+
+Usage:
+    python analyze_jobs.py jobs.jsonl -o results.jsonl --workers 8
+    cat jobs.jsonl | python analyze_jobs.py > results.jsonl
+"""
+import argparse
+import json
+import sys
+import time
+
+from modules.job_analyzer import analyze_job_listings
+
+def read_listings(stream, ids, skipped=None):
+    """
+    Lazily read job listings from a JSONL stream.
+
+    Lines that are not valid JSON, or are neither a string nor an object,
+    are reported on stderr with their line number and skipped, so one bad
+    record does not end a run.
+
+    Args:
+        stream: Text stream of JSONL records
+        ids (dict): Filled with the record id for each yielded listing index
+        skipped (list): If given, receives the line number of each skipped line
+
+    Yields:
+        str: Job listing text
+    """
+    index = 0
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            error = None
+            if not isinstance(record, (str, dict)):
+                error = f"expected a string or object, got {type(record).__name__}"
+        except ValueError as e:
+            error = f"invalid JSON ({e})"
+        if error:
+            print(f"Skipping line {line_number}: {error}", file=sys.stderr)
+            if skipped is not None:
+                skipped.append(line_number)
+            continue
+        if isinstance(record, str):
+            record_id, text = line_number, record
+        else:
+            record_id = record.get('id', line_number)
+            text = record.get('text') or record.get('job_listing') or ''
+        ids[index] = record_id
+        index += 1
+        yield text
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Analyze job listings in bulk.')
+    parser.add_argument('input', nargs='?', default='-', help='JSONL input file (default: stdin)')
+    parser.add_argument('-o', '--output', default='-', help='JSONL output file (default: stdout)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('-c', '--chunksize', type=int, default=32, help='Listings per worker task')
+    parser.add_argument('--unordered', action='store_true', help='Emit results as they complete')
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+
+    # Ids of listings still in flight; entries are dropped once written
+    ids = {}
+    skipped = []
+    count = 0
+    start = time.perf_counter()
+    try:
+        results = analyze_job_listings(read_listings(source, ids, skipped), workers=args.workers,
+                                       chunksize=args.chunksize, ordered=not args.unordered)
+        for index, job_data in results:
+            sink.write(json.dumps({'id': ids.pop(index), 'result': job_data}) + '\n')
+            count += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"Analyzed {count} listings in {elapsed:.2f}s ({rate:.1f} listings/sec), "
+          f"skipped {len(skipped)} bad lines", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
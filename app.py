@@ -2,24 +2,101 @@
 Main Flask application for the Resume Optimizer.
 """
 import os
+import json
+import logging
+import time
 import uuid
-from flask import Flask, request, render_template, redirect, url_for, flash, send_file, session
+from flask import (Flask, request, render_template, redirect, url_for, flash, send_file, session,
+                   jsonify, Response, g)
 from werkzeug.utils import secure_filename
 
 # Import configuration
 import config
 
 # Import modules
-from modules.resume_parser import parse_resume
-from modules.job_analyzer import analyze_job_listing
-from modules.optimizer import optimize_resume
-from modules.docx_generator import generate_docx
+from modules import docx_templates, gemini_client, metrics
+from modules.llm_cache import get_default_cache
+from modules.parse_cache import new_parse_cache
+from modules.pipeline import optimize_parsed_resume
+from modules.fanout import stream_fanout, submit_fanout
+from modules.jobs import JobManager, JobQueueFull, DONE, FAILED
+from modules.result_store import ResultStore
+from modules.session_store import ServerSessionInterface, backend_from_config
+from modules.upload_store import Sweeper, UploadStore
+
+# Module loggers (e.g. parser fallbacks) share the app's log output
+logging.basicConfig(level=config.LOG_LEVEL, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = config.SECRET_KEY
 app.config['UPLOAD_FOLDER'] = config.UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = config.MAX_CONTENT_LENGTH
 
+# Session data lives on the server; the cookie only holds a signed session ID
+session_backend = backend_from_config()
+app.session_interface = ServerSessionInterface(session_backend)
+
+# Parsed resumes keyed by file content, shared by all requests in this worker;
+# headings are classified with any configured synonyms
+parse_cache = new_parse_cache(
+    db_path=config.PARSE_CACHE_PATH,
+    memory_entries=config.PARSE_CACHE_MEMORY_ENTRIES,
+    max_bytes=config.PARSE_CACHE_MAX_BYTES,
+    max_age=config.PARSE_CACHE_MAX_AGE
+)
+
+# Background executor for optimizations, so requests return immediately
+job_manager = JobManager(
+    max_workers=config.JOB_WORKERS,
+    max_pending=config.JOB_MAX_PENDING,
+    ttl=config.JOB_TTL
+)
+
+# Generated resumes keyed by result ID, so users with the same filename never collide
+result_store = ResultStore(
+    max_memory_bytes=config.RESULT_MEMORY_BYTES,
+    spill_dir=config.RESULT_SPILL_FOLDER,
+    ttl=config.JOB_TTL
+)
+
+# Uploaded resumes, stored once per distinct file and referenced from sessions
+upload_store = UploadStore(
+    config.UPLOAD_FOLDER,
+    ttl=config.UPLOAD_TTL,
+    max_bytes=config.UPLOAD_MAX_BYTES
+)
+
+# Expire old uploads, results, jobs and sessions in the background
+sweeper = Sweeper(config.SWEEP_INTERVAL, [upload_store.sweep, result_store.sweep, job_manager.sweep,
+                                          session_backend.sweep]).start()
+
+# Cache hit rates and sizes on /metrics
+metrics.add_cache('parse', parse_cache.stats, ('memory_hits', 'disk_hits', 'misses', 'memory_evictions',
+                                               'disk_evictions'), entries='memory_entries')
+metrics.add_cache('llm', lambda: get_default_cache().stats(), ('hits', 'misses', 'coalesced', 'evictions'),
+                  entries='entries')
+metrics.add_cache('results', result_store.stats, ('memory_hits', 'disk_hits', 'misses', 'spills', 'drops',
+                                                  'expired'), entries='entries')
+metrics.add_cache('uploads', upload_store.stats, ('uploads', 'deduplicated', 'expired_refs', 'deleted_blobs',
+                                                  'evicted_blobs'), entries='blobs')
+
+# Build the DOCX style templates now so the first render doesn't pay for it
+if config.TEMPLATE_WARMUP:
+    docx_templates.warm_up()
+
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    """Record request latency by endpoint; streamed responses count until headers are sent."""
+    started = g.pop('request_started', None)
+    if started is not None:
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=request.endpoint or 'unknown',
+                                        method=request.method, status=response.status_code)
+    return response
+
 def allowed_file(filename):
     """Check if the file extension is allowed."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in config.ALLOWED_EXTENSIONS
@@ -51,19 +128,29 @@ def upload():
         
         # Process the resume file
         if resume_file and allowed_file(resume_file.filename):
-            # Generate a unique filename to prevent collisions
             original_filename = secure_filename(resume_file.filename)
-            filename_base, filename_ext = os.path.splitext(original_filename)
-            unique_filename = f"{filename_base}_{str(uuid.uuid4())}{filename_ext}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
             
-            # Save the file
-            resume_file.save(filepath)
+            # Parse straight from the upload stream; only the parse result is kept
+            resume_bytes = resume_file.read()
+            metrics.UPLOAD_BYTES.observe(len(resume_bytes))
+            try:
+                resume_key, _ = parse_cache.parse(resume_bytes)
+            except Exception as e:
+                print(f"Error parsing upload: {str(e)}")
+                flash('Could not read this resume. Please upload a valid .docx file.')
+                return redirect(request.url)
             
-            # Store file path and job listing in session
-            session['resume_path'] = filepath
+            # Keep the raw file only if configured (identical files share one stored copy)
+            if config.UPLOAD_PERSIST:
+                session['upload_ref'] = upload_store.add(resume_bytes)
+            else:
+                session.pop('upload_ref', None)
+            
+            # Store the parse cache key and job listing in session
+            session['resume_key'] = resume_key
             session['job_listing'] = job_listing
             session['original_filename'] = original_filename
+            session.pop('job_id', None)
             
             # Redirect to optimization process
             return redirect(url_for('optimize'))
@@ -73,88 +160,218 @@ def upload():
     
     return render_template('upload.html')
 
+def wants_json():
+    """Check if the client prefers a JSON response over HTML."""
+    return request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json'
+
+def current_job():
+    """Get the optimization job recorded in the session, if it has not expired."""
+    return job_manager.get(session.get('job_id'))
+
+def current_result(job):
+    """Get the stored DOCX for a finished job, if it has not expired."""
+    if job is None or job.state != DONE:
+        return None
+    return result_store.get(job.result['result_id'])
+
+def load_resume(resume_key, upload_ref=None):
+    """Get a parsed upload, reparsing the stored file if the parse cache dropped it."""
+    resume_data = parse_cache.get(resume_key) if resume_key else None
+    if resume_data is None and upload_ref:
+        resume_path = upload_store.path(upload_ref)
+        if resume_path is not None:
+            _, resume_data = parse_cache.parse(resume_path)
+    return resume_data
+
+def optimize_to_store(result_id, resume_data, job_listing, original_filename):
+    """Run the optimization pipeline in memory and keep the DOCX in the result store."""
+    output = optimize_parsed_resume(resume_data, job_listing, original_filename)
+    result_store.put(result_id, output['content'], output['output_filename'])
+    return {
+        'result_id': result_id,
+        'output_filename': output['output_filename']
+    }
+
 @app.route('/optimize')
 def optimize():
-    try:
-        print("Starting optimization process...")
-        # Get file path and job listing from session
-        resume_path = session.get('resume_path')
-        job_listing = session.get('job_listing')
-        
-        if not resume_path or not job_listing:
-            print("Resume path or job listing missing")
-            flash('Resume or job listing information missing')
+    """Submit the optimization as a background job and return its ID."""
+    # Get the parsed resume's key and job listing from session
+    resume_key = session.get('resume_key')
+    job_listing = session.get('job_listing')
+    
+    if not resume_key or not job_listing:
+        print("Resume or job listing missing")
+        flash('Resume or job listing information missing')
+        return redirect(url_for('upload'))
+    
+    # Reuse the job already submitted for this upload (e.g. on page refresh)
+    job = current_job()
+    if job is None or job.state == FAILED:
+        resume_data = load_resume(resume_key, session.get('upload_ref'))
+        if resume_data is None:
+            print(f"Parsed resume not found or expired: {resume_key}")
+            flash('Resume not found. Please upload it again.')
             return redirect(url_for('upload'))
         
-        if not os.path.exists(resume_path):
-            print(f"File not found: {resume_path}")
-            flash('Resume file not found')
+        try:
+            job_id = job_manager.submit(
+                optimize_to_store,
+                uuid.uuid4().hex,
+                resume_data,
+                job_listing,
+                session.get('original_filename', 'resume')
+            )
+        except JobQueueFull as e:
+            print(f"Rejecting optimization: {str(e)}")
+            if wants_json():
+                return jsonify({'error': 'Server busy, please try again shortly'}), 503
+            flash('The optimizer is busy right now. Please try again in a moment.')
             return redirect(url_for('upload'))
-            
-        # Parse the resume
-        print("Parsing resume...")
-        resume_data = parse_resume(resume_path)
-        print("Resume parsed successfully")
-        
-        # Analyze the job listing
-        print("Analyzing job listing...")
-        job_data = analyze_job_listing(job_listing)
-        print("Job listing analyzed")
-        
-        # Optimize the resume
-        print("Optimizing resume...")
-        optimized_resume = optimize_resume(resume_data, job_data)
-        print("Resume optimized")
-        
-        # Generate the optimized DOCX file
-        print("Generating DOCX...")
-        original_filename = session.get('original_filename', 'resume')
-        filename_base = os.path.splitext(original_filename)[0]
-        output_filename = f"{filename_base}_optimized.docx"
-        output_path = os.path.join(app.config['UPLOAD_FOLDER'], output_filename)
-        
-        # Ensure uploads directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        generate_docx(optimized_resume, output_path)
-        print(f"DOCX generated at: {output_path}")
-        
-        # Store the output path in session
-        session['output_path'] = output_path
-        session['output_filename'] = output_filename
-        
-        return redirect(url_for('result'))
+        session['job_id'] = job_id
+        job = job_manager.get(job_id)
     
-    except Exception as e:
-        import traceback
-        print(f"ERROR in optimization process: {str(e)}")
-        print(traceback.format_exc())
-        flash(f'Error optimizing resume: {str(e)}')
-        return redirect(url_for('upload'))
+    if wants_json():
+        return jsonify({
+            'job_id': job.id,
+            'status_url': url_for('status', job_id=job.id)
+        }), 202
+    
+    return render_template('processing.html', job_id=job.id)
+
+@app.route('/status/<job_id>')
+def status(job_id):
+    """Report the state of an optimization job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    
+    payload = job.to_dict()
+    if job.state == DONE:
+        payload['result_url'] = url_for('result')
+    return jsonify(payload)
+
+@app.route('/storage')
+def storage():
+    """Report upload and result store sizes and sweep statistics."""
+    return jsonify({
+        'uploads': upload_store.stats(),
+        'results': result_store.stats()
+    })
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Expose stage latencies, errors, upload sizes and cache counters to Prometheus."""
+    return Response(metrics.REGISTRY.exposition(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/events/<job_id>')
+def events(job_id):
+    """Stream a job's stage events to the browser as Server-Sent Events."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    
+    reporter = job.progress
+    result_url = url_for('result')
+    # Resume after a reconnect from the last event the browser saw
+    last_seq = request.headers.get('Last-Event-ID', type=int) or 0
+    
+    def stream():
+        seq = last_seq
+        while True:
+            new_events, closed = reporter.events_after(seq, timeout=config.SSE_KEEPALIVE)
+            for event in new_events:
+                seq = event['seq']
+                if event['stage'] == 'job':
+                    event = dict(event, result_url=result_url)
+                yield f"id: {seq}\nevent: stage\ndata: {json.dumps(event)}\n\n"
+            if closed and not new_events:
+                yield "event: end\ndata: {}\n\n"
+                return
+            if not new_events:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/result')
 def result():
     """Show optimization results and provide download link."""
-    output_path = session.get('output_path')
-    output_filename = session.get('output_filename')
+    job = current_job()
+    if job is None:
+        flash('Optimized resume not found')
+        return redirect(url_for('upload'))
+    
+    if job.pending:
+        return render_template('processing.html', job_id=job.id)
+    
+    if job.state == FAILED:
+        flash(f'Error optimizing resume: {job.error}')
+        return redirect(url_for('upload'))
     
-    if not output_path or not os.path.exists(output_path):
+    if current_result(job) is None:
         flash('Optimized resume not found')
         return redirect(url_for('upload'))
     
-    return render_template('result.html', filename=output_filename)
+    return render_template('result.html', filename=job.result['output_filename'])
 
 @app.route('/download')
 def download():
     """Download the optimized resume."""
-    output_path = session.get('output_path')
-    output_filename = session.get('output_filename')
+    stored = current_result(current_job())
     
-    if not output_path or not os.path.exists(output_path):
+    if stored is None:
         flash('Optimized resume not found')
         return redirect(url_for('upload'))
     
-    return send_file(output_path, as_attachment=True, download_name=output_filename)
+    # Served from memory (or the spill file) with an ETag so repeat downloads can 304
+    return send_file(
+        stored.open(),
+        mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        as_attachment=True,
+        download_name=stored.filename,
+        etag=stored.etag,
+        last_modified=stored.created,
+        conditional=True
+    )
+
+@app.route('/fanout', methods=['POST'])
+def fanout():
+    """Optimize one resume for several job listings and stream the results back as a zip archive."""
+    resume_file = request.files.get('resume')
+    if resume_file is None or not allowed_file(resume_file.filename):
+        return jsonify({'error': 'A .docx resume is required'}), 400
+    
+    # One job_listing field per posting
+    job_listings = [text.strip() for text in request.form.getlist('job_listing') if text.strip()]
+    if not job_listings:
+        return jsonify({'error': 'At least one job listing is required'}), 400
+    # A request larger than the fan-out share of the queue could never be accepted
+    max_listings = min(config.FANOUT_MAX_LISTINGS, config.FANOUT_MAX_PENDING)
+    if len(job_listings) > max_listings:
+        return jsonify({'error': f'At most {max_listings} job listings per request'}), 400
+    
+    original_filename = secure_filename(resume_file.filename)
+    resume_bytes = resume_file.read()
+    metrics.UPLOAD_BYTES.observe(len(resume_bytes))
+    try:
+        _, resume_data = parse_cache.parse(resume_bytes)
+    except Exception as e:
+        print(f"Error parsing upload: {str(e)}")
+        return jsonify({'error': 'Could not read this resume. Please upload a valid .docx file.'}), 400
+    
+    try:
+        results = submit_fanout(job_manager, result_store, resume_data, job_listings, original_filename)
+    except JobQueueFull as e:
+        print(f"Rejecting fan-out of {len(job_listings)} listings: {str(e)}")
+        return jsonify({'error': 'Server busy, please try again shortly'}), 503
+    
+    archive_name = f"{os.path.splitext(original_filename)[0]}_optimized.zip"
+    return Response(stream_fanout(results, result_store, resume_data, job_listings, original_filename),
+                    mimetype='application/zip',
+                    headers={'Content-Disposition': f'attachment; filename="{archive_name}"',
+                             'X-Accel-Buffering': 'no'})
 
 @app.errorhandler(413)
 def request_entity_too_large(error):
@@ -162,5 +379,13 @@ def request_entity_too_large(error):
     flash('File too large. Maximum size is 16MB.')
     return redirect(url_for('upload'))
 
+@app.cli.command('warmup')
+def warmup_command():
+    """Create the Gemini client and validate the API key."""
+    gemini_client.warm_up()
+    print("Gemini client ready")
+
 if __name__ == '__main__':
+    if config.GEMINI_WARMUP:
+        gemini_client.warm_up()
     app.run(debug=True)
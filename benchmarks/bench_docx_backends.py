@@ -0,0 +1,70 @@
+"""
+Throughput and peak memory of the python-docx and direct OOXML renderers.
+
+Renders the same synthetic resume repeatedly into memory with each backend,
+checks that both produce the same package, and reports documents per second
+and the peak traced allocation of a single render.
+
+Usage:
+    python -m benchmarks.bench_docx_backends --docs 200 --jobs 8 --bullets 6
+"""
+import argparse
+import io
+import sys
+import time
+import tracemalloc
+import zipfile
+
+from benchmarks.bench_section_optimizer import synthetic_resume
+from modules import docx_templates
+from modules.docx_generator import generate_docx
+
+BACKENDS = ('python-docx', 'ooxml')
+
+def render(resume, backend, template):
+    buffer = io.BytesIO()
+    generate_docx(resume, buffer, template=template, backend=backend)
+    return buffer.getvalue()
+
+def package_parts(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare DOCX renderer backends.')
+    parser.add_argument('--docs', type=int, default=200, help='Documents rendered per backend')
+    parser.add_argument('--jobs', type=int, default=8, help='Experience entries per resume')
+    parser.add_argument('--bullets', type=int, default=6, help='Bullets per experience entry')
+    parser.add_argument('--template', default='professional', choices=sorted(docx_templates.TEMPLATES))
+    args = parser.parse_args(argv)
+
+    resume = synthetic_resume(args.jobs, args.bullets)
+    docx_templates.warm_up([args.template])
+
+    outputs = {backend: render(resume, backend, args.template) for backend in BACKENDS}
+    if package_parts(outputs['python-docx']) != package_parts(outputs['ooxml']):
+        print("FAIL: backends produced different packages", file=sys.stderr)
+        return 1
+
+    rates = {}
+    for backend in BACKENDS:
+        start = time.perf_counter()
+        for _ in range(args.docs):
+            render(resume, backend, args.template)
+        elapsed = time.perf_counter() - start
+        rates[backend] = args.docs / elapsed
+
+        tracemalloc.start()
+        render(resume, backend, args.template)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{backend:>12}: {rates[backend]:7.1f} docs/sec, peak {peak / 1024:8.1f} KiB per render, "
+              f"{len(outputs[backend])} bytes")
+
+    print(f"speedup: {rates['ooxml'] / rates['python-docx']:.1f}x "
+          f"({args.jobs} jobs x {args.bullets} bullets, identical output)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Wall-clock comparison of the single-prompt and per-section Gemini optimizers.
+
+Runs entirely offline against the fake model: in-process by default, or
+through the local fake HTTP server with --server (requires the
+google-generativeai SDK). Caches are fresh for every run so each measurement
+includes the model calls.
+
+Usage:
+    python -m benchmarks.bench_section_optimizer --jobs 8 --latency 0.5 --per-token 0.002
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+def synthetic_resume(jobs, bullets):
+    """Build a parsed-resume dict with the given number of jobs and bullets per job."""
+    return {
+        'contact_info': {'name': 'Alex Example', 'email': 'alex@example.com', 'phone': '(555) 010-0000',
+                         'location': 'Vancouver, BC', 'linkedin': '', 'website': ''},
+        'summary': 'Operations professional with a record of improving customer experience. ' * 3,
+        'skills': ['Customer Service', 'Scheduling', 'Microsoft Excel', 'Team Leadership', 'Training'],
+        'experience': [
+            {
+                'title': f'Role {i}',
+                'company': f'Company {i}',
+                'location': 'Vancouver, BC',
+                'date_range': f'Jan {2010 + i} - Dec {2010 + i}',
+                'description': [f'Delivered measurable improvement number {b} across the team and clients'
+                                for b in range(bullets)],
+            }
+            for i in range(jobs)
+        ],
+        'education': [],
+        'projects': '', 'certifications': '', 'languages': '', 'interests': '', 'other': '',
+        'raw_text': '',
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare single-prompt and per-section optimizers.')
+    parser.add_argument('--jobs', type=int, default=8, help='Experience entries in the resume')
+    parser.add_argument('--bullets', type=int, default=6, help='Bullets per experience entry')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.5, help='Fake model base latency per call')
+    parser.add_argument('--per-token', type=float, default=0.002, help='Fake model seconds per output token')
+    parser.add_argument('--server', action='store_true', help='Go through the fake HTTP server')
+    args = parser.parse_args(argv)
+
+    from benchmarks.fake_gemini import FakeModel, serve
+    model = FakeModel(latency=args.latency, per_token=args.per_token)
+    if args.server:
+        server = serve(port=0, model=model)
+        os.environ['GEMINI_API_ENDPOINT'] = f"http://127.0.0.1:{server.server_address[1]}"
+        os.environ.setdefault('GEMINI_API_KEY', 'fake-key')
+
+    import config
+    config.GEMINI_API_ENDPOINT = os.environ.get('GEMINI_API_ENDPOINT', '')
+    config.GEMINI_API_KEY = config.GEMINI_API_KEY or 'fake-key'
+    # The fake model is not rate limited; keep the limiter out of the measurement
+    config.GEMINI_REQUESTS_PER_MINUTE = 100000
+    config.GEMINI_TOKENS_PER_MINUTE = 10 ** 9
+
+    from modules import gemini_client
+    from modules.job_analyzer import analyze_job_listing
+    from modules.llm_cache import MemoryBackend, ResponseCache
+    from modules.optimizer import optimize_resume_with_gemini
+    from modules.section_optimizer import optimize_resume_concurrent
+
+    if not args.server:
+        gemini_client.set_model(model)
+
+    resume = synthetic_resume(args.jobs, args.bullets)
+    job_data = analyze_job_listing('Customer service lead with scheduling, Excel and team leadership.')
+
+    results = {}
+    for name, optimize in (('single prompt', optimize_resume_with_gemini),
+                           ('per section', optimize_resume_concurrent)):
+        times = []
+        calls_before = model.calls
+        for _ in range(args.runs):
+            cache = ResponseCache(MemoryBackend())
+            start = time.perf_counter()
+            optimize(resume, job_data, cache=cache)
+            times.append(time.perf_counter() - start)
+        results[name] = statistics.median(times)
+        print(f"{name:>14}: median {results[name]:.2f}s over {args.runs} runs, "
+              f"{(model.calls - calls_before) // args.runs} model calls per resume")
+
+    print(f"speedup: {results['single prompt'] / results['per section']:.1f}x "
+          f"({args.jobs} jobs x {args.bullets} bullets)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Startup-time benchmark: measures ``import app`` in fresh interpreters.
+
+Fails (exit code 1) if the median import time exceeds the budget, or if
+importing the app pulls in the Gemini SDK or contacts the network.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 10 --budget 1.0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Measured inside the child so interpreter startup itself is excluded
+PROBE = (
+    "import sys, time, json\n"
+    "start = time.perf_counter()\n"
+    "import app\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(json.dumps({'seconds': elapsed,"
+    " 'sdk_loaded': 'google.generativeai' in sys.modules}))\n"
+)
+
+def measure_import(env):
+    """Import the app in a fresh interpreter and return its probe result."""
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE], cwd=REPO_ROOT, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure app import time against a budget.')
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters to measure')
+    parser.add_argument('--budget', type=float, default=1.0, help='Maximum median import time in seconds')
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    # An unroutable endpoint makes any import-time network call fail loudly
+    env['GEMINI_API_ENDPOINT'] = 'http://127.0.0.1:9'
+    env.pop('GEMINI_WARMUP', None)
+
+    measure_import(env)  # Warm the filesystem cache and bytecode
+    results = [measure_import(env) for _ in range(args.runs)]
+    times = sorted(r['seconds'] for r in results)
+    median = statistics.median(times)
+
+    print(f"import app: median {median * 1000:.1f}ms, "
+          f"min {times[0] * 1000:.1f}ms, max {times[-1] * 1000:.1f}ms over {args.runs} runs "
+          f"(budget {args.budget * 1000:.0f}ms)")
+
+    failed = False
+    if any(r['sdk_loaded'] for r in results):
+        print("FAIL: importing app loaded google.generativeai")
+        failed = True
+    if median > args.budget:
+        print("FAIL: import time over budget")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Microbenchmarks of the resume pipeline with JSON baselines.
+
+Times each pipeline function on deterministic synthetic input (see
+benchmarks.synthetic) and records the fastest and median time per call and
+the peak traced allocation of one call. Results can be saved as a JSON
+baseline; in compare mode the run fails (exit code 1) if any function is
+slower, or allocates more, than its baseline by more than the threshold.
+The fastest time per call is compared, as it is the least noisy.
+
+Usage:
+    python -m benchmarks.bench_suite --size medium --save benchmarks/baselines/medium.json
+    python -m benchmarks.bench_suite --size medium --compare benchmarks/baselines/medium.json --threshold 0.2
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+
+from benchmarks.synthetic import SIZES, job_listing, resume_docx
+from modules.docx_generator import generate_docx
+from modules.job_analyzer import analyze_job_listing
+from modules.optimizer import optimize_resume
+from modules.resume_parser import (extract_education, extract_experience, extract_text_from_docx,
+                                   identify_sections, parse_resume)
+
+def build_cases(params, seed):
+    """
+    Prepare the inputs of every benchmarked function.
+
+    Args:
+        params (dict): Synthetic resume size (see synthetic.SIZES)
+        seed (int): Random seed for the synthetic inputs
+
+    Returns:
+        dict: Case name to a zero-argument callable
+    """
+    data = resume_docx(seed=seed, **params)
+    text = extract_text_from_docx(io.BytesIO(data))
+    sections = identify_sections(text)
+    job_text = job_listing(seed=seed)
+    job_data = analyze_job_listing(job_text)
+    resume = parse_resume(io.BytesIO(data))
+    optimized = optimize_resume(resume, job_data)
+
+    return {
+        'extract_text_from_docx': lambda: extract_text_from_docx(io.BytesIO(data)),
+        'identify_sections': lambda: identify_sections(text),
+        'extract_experience': lambda: extract_experience(sections['experience']),
+        'extract_education': lambda: extract_education(sections['education']),
+        'analyze_job_listing': lambda: analyze_job_listing(job_text),
+        'optimize_resume': lambda: optimize_resume(resume, job_data),
+        'generate_docx[python-docx]': lambda: generate_docx(optimized, io.BytesIO(), backend='python-docx'),
+        'generate_docx[ooxml]': lambda: generate_docx(optimized, io.BytesIO(), backend='ooxml'),
+    }
+
+def measure(fn, repeat):
+    """
+    Time a function and trace its peak allocation.
+
+    Args:
+        fn (callable): Function to measure
+        repeat (int): Timing samples; each runs enough calls to take ~0.2s
+
+    Returns:
+        dict: Fastest and median seconds per call, calls per sample and peak bytes
+    """
+    fn()  # Warm caches and lazy imports
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    samples = [seconds / number for seconds in timer.repeat(repeat=repeat, number=number)]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'min': min(samples), 'median': statistics.median(samples), 'number': number, 'peak_bytes': peak}
+
+def run(params, seed, repeat, only=None):
+    # The optimizer and parser log with print(); keep that out of the output
+    with contextlib.redirect_stdout(io.StringIO()):
+        cases = build_cases(params, seed)
+    unknown = [name for name in only or () if name not in cases]
+    if unknown:
+        raise ValueError(f"unknown benchmark(s): {', '.join(unknown)}; choose from {', '.join(cases)}")
+    results = {}
+    for name, fn in cases.items():
+        if only and name not in only:
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = measure(fn, repeat)
+        result = results[name]
+        print(f"{name:>28}: min {result['min'] * 1e3:9.3f} ms  median {result['median'] * 1e3:9.3f} ms  "
+              f"peak {result['peak_bytes'] / 1024:9.1f} KiB", file=sys.stderr)
+    return results
+
+def compare(results, baseline, threshold, memory_threshold, only=None):
+    """
+    Compare results with a baseline.
+
+    A baseline case that was not run counts as a regression unless --only
+    left it out, so a renamed or removed case cannot hide a slowdown.
+
+    Args:
+        results (dict): Case results from run()
+        baseline (dict): Case results of the baseline
+        threshold (float): Allowed relative slowdown, e.g. 0.2 for 20%
+        memory_threshold (float): Allowed relative growth of peak allocation
+        only (list): Case names the run was limited to, if any
+
+    Returns:
+        list: Descriptions of the regressions found
+    """
+    regressions = []
+    for name in baseline:
+        if name in results:
+            continue
+        if only and name not in only:
+            print(f"{name:>28}: skipped (--only)", file=sys.stderr)
+            continue
+        print(f"{name:>28}: in baseline but not run", file=sys.stderr)
+        regressions.append(f"{name}: in baseline but not run")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:>28}: no baseline", file=sys.stderr)
+            continue
+        time_ratio = result['min'] / before['min'] if before['min'] else 1.0
+        memory_ratio = result['peak_bytes'] / before['peak_bytes'] if before['peak_bytes'] else 1.0
+        flags = []
+        if time_ratio > 1 + threshold:
+            flags.append(f"time +{(time_ratio - 1) * 100:.0f}%")
+        if memory_ratio > 1 + memory_threshold:
+            flags.append(f"memory +{(memory_ratio - 1) * 100:.0f}%")
+        print(f"{name:>28}: time x{time_ratio:.2f}  memory x{memory_ratio:.2f}  "
+              f"{'REGRESSION ' + ', '.join(flags) if flags else 'ok'}", file=sys.stderr)
+        if flags:
+            regressions.append(f"{name}: {', '.join(flags)}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the resume pipeline functions.')
+    parser.add_argument('--size', default='medium', choices=sorted(SIZES), help='Synthetic input size')
+    for field in ('pages', 'jobs', 'bullets', 'tables', 'merged_cells'):
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, help=f'Override the size preset\'s {field}')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5, help='Timing samples per function')
+    parser.add_argument('--only', nargs='+', help='Benchmark only these functions')
+    parser.add_argument('--save', help='Write the results to this baseline file')
+    parser.add_argument('--compare', help='Baseline file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown (0.2 = 20%%)')
+    parser.add_argument('--memory-threshold', type=float, default=0.2, help='Allowed peak allocation growth')
+    args = parser.parse_args(argv)
+
+    params = dict(SIZES[args.size])
+    for field in params:
+        if getattr(args, field) is not None:
+            params[field] = getattr(args, field)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['params'] != params or baseline['seed'] != args.seed:
+            print(f"Baseline was recorded with {baseline['params']} (seed {baseline['seed']}), "
+                  f"not {params} (seed {args.seed})", file=sys.stderr)
+            return 2
+
+    try:
+        results = run(params, args.seed, args.repeat, args.only)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'params': params, 'seed': args.seed, 'python': platform.python_version(),
+                       'machine': platform.machine(), 'results': results}, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {args.save}", file=sys.stderr)
+
+    if baseline is not None:
+        regressions = compare(results, baseline['results'], args.threshold, args.memory_threshold, args.only)
+        if regressions:
+            print(f"FAIL: {len(regressions)} regression(s)", file=sys.stderr)
+            return 1
+        print("No regressions", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
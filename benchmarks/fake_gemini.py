@@ -0,0 +1,179 @@
+"""
+Local stand-in for the Gemini API, for offline benchmarks and experiments.
+
+Two forms are provided:
+
+* ``FakeModel`` - an in-process object with the same ``generate_content``
+  interface as ``GenerativeModel``; install it with
+  ``gemini_client.set_model(FakeModel())``.
+* An HTTP server speaking the REST ``generateContent`` endpoint; point the app
+  at it with ``GEMINI_API_ENDPOINT=http://127.0.0.1:8765``.
+
+Both answer a prompt by echoing back the JSON between the last
+``<name_json>...</name_json>`` tags (the payload the optimizer asks to have
+rewritten), after a configurable latency that can grow with response size.
+
+Usage:
+    python -m benchmarks.fake_gemini --port 8765 --latency 0.5 --per-token 0.002
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+_PAYLOAD = re.compile(r'<(\w+_json)>\s*(.*?)\s*</\1>', re.DOTALL)
+
+
+def fake_response(prompt):
+    """
+    Build the text the fake model returns for a prompt.
+
+    Args:
+        prompt (str): Prompt text
+
+    Returns:
+        str: The prompt's last JSON payload, or a short acknowledgement
+    """
+    matches = _PAYLOAD.findall(prompt)
+    if matches:
+        return matches[-1][1]
+    return "pong"
+
+
+class FakeModel:
+    """
+    In-process stub with the GenerativeModel.generate_content interface.
+
+    Args:
+        latency (float): Base seconds per call
+        per_token (float): Extra seconds per output token (about 4 characters)
+        jitter (float): Random extra seconds added to each call
+        failure_rate (float): Fraction of calls that raise an error
+    """
+
+    def __init__(self, latency=0.0, per_token=0.0, jitter=0.0, failure_rate=0.0):
+        self.latency = latency
+        self.per_token = per_token
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def delay_for(self, text):
+        """Simulated generation time for a response."""
+        return self.latency + self.per_token * (len(text) / 4) + random.uniform(0, self.jitter)
+
+    def generate_content(self, prompt, generation_config=None, request_options=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise RuntimeError("429 Resource exhausted (simulated)")
+        text = fake_response(prompt)
+        delay = self.delay_for(text)
+        # Honor the request deadline the way the SDK transport does
+        timeout = (request_options or {}).get('timeout')
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("Deadline exceeded (simulated)")
+        time.sleep(delay)
+        return SimpleNamespace(text=text)
+
+
+def _make_handler(model):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.startswith('/stats'):
+                self._send_json(200, {'calls': model.calls})
+            else:
+                self._send_json(404, {'error': {'code': 404, 'message': 'Not found'}})
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if ':generateContent' not in self.path:
+                self._send_json(404, {'error': {'code': 404, 'message': 'Not found'}})
+                return
+
+            prompt = ''.join(part.get('text', '')
+                             for content in request.get('contents', [])
+                             for part in content.get('parts', []))
+            try:
+                text = model.generate_content(prompt).text
+            except RuntimeError as e:
+                self._send_json(429, {'error': {'code': 429, 'message': str(e),
+                                                'status': 'RESOURCE_EXHAUSTED'}})
+                return
+
+            self._send_json(200, {
+                'candidates': [{
+                    'content': {'parts': [{'text': text}], 'role': 'model'},
+                    'finishReason': 'STOP',
+                    'index': 0,
+                }],
+                'usageMetadata': {
+                    'promptTokenCount': len(prompt) // 4,
+                    'candidatesTokenCount': len(text) // 4,
+                    'totalTokenCount': (len(prompt) + len(text)) // 4,
+                },
+            })
+
+    return Handler
+
+
+def serve(host='127.0.0.1', port=8765, model=None):
+    """
+    Start the fake API server in a background thread.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind, or 0 for any free port
+        model (FakeModel): Model behaviour, defaults to an instant FakeModel
+
+    Returns:
+        ThreadingHTTPServer: Running server; call shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), _make_handler(model or FakeModel()))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a local fake Gemini API server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.5, help='Base seconds per call')
+    parser.add_argument('--per-token', type=float, default=0.0, help='Extra seconds per output token')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra seconds per call')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Fraction of calls answered with 429')
+    args = parser.parse_args(argv)
+
+    model = FakeModel(args.latency, args.per_token, args.jitter, args.failure_rate)
+    server = serve(args.host, args.port, model)
+    print(f"Fake Gemini API listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,363 @@
+"""
+End-to-end load test of the web app against a local fake model server.
+
+Starts the fake Gemini API (benchmarks.fake_gemini) and the app (threaded
+werkzeug server in a subprocess, pointed at the fake API), then replays
+upload -> optimize -> status polling -> download flows, each with its own
+session cookie, at a sweep of concurrency levels. Flows either run back to
+back (closed loop) or arrive at a fixed Poisson rate (--rate).
+
+For each level it reports flow throughput, errors, client-side p50/p95/p99
+latency per route, and server-side p50/p95/p99 per pipeline stage estimated
+from the /metrics histograms. Everything runs on one machine with only the
+standard library on the client side.
+
+The model response cache is disabled by default, so every optimization
+reaches the fake model.
+
+Usage:
+    python -m benchmarks.load_test --concurrency 1 4 16 --flows 40 --latency 0.5
+    python -m benchmarks.load_test --resumes uploads/ --jobs jobs.jsonl --rate 5 --concurrency 32
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_gemini import FakeModel, serve
+from benchmarks.synthetic import job_listing, resume_docx
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROUTES = ('upload', 'optimize', 'status', 'download')
+
+# Runs in the app subprocess; settings that are plain constants in config are set before the app is imported
+APP_LAUNCHER = (
+    "import sys, config\n"
+    "config.LLM_CACHE_MAX_ENTRIES = int(sys.argv[2])\n"
+    "from werkzeug.serving import make_server\n"
+    "import app\n"
+    "server = make_server('127.0.0.1', int(sys.argv[1]), app.app, threaded=True)\n"
+    "print('ready', flush=True)\n"
+    "server.serve_forever()\n"
+)
+
+_HISTOGRAM_LINE = re.compile(r'^resume_optimizer_stage_duration_seconds_bucket\{stage="([^"]*)",le="([^"]+)"\} (\S+)$')
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def load_corpus(resumes_dir, jobs_path, count, seed):
+    """
+    Load resumes and job listings to replay, or generate synthetic ones.
+
+    Args:
+        resumes_dir (str): Directory of .docx resumes, or None for synthetic ones
+        jobs_path (str): Job listings (JSONL, .txt or directory), or None for synthetic ones
+        count (int): Number of synthetic resumes and listings to generate
+        seed (int): Seed for synthetic input
+
+    Returns:
+        tuple: (list of (file name, bytes), list of listing texts)
+    """
+    if resumes_dir:
+        resumes = []
+        for name in sorted(os.listdir(resumes_dir)):
+            if name.lower().endswith('.docx') and not name.startswith('~$'):
+                with open(os.path.join(resumes_dir, name), 'rb') as f:
+                    resumes.append((name, f.read()))
+    else:
+        resumes = [(f"synthetic_{index}.docx", resume_docx(jobs=3 + index % 6, bullets=4 + index % 4,
+                                                           seed=seed + index))
+                   for index in range(count)]
+
+    if jobs_path:
+        from bulk_optimize import load_listings
+        listings = [text for _, text in load_listings(jobs_path)]
+    else:
+        listings = [job_listing(skills=4 + index % 6, seed=seed + index) for index in range(count)]
+    return resumes, listings
+
+class Client:
+    """One browser session: a cookie jar over plain HTTP connections."""
+
+    def __init__(self, host, port, timeout=120):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.cookies = {}
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f"{name}={value}" for name, value in self.cookies.items())
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+        finally:
+            connection.close()
+        for header in response.headers.get_all('Set-Cookie') or []:
+            name, _, value = header.split(';', 1)[0].partition('=')
+            self.cookies[name.strip()] = value.strip()
+        return response.status, response.headers, data
+
+def multipart(fields, files):
+    """Encode form fields and (name, filename, bytes) files as multipart/form-data."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+                     .encode('utf-8'))
+    for name, filename, data in files:
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n'.encode('utf-8') + data + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode('utf-8'))
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+def run_flow(port, resume, listing, poll_interval):
+    """
+    Run one upload -> optimize -> status -> download flow in a new session.
+
+    Returns:
+        dict: 'ok', 'error', 'seconds' and per-route lists of request latencies
+    """
+    client = Client('127.0.0.1', port)
+    timings = {route: [] for route in ROUTES}
+    start = time.perf_counter()
+
+    def timed(route, method, path, **kwargs):
+        began = time.perf_counter()
+        result = client.request(method, path, **kwargs)
+        timings[route].append(time.perf_counter() - began)
+        return result
+
+    try:
+        body, content_type = multipart({'job_listing': listing}, [('resume', resume[0], resume[1])])
+        status, _, _ = timed('upload', 'POST', '/upload', body=body, headers={'Content-Type': content_type})
+        if status != 302:
+            raise RuntimeError(f"upload returned {status}")
+
+        status, _, data = timed('optimize', 'GET', '/optimize', headers={'Accept': 'application/json'})
+        if status != 202:
+            raise RuntimeError(f"optimize returned {status}")
+        status_url = json.loads(data)['status_url']
+
+        while True:
+            status, _, data = timed('status', 'GET', status_url)
+            if status != 200:
+                raise RuntimeError(f"status returned {status}")
+            state = json.loads(data)['state']
+            if state == 'failed':
+                raise RuntimeError(f"job failed: {json.loads(data).get('error')}")
+            if state == 'done':
+                break
+            time.sleep(poll_interval)
+
+        status, _, data = timed('download', 'GET', '/download')
+        if status != 200 or not data.startswith(b'PK'):
+            raise RuntimeError(f"download returned {status}")
+        return {'ok': True, 'error': None, 'seconds': time.perf_counter() - start, 'routes': timings}
+    except Exception as e:
+        return {'ok': False, 'error': f"{type(e).__name__}: {e}", 'seconds': time.perf_counter() - start,
+                'routes': timings}
+
+def percentiles(values):
+    """Nearest-rank p50, p95 and p99 of a list of seconds."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    def rank(q):
+        return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))]
+    return {'p50': rank(0.50), 'p95': rank(0.95), 'p99': rank(0.99), 'count': len(ordered)}
+
+def stage_buckets(port):
+    """Scrape cumulative stage latency bucket counts from /metrics."""
+    _, _, data = Client('127.0.0.1', port).request('GET', '/metrics')
+    buckets = {}
+    for line in data.decode('utf-8').splitlines():
+        match = _HISTOGRAM_LINE.match(line)
+        if match:
+            stage, le, count = match.groups()
+            buckets.setdefault(stage, []).append((float(le), float(count)))
+    return buckets
+
+def histogram_percentiles(before, after):
+    """
+    Estimate stage percentiles from the bucket counts added between two scrapes.
+
+    Interpolates linearly within a bucket, like Prometheus histogram_quantile.
+    """
+    results = {}
+    for stage, buckets in after.items():
+        earlier = dict(before.get(stage, []))
+        counts = [(le, count - earlier.get(le, 0.0)) for le, count in sorted(buckets)]
+        total = counts[-1][1] if counts else 0
+        if not total:
+            continue
+        estimates = {'count': int(total)}
+        for name, q in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99)):
+            target = q * total
+            lower_bound, lower_count = 0.0, 0.0
+            for le, count in counts:
+                if count >= target:
+                    if le == float('inf'):
+                        estimates[name] = lower_bound
+                    else:
+                        share = (target - lower_count) / (count - lower_count) if count > lower_count else 1
+                        estimates[name] = lower_bound + (le - lower_bound) * share
+                    break
+                lower_bound, lower_count = le, count
+        results[stage] = estimates
+    return results
+
+def run_level(port, corpus, concurrency, flows, rate, poll_interval, rng):
+    """
+    Run a batch of flows at one concurrency level.
+
+    Returns:
+        dict: Throughput, errors, per-route and per-stage percentiles
+    """
+    resumes, listings = corpus
+    before = stage_buckets(port)
+    results = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = []
+        next_arrival = time.perf_counter()
+        for _ in range(flows):
+            if rate:
+                # Open loop: flows arrive on their own schedule, queueing if all workers are busy
+                next_arrival += rng.expovariate(rate)
+                time.sleep(max(0.0, next_arrival - time.perf_counter()))
+            futures.append(executor.submit(run_flow, port, rng.choice(resumes), rng.choice(listings),
+                                           poll_interval))
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+    after = stage_buckets(port)
+
+    errors = {}
+    for result in results:
+        if not result['ok']:
+            errors[result['error']] = errors.get(result['error'], 0) + 1
+    return {
+        'concurrency': concurrency,
+        'rate': rate,
+        'flows': flows,
+        'completed': sum(1 for result in results if result['ok']),
+        'errors': errors,
+        'seconds': elapsed,
+        'throughput': sum(1 for result in results if result['ok']) / elapsed,
+        'flow': percentiles([result['seconds'] for result in results if result['ok']]),
+        'routes': {route: percentiles([seconds for result in results for seconds in result['routes'][route]])
+                   for route in ROUTES},
+        'stages': histogram_percentiles(before, after),
+    }
+
+def print_level(level):
+    errors = sum(level['errors'].values())
+    print(f"\n== concurrency {level['concurrency']}" + (f", {level['rate']}/s arrivals" if level['rate'] else '') +
+          f": {level['completed']}/{level['flows']} flows in {level['seconds']:.1f}s, "
+          f"{level['throughput']:.2f} flows/s, {errors} errors, {level['model_calls']} model calls")
+    for error, count in level['errors'].items():
+        print(f"   {count} x {error}")
+    rows = [('flow', level['flow'])] + [(route, level['routes'][route]) for route in ROUTES]
+    rows += [(f"stage:{stage}", values) for stage, values in sorted(level['stages'].items())]
+    print(f"   {'':<20}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, values in rows:
+        if values:
+            print(f"   {name:<20}{values['count']:>7}{values['p50'] * 1e3:>10.1f}"
+                  f"{values['p95'] * 1e3:>10.1f}{values['p99'] * 1e3:>10.1f}")
+
+def start_app(port, model_port, optimizer, llm_cache, workdir, extra_env):
+    env = dict(os.environ)
+    env.update({
+        'GEMINI_API_KEY': 'fake-key',
+        'GEMINI_API_ENDPOINT': f"http://127.0.0.1:{model_port}",
+        'OPTIMIZER_BACKEND': optimizer,
+        'GEMINI_REQUESTS_PER_MINUTE': '1000000',
+        'GEMINI_TOKENS_PER_MINUTE': '1000000000',
+        'PARSE_CACHE_PATH': os.path.join(workdir, 'parse_cache.sqlite3'),
+        'RESULT_SPILL_FOLDER': os.path.join(workdir, 'results'),
+        'METRICS_DIR': '',
+    })
+    env.update(extra_env)
+    process = subprocess.Popen(
+        [sys.executable, '-c', APP_LAUNCHER, str(port), '1024' if llm_cache else '0'],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    if process.stdout.readline().strip() != 'ready':
+        process.kill()
+        raise RuntimeError("The app server did not start")
+    # Keep draining the app's log output so it never blocks on a full pipe
+    threading.Thread(target=lambda: [None for _ in process.stdout], daemon=True).start()
+    return process
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the upload -> optimize -> download flow.')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help='Concurrency levels to sweep')
+    parser.add_argument('--flows', type=int, default=20, help='Flows per concurrency level')
+    parser.add_argument('--rate', type=float, help='Open-loop arrival rate in flows/s (default: closed loop)')
+    parser.add_argument('--resumes', help='Directory of .docx resumes (default: synthetic)')
+    parser.add_argument('--jobs', help='Job listings: JSONL file, .txt file or directory (default: synthetic)')
+    parser.add_argument('--corpus-size', type=int, default=8, help='Synthetic resumes and listings to generate')
+    parser.add_argument('--optimizer', default='gemini', choices=['basic', 'gemini', 'gemini-sections'])
+    parser.add_argument('--llm-cache', action='store_true', help='Keep the model response cache enabled')
+    parser.add_argument('--latency', type=float, default=0.5, help='Fake model base seconds per call')
+    parser.add_argument('--per-token', type=float, default=0.0, help='Fake model extra seconds per output token')
+    parser.add_argument('--jitter', type=float, default=0.1, help='Fake model random extra seconds per call')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Fraction of model calls answered with 429')
+    parser.add_argument('--poll-interval', type=float, default=0.1, help='Seconds between status polls')
+    parser.add_argument('--app-env', action='append', default=[], metavar='NAME=VALUE',
+                        help='Extra environment for the app, e.g. JOB_WORKERS=8')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help='Write the results as JSON')
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    corpus = load_corpus(args.resumes, args.jobs, args.corpus_size, args.seed)
+    model = FakeModel(args.latency, args.per_token, args.jitter, args.failure_rate)
+    model_server = serve(port=0, model=model)
+    extra_env = dict(item.split('=', 1) for item in args.app_env)
+
+    port = free_port()
+    with tempfile.TemporaryDirectory(prefix='load_test_') as workdir:
+        app_process = start_app(port, model_server.server_address[1], args.optimizer, args.llm_cache,
+                                workdir, extra_env)
+        try:
+            print(f"{len(corpus[0])} resumes, {len(corpus[1])} listings; optimizer {args.optimizer}, "
+                  f"model latency {args.latency}s", file=sys.stderr)
+            levels = []
+            for concurrency in args.concurrency:
+                calls_before = model.calls
+                level = run_level(port, corpus, concurrency, args.flows, args.rate, args.poll_interval, rng)
+                level['model_calls'] = model.calls - calls_before
+                levels.append(level)
+                print_level(level)
+        finally:
+            app_process.terminate()
+            app_process.wait()
+            model_server.shutdown()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'levels': levels}, f, indent=2)
+            f.write('\n')
+    return 1 if any(level['errors'] for level in levels) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Deterministic synthetic resumes and job listings for benchmarks.
+
+The same arguments always produce the same content, so benchmark runs on
+different days or machines measure the same work. Resumes are real DOCX
+files laid out the way the parser expects (headings, job title / company /
+location / date lines, bullets), optionally padded to a number of pages and
+with skill tables containing merged cells.
+
+Usage:
+    python -m benchmarks.synthetic --size large -o large.docx --job-listing large.txt
+"""
+import argparse
+import io
+import random
+import sys
+
+import docx
+
+# Named sizes for the benchmark suite
+SIZES = {
+    'small': {'pages': 1, 'jobs': 3, 'bullets': 4, 'tables': 0, 'merged_cells': 0},
+    'medium': {'pages': 2, 'jobs': 8, 'bullets': 6, 'tables': 1, 'merged_cells': 2},
+    'large': {'pages': 6, 'jobs': 20, 'bullets': 10, 'tables': 3, 'merged_cells': 6},
+}
+
+# Roughly one page of 11pt body text
+LINES_PER_PAGE = 40
+
+SKILLS = ['Python', 'SQL', 'Microsoft Excel', 'Customer Service', 'Project Management', 'Scheduling',
+          'Team Leadership', 'Data Analysis', 'Java', 'JavaScript', 'AWS', 'Docker', 'Kubernetes',
+          'Communication', 'Budgeting', 'Salesforce', 'Tableau', 'Agile', 'Training', 'Inventory Management']
+VERBS = ['Led', 'Built', 'Improved', 'Managed', 'Delivered', 'Designed', 'Automated', 'Reduced', 'Launched',
+         'Coordinated', 'Streamlined', 'Negotiated']
+OBJECTS = ['reporting pipelines', 'customer onboarding', 'inventory tracking', 'quarterly budgets',
+           'a team of eight', 'vendor contracts', 'deployment tooling', 'training programs', 'sales dashboards',
+           'support workflows']
+OUTCOMES = ['cutting turnaround by 30%', 'saving $120K a year', 'raising satisfaction scores to 4.8/5',
+            'with zero downtime', 'ahead of schedule', 'across three regions', 'for 40+ clients']
+TITLES = ['Operations Manager', 'Data Analyst', 'Software Engineer', 'Team Lead', 'Project Coordinator',
+          'Customer Success Manager', 'Store Manager', 'Business Analyst']
+COMPANIES = ['Northwind Traders', 'Contoso Ltd', 'Fabrikam Inc', 'Tailspin Toys', 'Adventure Works',
+             'Wide World Importers', 'Proseware', 'Litware']
+CITIES = ['Vancouver, BC', 'Toronto, ON', 'Seattle, WA', 'Austin, TX', 'Denver, CO', 'Calgary, AB']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+def _bullet(rng):
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}, {rng.choice(OUTCOMES)}"
+
+def resume_docx(pages=2, jobs=8, bullets=6, tables=1, merged_cells=2, seed=0):
+    """
+    Build a synthetic resume DOCX.
+
+    Args:
+        pages (int): Approximate page count; filler project lines are added
+            once the content runs short
+        jobs (int): Experience entries
+        bullets (int): Bullets per experience entry
+        tables (int): Skill tables (3 columns) added after the skills line
+        merged_cells (int): Horizontal cell merges spread over the tables
+        seed (int): Random seed
+
+    Returns:
+        bytes: The DOCX package
+    """
+    rng = random.Random(seed)
+    document = docx.Document()
+    lines = 0
+
+    def paragraph(text, style=None):
+        nonlocal lines
+        document.add_paragraph(text, style=style)
+        lines += 1
+
+    paragraph('Alex Example')
+    paragraph('alex@example.com | (555) 010-0000 | Vancouver, BC')
+
+    paragraph('SUMMARY')
+    paragraph(' '.join(f"{_bullet(rng)}." for _ in range(3)))
+
+    paragraph('SKILLS')
+    paragraph(', '.join(rng.sample(SKILLS, 8)))
+    merges_left = merged_cells
+    for index in range(tables):
+        rows = 4
+        table = document.add_table(rows=rows, cols=3)
+        for row in table.rows:
+            for cell in row.cells:
+                cell.text = rng.choice(SKILLS)
+        # Spread the merges evenly, one per row at most
+        merges = min(rows, -(-merges_left // (tables - index)))
+        for row in range(merges):
+            merged = table.cell(row, 0).merge(table.cell(row, 1))
+            merged.text = rng.choice(SKILLS)
+        merges_left -= merges
+        lines += rows
+
+    paragraph('PROFESSIONAL EXPERIENCE')
+    for index in range(jobs):
+        start_year = 2024 - 2 * (index + 1)
+        paragraph(rng.choice(TITLES))
+        paragraph(rng.choice(COMPANIES))
+        paragraph(rng.choice(CITIES))
+        paragraph(f"{rng.choice(MONTHS)} {start_year} - {rng.choice(MONTHS)} {start_year + 2}")
+        for _ in range(bullets):
+            paragraph(_bullet(rng), style='List Bullet')
+
+    paragraph('EDUCATION')
+    paragraph('University of British Columbia')
+    paragraph("Bachelor of Commerce, Sep 2004 - May 2008")
+    paragraph("Dean's list, 2006 and 2007")
+
+    paragraph('PROJECTS')
+    while lines < pages * LINES_PER_PAGE:
+        paragraph(f"{_bullet(rng)}.")
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def job_listing(skills=8, paragraphs=4, seed=0):
+    """
+    Build a synthetic job listing.
+
+    Args:
+        skills (int): Distinct skills the listing asks for
+        paragraphs (int): Paragraphs of responsibilities text
+        seed (int): Random seed
+
+    Returns:
+        str: Job listing text
+    """
+    rng = random.Random(seed)
+    wanted = rng.sample(SKILLS, min(skills, len(SKILLS)))
+    parts = [f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({rng.choice(CITIES)})", '']
+    for _ in range(paragraphs):
+        parts.append(' '.join(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} with {rng.choice(wanted)}."
+                              for _ in range(4)))
+        parts.append('')
+    parts.append('Requirements:')
+    parts.extend(f"- {years}+ years of experience with {skill}"
+                 for years, skill in zip([rng.randint(2, 6) for _ in wanted], wanted))
+    return '\n'.join(parts)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a synthetic resume and job listing.')
+    parser.add_argument('--size', default='medium', choices=sorted(SIZES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', required=True, help='Resume .docx path')
+    parser.add_argument('--job-listing', help='Also write a job listing to this path')
+    args = parser.parse_args(argv)
+
+    with open(args.output, 'wb') as f:
+        f.write(resume_docx(seed=args.seed, **SIZES[args.size]))
+    if args.job_listing:
+        with open(args.job_listing, 'w', encoding='utf-8') as f:
+            f.write(job_listing(seed=args.seed))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,344 @@
+"""
+Bulk resume optimizer.
+
+Runs every .docx resume in a directory against one or more job listings across
+a process pool: parse -> analyze -> optimize -> generate. Outputs are written
+to <output>/<job id>/<resume>_optimized.docx, and a manifest (JSONL or CSV)
+records each pair's input hashes, status and per-stage timings.
+
+Runs are incremental: a pair is skipped when its output exists and the
+manifest shows it was produced from the same resume content, listing text
+and settings.
+
+Job listings are read from a JSONL file (same format as analyze_jobs.py), a
+single .txt file, or a directory of .txt files (the file name is the id).
+
+Usage:
+    python bulk_optimize.py resumes/ jobs.jsonl -o optimized/ --workers 8 --backend ooxml
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+import traceback
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from werkzeug.utils import secure_filename
+
+import config
+from analyze_jobs import read_listings
+from modules import docx_templates
+from modules.docx_generator import generate_docx
+from modules.job_analyzer import analyze_job_listing
+from modules.parse_cache import new_parse_cache
+from modules.pipeline import OPTIMIZERS
+from modules.progress import ProgressReporter, reporting
+
+MANIFEST_FIELDS = ['resume', 'job_id', 'output', 'status', 'input_key', 'resume_key', 'job_sha256',
+                   'parse_s', 'analyze_s', 'optimize_s', 'generate_s', 'total_s', 'error']
+
+# Parse cache of the current worker process, set up by _init_worker
+_parse_cache = None
+
+def load_listings(path):
+    """
+    Read job listings from a JSONL file, a .txt file or a directory of .txt files.
+
+    Args:
+        path (str): Listings source
+
+    Returns:
+        list: (job id, listing text) tuples
+    """
+    if os.path.isdir(path):
+        listings = []
+        for name in sorted(os.listdir(path)):
+            if name.lower().endswith('.txt'):
+                with open(os.path.join(path, name), 'r', encoding='utf-8') as f:
+                    listings.append((os.path.splitext(name)[0], f.read()))
+        return listings
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.lower().endswith('.txt'):
+            return [(os.path.splitext(os.path.basename(path))[0], f.read())]
+        ids = {}
+        return [(str(ids[index]), text) for index, text in enumerate(read_listings(f, ids))]
+
+def read_manifest(path):
+    """
+    Load the rows of an earlier manifest, keyed by output path.
+
+    A leftover .partial file from an interrupted run is read too, so work it
+    recorded is not repeated.
+
+    Args:
+        path (str): Manifest path (.csv or .jsonl)
+
+    Returns:
+        dict: Output path to manifest row
+    """
+    rows = {}
+    for candidate in (path, path + '.partial'):
+        if not os.path.exists(candidate):
+            continue
+        with open(candidate, 'r', encoding='utf-8', newline='') as f:
+            if path.lower().endswith('.csv'):
+                records = csv.DictReader(f)
+            else:
+                records = (json.loads(line) for line in f if line.strip())
+            for row in records:
+                rows[row['output']] = row
+    return rows
+
+class ManifestWriter:
+    """Streams manifest rows to a .partial file and moves it into place on close."""
+
+    def __init__(self, path):
+        self.path = path
+        self._csv = path.lower().endswith('.csv')
+        self._file = open(path + '.partial', 'w', encoding='utf-8', newline='')
+        if self._csv:
+            self._writer = csv.DictWriter(self._file, fieldnames=MANIFEST_FIELDS)
+            self._writer.writeheader()
+
+    def write(self, row):
+        row = {field: row.get(field, '') for field in MANIFEST_FIELDS}
+        if self._csv:
+            self._writer.writerow(row)
+        else:
+            self._file.write(json.dumps(row) + '\n')
+        self._file.flush()
+
+    def close(self, complete=True):
+        """Close the file; only a complete run replaces the previous manifest."""
+        self._file.close()
+        if complete:
+            os.replace(self.path + '.partial', self.path)
+
+def pair_key(resume_key, job_sha256, optimizer, template):
+    """Hash of everything that determines a pair's output."""
+    payload = json.dumps([resume_key, job_sha256, optimizer, template])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def job_dir(job_id):
+    """
+    Output directory name for a job listing.
+
+    IDs that are already safe file names are used as they are. Other IDs are
+    sanitized and suffixed with a hash of the original, so two IDs that
+    sanitize to the same name (e.g. "a/b" and "a b") never share a directory.
+    """
+    safe = secure_filename(job_id)
+    if safe == job_id:
+        return safe
+    return f"{safe or 'job'}-{hashlib.sha256(job_id.encode('utf-8')).hexdigest()[:8]}"
+
+def _init_worker(parse_cache_path):
+    """Prepare a worker process: open the shared parse cache and build templates."""
+    global _parse_cache
+    _parse_cache = new_parse_cache(parse_cache_path)
+    docx_templates.warm_up()
+
+def _optimize_resume_file(resume_path, pairs, optimizer, template, backend):
+    """
+    Parse one resume and produce its output for each pending job listing.
+
+    Args:
+        resume_path (str): Resume DOCX path
+        pairs (list): (job id, job data, output path) tuples
+        optimizer (str): Name in pipeline.OPTIMIZERS
+        template (str): DOCX template name
+        backend (str): DOCX renderer backend
+
+    Returns:
+        tuple: (parse seconds, parse error message or None, list of
+            (output path, timings dict or None, error message or None))
+    """
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = new_parse_cache()
+
+    reporter = ProgressReporter()
+    try:
+        with reporting(reporter):
+            _, resume_data = _parse_cache.parse(resume_path)
+    except Exception as e:
+        return 0.0, f"Parse failed: {e}", []
+    parse_seconds = reporter.timings().get('parse', 0.0)
+
+    optimize = OPTIMIZERS[optimizer]
+    results = []
+    for job_id, job_data, output_path in pairs:
+        reporter = ProgressReporter()
+        try:
+            with reporting(reporter):
+                optimized = optimize(resume_data, job_data)
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                generate_docx(optimized, output_path + '.tmp', template=template, backend=backend)
+            os.replace(output_path + '.tmp', output_path)
+            results.append((output_path, reporter.timings(), None))
+        except Exception as e:
+            traceback.print_exc()
+            results.append((output_path, None, f"{type(e).__name__}: {e}"))
+    return parse_seconds, None, results
+
+def run_tasks(tasks, workers, parse_cache_path):
+    """
+    Run resume tasks across a process pool, yielding results as they finish.
+
+    Args:
+        tasks (iterable): Argument tuples for _optimize_resume_file
+        workers (int): Worker processes; with 1, tasks run in this process
+        parse_cache_path (str): SQLite parse cache shared by the workers
+
+    Yields:
+        tuple: (task arguments, task result)
+    """
+    if workers == 1:
+        _init_worker(parse_cache_path)
+        for task in tasks:
+            yield task, _optimize_resume_file(*task)
+        return
+
+    tasks = iter(tasks)
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(parse_cache_path,)) as executor:
+        pending = deque()
+        exhausted = False
+        while True:
+            # Keep the pool busy without queueing every resume up front
+            while not exhausted and len(pending) < max_in_flight:
+                task = next(tasks, None)
+                if task is None:
+                    exhausted = True
+                    break
+                pending.append((task, executor.submit(_optimize_resume_file, *task)))
+
+            if not pending:
+                return
+
+            finished, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+            for item in [item for item in pending if item[1] in finished]:
+                pending.remove(item)
+                yield item[0], item[1].result()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Optimize a directory of resumes against job listings.')
+    parser.add_argument('resumes', help='Directory of .docx resumes')
+    parser.add_argument('jobs', help='Job listings: JSONL file, .txt file or directory of .txt files')
+    parser.add_argument('-o', '--output', required=True, help='Output directory')
+    parser.add_argument('-m', '--manifest', default=None,
+                        help='Manifest path, .jsonl or .csv (default: <output>/manifest.jsonl)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--optimizer', default=config.OPTIMIZER_BACKEND, choices=sorted(OPTIMIZERS))
+    parser.add_argument('--template', default=config.DEFAULT_TEMPLATE, choices=sorted(docx_templates.TEMPLATES))
+    parser.add_argument('--backend', default=config.DOCX_BACKEND, choices=['python-docx', 'ooxml'])
+    parser.add_argument('--parse-cache', default=config.PARSE_CACHE_PATH, help='SQLite parse cache path')
+    parser.add_argument('--force', action='store_true', help='Redo pairs even if their inputs are unchanged')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    manifest_path = args.manifest or os.path.join(args.output, 'manifest.jsonl')
+    os.makedirs(args.output, exist_ok=True)
+    previous = {} if args.force else read_manifest(manifest_path)
+
+    # Analyze each listing once, up front, and share the result with every resume
+    jobs = []
+    listings = load_listings(args.jobs)
+    duplicates = sorted(job_id for job_id, count in Counter(job_id for job_id, _ in listings).items() if count > 1)
+    if duplicates:
+        parser.error(f"duplicate job ids would share an output directory: {', '.join(duplicates)}")
+    for job_id, text in listings:
+        reporter = ProgressReporter()
+        with reporting(reporter):
+            job_data = analyze_job_listing(text)
+        jobs.append({
+            'job_id': job_id,
+            'dir': job_dir(job_id),
+            'sha256': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+            'data': job_data,
+            'analyze_s': reporter.timings().get('analyze', 0.0),
+        })
+
+    resume_names = sorted(name for name in os.listdir(args.resumes)
+                          if name.lower().endswith('.docx') and not name.startswith('~$'))
+    print(f"{len(resume_names)} resumes x {len(jobs)} job listings", file=sys.stderr)
+
+    manifest = ManifestWriter(manifest_path)
+    # Keys must carry the same classifier fingerprint as the workers' parse cache
+    key_parser = new_parse_cache()
+    rows = {}
+    counts = {'done': 0, 'skipped': 0, 'failed': 0}
+
+    def record(row):
+        manifest.write(row)
+        counts[row['status']] += 1
+
+    def tasks():
+        for name in resume_names:
+            resume_path = os.path.join(args.resumes, name)
+            with open(resume_path, 'rb') as f:
+                resume_key = key_parser.key_for(f.read())
+
+            pairs = []
+            for job in jobs:
+                output_path = os.path.join(args.output, job['dir'],
+                                           f"{os.path.splitext(name)[0]}_optimized.docx")
+                row = {
+                    'resume': name,
+                    'job_id': job['job_id'],
+                    'output': output_path,
+                    'input_key': pair_key(resume_key, job['sha256'], args.optimizer, args.template),
+                    'resume_key': resume_key,
+                    'job_sha256': job['sha256'],
+                    'analyze_s': round(job['analyze_s'], 4),
+                }
+                earlier = previous.get(output_path)
+                if (earlier and earlier.get('status') in ('done', 'skipped')
+                        and earlier.get('input_key') == row['input_key'] and os.path.exists(output_path)):
+                    record(dict(earlier, status='skipped'))
+                    continue
+                rows[output_path] = row
+                pairs.append((job['job_id'], job['data'], output_path))
+
+            if pairs:
+                yield resume_path, pairs, args.optimizer, args.template, args.backend
+
+    complete = False
+    try:
+        for (resume_path, _, _, _, _), (parse_seconds, parse_error, results) in run_tasks(
+                tasks(), args.workers or os.cpu_count() or 1, args.parse_cache):
+            if parse_error:
+                # The resume could not be parsed; every pending pair for it fails
+                name = os.path.basename(resume_path)
+                for output_path in [path for path, row in rows.items() if row['resume'] == name]:
+                    record(dict(rows.pop(output_path), status='failed', error=parse_error))
+                continue
+
+            for output_path, timings, error in results:
+                row = rows.pop(output_path)
+                row['parse_s'] = round(parse_seconds, 4)
+                if error:
+                    record(dict(row, status='failed', error=error))
+                    continue
+                row.update({f"{stage}_s": round(seconds, 4) for stage, seconds in timings.items()})
+                row['total_s'] = round(sum(float(row[f"{stage}_s"] or 0)
+                                           for stage in ('parse', 'analyze', 'optimize', 'generate')), 4)
+                record(dict(row, status='done'))
+        complete = True
+    finally:
+        # An interrupted run leaves its .partial file behind for the next run to pick up
+        manifest.close(complete)
+
+    elapsed = time.perf_counter() - start
+    print(f"Done {counts['done']}, skipped {counts['skipped']}, failed {counts['failed']} "
+          f"in {elapsed:.2f}s; manifest at {manifest_path}", file=sys.stderr)
+    return 1 if counts['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
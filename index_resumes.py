@@ -0,0 +1,99 @@
+"""
+Resume search index CLI.
+
+Adds parsed resumes to the BM25 resume index, removes them, and finds the
+best resumes for a job listing. Resumes are identified by file name; adding
+a file that is already indexed replaces it. Parses go through the shared
+parse cache, so re-adding unchanged files is cheap.
+
+Usage:
+    python index_resumes.py add resumes/
+    python index_resumes.py remove old_resume.docx
+    python index_resumes.py search job.txt -k 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import config
+from modules.parse_cache import new_parse_cache
+from modules.resume_index import ResumeIndex
+
+# Save the index after this many added resumes, so an interrupted run keeps its progress
+SAVE_EVERY = 5000
+
+def resume_files(paths):
+    """Yield the .docx files named directly or found in the given directories."""
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith('.docx') and not name.startswith('~$'):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+def add(index, paths, parse_cache_path):
+    parse_cache = new_parse_cache(parse_cache_path)
+    added = failed = 0
+    for path in resume_files(paths):
+        try:
+            _, resume_data = parse_cache.parse(path)
+        except Exception as e:
+            print(f"Skipping {path}: {str(e)}", file=sys.stderr)
+            failed += 1
+            continue
+        index.add(os.path.basename(path), resume_data)
+        added += 1
+        if added % SAVE_EVERY == 0:
+            index.save()
+            print(f"{added} resumes added", file=sys.stderr)
+    index.save()
+    print(f"Added {added}, failed {failed}; {len(index)} resumes indexed", file=sys.stderr)
+    return 1 if failed else 0
+
+def remove(index, doc_ids):
+    missing = [doc_id for doc_id in doc_ids if not index.remove(doc_id)]
+    for doc_id in missing:
+        print(f"Not indexed: {doc_id}", file=sys.stderr)
+    index.save()
+    return 1 if missing else 0
+
+def search(index, job_path, k):
+    with open(job_path, 'r', encoding='utf-8') as f:
+        job_text = f.read()
+    start = time.perf_counter()
+    results = index.top_k(job_text, k)
+    elapsed = time.perf_counter() - start
+    for doc_id, score in results:
+        print(json.dumps({'resume': doc_id, 'score': round(score, 4)}))
+    print(f"{len(results)} of {len(index)} resumes in {elapsed * 1000:.1f}ms", file=sys.stderr)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build and query the resume search index.')
+    parser.add_argument('-i', '--index', default=config.RESUME_INDEX_PATH, help='Index file')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = commands.add_parser('add', help='Add or replace resumes')
+    add_parser.add_argument('paths', nargs='+', help='.docx files or directories of them')
+    add_parser.add_argument('--parse-cache', default=config.PARSE_CACHE_PATH, help='SQLite parse cache path')
+
+    remove_parser = commands.add_parser('remove', help='Remove resumes by file name')
+    remove_parser.add_argument('doc_ids', nargs='+', help='Indexed file names')
+
+    search_parser = commands.add_parser('search', help='Find the best resumes for a job listing')
+    search_parser.add_argument('job', help='Job listing text file')
+    search_parser.add_argument('-k', type=int, default=10, help='Number of resumes to return')
+
+    args = parser.parse_args(argv)
+    index = ResumeIndex(args.index)
+    if args.command == 'add':
+        return add(index, args.paths, args.parse_cache)
+    if args.command == 'remove':
+        return remove(index, args.doc_ids)
+    return search(index, args.job, args.k)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+DOCX Templates Module - Builds resume style sheets once and clones them per render.
+
+Each template is a declarative spec of page margins and paragraph styles. The
+first time a template is used it is built into a blank document and saved as
+bytes; every render after that starts from a copy of those bytes instead of
+redefining the styles.
+"""
+import io
+import threading
+
+import docx
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_LINE_SPACING, WD_PARAGRAPH_ALIGNMENT
+from docx.shared import Inches, Pt, RGBColor
+
+# Paragraph styles every template must define, as used by docx_generator
+STYLE_NAMES = ('Name', 'Contact', 'Section', 'JobTitle', 'Company', 'Date', 'Bullet', 'Skill', 'Summary')
+
+_PROFESSIONAL = {
+    'font': 'Calibri',
+    'margins': {'top': 0.5, 'bottom': 0.5, 'left': 0.75, 'right': 0.75},
+    'border_color': '4472C4',  # Section header underline - professional blue
+    'styles': {
+        'Name': {'size': 20, 'bold': True, 'color': (0, 51, 102), 'alignment': 'center', 'space_after': 2},
+        'Contact': {'size': 10, 'color': (0, 0, 0), 'alignment': 'center', 'space_after': 12},
+        'Section': {'size': 14, 'bold': True, 'color': (0, 51, 102), 'space_before': 15, 'space_after': 6,
+                    'keep_with_next': True},
+        'JobTitle': {'size': 12, 'bold': True, 'space_before': 14, 'space_after': 0, 'keep_with_next': True},
+        'Company': {'size': 11, 'italic': True, 'space_before': 2, 'space_after': 0, 'keep_with_next': True},
+        'Date': {'size': 10, 'italic': True, 'alignment': 'right', 'space_before': 0, 'space_after': 4},
+        'Bullet': {'size': 10.5, 'left_indent': 0.25, 'first_line_indent': -0.15, 'space_after': 3,
+                   'space_before': 0, 'single_spacing': True},
+        'Skill': {'size': 11, 'space_after': 6},
+        'Summary': {'size': 11, 'space_after': 6},
+    },
+}
+
+TEMPLATES = {
+    'professional': _PROFESSIONAL,
+    # Serif, black and white, for traditional industries
+    'classic': {
+        'font': 'Georgia',
+        'margins': {'top': 0.75, 'bottom': 0.75, 'left': 1.0, 'right': 1.0},
+        'border_color': '000000',
+        'styles': dict(_PROFESSIONAL['styles'],
+                       Name={'size': 22, 'bold': True, 'alignment': 'center', 'space_after': 4},
+                       Section={'size': 13, 'bold': True, 'space_before': 14, 'space_after': 6,
+                                'keep_with_next': True}),
+    },
+    # Smaller type and tighter spacing to fit long histories on fewer pages
+    'compact': {
+        'font': 'Arial',
+        'margins': {'top': 0.4, 'bottom': 0.4, 'left': 0.5, 'right': 0.5},
+        'border_color': '7F7F7F',
+        'styles': dict(_PROFESSIONAL['styles'],
+                       Name={'size': 16, 'bold': True, 'color': (64, 64, 64), 'alignment': 'center',
+                             'space_after': 0},
+                       Contact={'size': 9, 'alignment': 'center', 'space_after': 6},
+                       Section={'size': 11, 'bold': True, 'color': (64, 64, 64), 'space_before': 8,
+                                'space_after': 3, 'keep_with_next': True},
+                       JobTitle={'size': 10.5, 'bold': True, 'space_before': 6, 'space_after': 0,
+                                 'keep_with_next': True},
+                       Company={'size': 10, 'italic': True, 'space_before': 0, 'space_after': 0,
+                                'keep_with_next': True},
+                       Date={'size': 9, 'italic': True, 'alignment': 'right', 'space_before': 0,
+                             'space_after': 2},
+                       Bullet={'size': 9.5, 'left_indent': 0.2, 'first_line_indent': -0.12, 'space_after': 1,
+                               'space_before': 0, 'single_spacing': True},
+                       Skill={'size': 10, 'space_after': 3},
+                       Summary={'size': 10, 'space_after': 3}),
+    },
+}
+
+_ALIGNMENTS = {
+    'center': WD_PARAGRAPH_ALIGNMENT.CENTER,
+    'right': WD_PARAGRAPH_ALIGNMENT.RIGHT,
+    'left': WD_PARAGRAPH_ALIGNMENT.LEFT,
+}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class UnknownTemplateError(ValueError):
+    """Raised when a template name is not in TEMPLATES."""
+
+
+def get_template(name):
+    """
+    Look up a template spec by name.
+
+    Args:
+        name (str): Template name
+
+    Returns:
+        dict: The template spec
+
+    Raises:
+        UnknownTemplateError: If there is no template with that name
+    """
+    try:
+        return TEMPLATES[name]
+    except KeyError:
+        raise UnknownTemplateError(
+            f"Unknown template '{name}', expected one of: {', '.join(sorted(TEMPLATES))}"
+        ) from None
+
+
+def _add_paragraph_style(styles, name, font_name, spec):
+    style = styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+    font = style.font
+    font.name = spec.get('font', font_name)
+    font.size = Pt(spec['size'])
+    if 'bold' in spec:
+        font.bold = spec['bold']
+    if 'italic' in spec:
+        font.italic = spec['italic']
+    if 'color' in spec:
+        font.color.rgb = RGBColor(*spec['color'])
+
+    # Paragraph settings are applied in spec order so the generated XML is stable
+    paragraph_format = style.paragraph_format
+    for key, value in spec.items():
+        if key == 'alignment':
+            paragraph_format.alignment = _ALIGNMENTS[value]
+        elif key in ('space_before', 'space_after'):
+            setattr(paragraph_format, key, Pt(value))
+        elif key in ('left_indent', 'first_line_indent'):
+            setattr(paragraph_format, key, Inches(value))
+        elif key == 'keep_with_next':
+            paragraph_format.keep_with_next = value
+        elif key == 'single_spacing' and value:
+            paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
+
+
+def build_template(name):
+    """
+    Build a template's empty document with its margins and styles.
+
+    Args:
+        name (str): Template name
+
+    Returns:
+        bytes: The saved DOCX package
+    """
+    spec = get_template(name)
+    doc = docx.Document()
+
+    margins = spec['margins']
+    for section in doc.sections:
+        section.top_margin = Inches(margins['top'])
+        section.bottom_margin = Inches(margins['bottom'])
+        section.left_margin = Inches(margins['left'])
+        section.right_margin = Inches(margins['right'])
+
+    for style_name in STYLE_NAMES:
+        _add_paragraph_style(doc.styles, style_name, spec['font'], spec['styles'][style_name])
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def template_bytes(name):
+    """
+    Return a template's DOCX package, building it on first use.
+
+    Args:
+        name (str): Template name
+
+    Returns:
+        bytes: The saved DOCX package
+    """
+    data = _cache.get(name)
+    if data is None:
+        with _cache_lock:
+            data = _cache.get(name)
+            if data is None:
+                data = build_template(name)
+                _cache[name] = data
+    return data
+
+
+def new_document(name):
+    """
+    Start a document from a cached template.
+
+    Args:
+        name (str): Template name
+
+    Returns:
+        docx.Document: A fresh document with the template's margins and styles
+    """
+    return docx.Document(io.BytesIO(template_bytes(name)))
+
+
+def warm_up(names=None):
+    """
+    Build templates ahead of the first render.
+
+    Args:
+        names (list): Template names, defaults to all templates
+    """
+    for name in names or TEMPLATES:
+        template_bytes(name)
@@ -0,0 +1,246 @@
+"""
+Fan-out Module - Optimizes one resume for many job listings as a zip stream.
+
+The resume is parsed once by the caller. Every listing is analyzed,
+optimized and rendered as its own background job, and each DOCX is written
+to a zip archive as soon as its job finishes, in completion order. Finished
+DOCX files wait in the result store (which spills to disk under memory
+pressure) rather than in the hand-off queue, so a slow client never pins
+them all in memory. The archive goes through a write-only sink that is
+emptied after every entry, so only the entry being added is held in memory,
+never the whole archive.
+
+A manifest.json entry is written last with each listing's title, file name,
+state and match score (the TF-IDF similarity of the uploaded resume with the
+listing, see modules.relevance). Listings not finished by the stream's
+deadline are recorded as timed out.
+"""
+import json
+import queue
+import time
+import uuid
+import zipfile
+
+from werkzeug.utils import secure_filename
+
+import config
+from modules.job_analyzer import analyze_job_listing
+from modules.pipeline import optimize_parsed_resume
+from modules.relevance import score_resume
+
+MANIFEST_NAME = 'manifest.json'
+FANOUT_JOB_KIND = 'fanout'
+TIMED_OUT = 'timed_out'
+
+
+class _Sink:
+    """Write-only, non-seekable file object collecting the bytes zipfile writes."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """Take the bytes written since the last call."""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStream:
+    """
+    Zip archive built incrementally on a non-seekable stream.
+
+    Entries use data descriptors instead of patched local headers, so each
+    add() returns the archive bytes it produced right away.
+    """
+
+    def __init__(self):
+        self._sink = _Sink()
+        self._zip = zipfile.ZipFile(self._sink, mode='w')
+
+    def add(self, name, data, compress=True):
+        """
+        Add a file to the archive.
+
+        Args:
+            name (str): Path inside the archive
+            data (bytes or str): File contents
+            compress (bool): Deflate the data; DOCX files are already
+                compressed and are better stored as they are
+
+        Returns:
+            bytes: Archive bytes to send
+        """
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self._zip.writestr(info, data)
+        return self._sink.drain()
+
+    def close(self):
+        """
+        Finish the archive.
+
+        Returns:
+            bytes: The central directory, the last bytes to send
+        """
+        self._zip.close()
+        return self._sink.drain()
+
+
+def listing_title(job_listing):
+    """First non-blank line of a listing, used to label it."""
+    for line in job_listing.splitlines():
+        if line.strip():
+            return line.strip()[:120]
+    return ''
+
+
+def entry_name(index, job_listing):
+    """Archive file name for a listing's optimized resume, e.g. 03_Data_Analyst_at_Contoso.docx."""
+    slug = secure_filename(listing_title(job_listing))[:60].rstrip('._') or 'listing'
+    return f"{index + 1:02d}_{slug}.docx"
+
+
+def _optimize_listing(index, resume_data, job_listing, original_filename, optimizer, template, result_store,
+                      results):
+    """Job body: optimize for one listing, park the DOCX in the result store and notify the stream."""
+    started = time.perf_counter()
+    job_data = None
+    try:
+        job_data = analyze_job_listing(job_listing)
+        output = optimize_parsed_resume(resume_data, job_listing, original_filename, optimizer=optimizer,
+                                        template=template, job_data=job_data)
+        result_id = uuid.uuid4().hex
+        result_store.put(result_id, output['content'], output['output_filename'])
+    except Exception as e:
+        results.put((index, job_data, None, str(e), time.perf_counter() - started))
+        raise
+    # Only the result ID goes through the queue; the job keeps a small summary until it expires
+    results.put((index, job_data, result_id, None, time.perf_counter() - started))
+    return {'index': index, 'result_id': result_id, 'bytes': len(output['content'])}
+
+
+def submit_fanout(job_manager, result_store, resume_data, job_listings, original_filename, optimizer=None,
+                  template=None, max_pending=None):
+    """
+    Queue one optimization job per listing.
+
+    Args:
+        job_manager (JobManager): Executor to run the jobs on
+        result_store (ResultStore): Holds each DOCX until the stream sends it
+        resume_data (Resume or dict): Parsed resume
+        job_listings (list): Job listing texts
+        original_filename (str): Uploaded filename, used in the manifest
+        optimizer (str): Name of the optimizer, defaults to config.OPTIMIZER_BACKEND
+        template (str): Name of the DOCX template, defaults to config.DEFAULT_TEMPLATE
+        max_pending (int): Fan-out jobs allowed queued or running across all
+            requests, defaults to config.FANOUT_MAX_PENDING
+
+    Returns:
+        queue.Queue: Receives (index, job data, result ID, error, seconds)
+            for each listing as its job finishes
+
+    Raises:
+        JobQueueFull: If the executor, or the fan-out share of it, cannot
+            take all the jobs
+    """
+    results = queue.Queue()
+    job_manager.submit_batch(
+        [(_optimize_listing, (index, resume_data, job_listing, original_filename, optimizer, template,
+                              result_store, results), {})
+         for index, job_listing in enumerate(job_listings)],
+        kind=FANOUT_JOB_KIND,
+        max_kind_pending=config.FANOUT_MAX_PENDING if max_pending is None else max_pending
+    )
+    return results
+
+
+def _manifest_entry(index, job_listing, state, error=None, seconds=None, job_data=None):
+    """Manifest record for one listing; job_data is dropped once match scores are computed."""
+    return {
+        'index': index + 1,
+        'title': listing_title(job_listing),
+        'file': None,
+        'state': state,
+        'error': error,
+        'seconds': None if seconds is None else round(seconds, 3),
+        'match_score': None,
+        'job_data': job_data,
+    }
+
+
+def _take_result(result_store, result_id):
+    """Read a parked DOCX and remove it from the store; None if it was dropped or expired."""
+    stored = result_store.get(result_id)
+    if stored is None:
+        return None
+    with stored.open() as f:
+        content = f.read()
+    result_store.delete(result_id)
+    return content
+
+
+def stream_fanout(results, result_store, resume_data, job_listings, original_filename, timeout=None):
+    """
+    Stream the optimized resumes as a zip archive as their jobs finish.
+
+    Args:
+        results (queue.Queue): Queue returned by submit_fanout
+        result_store (ResultStore): Store the jobs park their DOCX files in
+        resume_data (Resume or dict): Parsed resume, for match scores
+        job_listings (list): Job listing texts, in submission order
+        original_filename (str): Uploaded filename, recorded in the manifest
+        timeout (float): Seconds to wait for all listings, defaults to
+            config.FANOUT_TIMEOUT; listings still unfinished are recorded as
+            timed out and their late results expire with the result store
+
+    Yields:
+        bytes: Consecutive chunks of the zip archive
+    """
+    timeout = config.FANOUT_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    archive = ZipStream()
+    entries = [None] * len(job_listings)
+    for _ in job_listings:
+        try:
+            index, job_data, result_id, error, seconds = results.get(timeout=max(0, deadline - time.monotonic()))
+        except queue.Empty:
+            break
+        content = None
+        if result_id is not None:
+            content = _take_result(result_store, result_id)
+            if content is None:
+                error = 'Result expired before it was sent'
+        entry = _manifest_entry(index, job_listings[index], 'failed' if error else 'done', error, seconds, job_data)
+        entries[index] = entry
+        if content is not None:
+            entry['file'] = entry_name(index, job_listings[index])
+            yield archive.add(entry['file'], content, compress=False)
+
+    for index, entry in enumerate(entries):
+        if entry is None:
+            entries[index] = _manifest_entry(index, job_listings[index], TIMED_OUT,
+                                             f'Not finished within {timeout}s')
+
+    # All listings scored against the uploaded resume in one call
+    analyzed = [entry for entry in entries if entry['job_data'] is not None]
+    if analyzed:
+        scores = score_resume(resume_data, [entry['job_data'] for entry in analyzed])['match_scores']
+        for entry, score in zip(analyzed, scores):
+            entry['match_score'] = round(float(score), 4)
+    for entry in entries:
+        entry.pop('job_data')
+
+    manifest = {
+        'resume': original_filename,
+        'listings': entries,
+    }
+    yield archive.add(MANIFEST_NAME, json.dumps(manifest, indent=2))
+    yield archive.close()
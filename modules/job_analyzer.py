@@ -1,20 +1,35 @@
-"""Job Analyzer Module - Simple version"""
+"""Job Analyzer Module - Extracts skills from job listings using the skill taxonomy"""
+import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+from modules.skill_matcher import get_default_matcher
+from modules.progress import stage
+
+# Number of top-ranked skills reported as required; the rest are preferred
+REQUIRED_SKILL_COUNT = 5
+
+@stage('analyze')
+def analyze_job_listing(job_text, matcher=None):
+    """
+    Analyze a job listing and rank the skills it mentions.
+
+    Args:
+        job_text (str): Full job listing text
+        matcher (SkillMatcher): Skill matcher to use. Defaults to the shared
+            matcher built from the bundled taxonomy.
+
+    Returns:
+        dict: Job data with skills ranked by how often they are mentioned
+    """
+    matcher = matcher or get_default_matcher()
+
+    # Find taxonomy skills in one pass, most frequently mentioned first
+    ranked = matcher.rank(job_text)
+    skills = [entry['skill'] for entry in ranked]
 
-def analyze_job_listing(job_text):
-    """Analyze job listing with basic extraction."""
-    print("Using simplified job analyzer...")
-    
-    # Extract skills (common keywords)
-    skills = []
-    common_skills = ["python", "javascript", "html", "css", "communication", 
-                     "teamwork", "leadership", "server", "hospitality", 
-                     "food", "drink", "customer service", "detail", "professional"]
-    
-    for skill in common_skills:
-        if skill.lower() in job_text.lower():
-            skills.append(skill)
-    
     # Extract additional skill phrases
     skill_phrases = re.findall(r'experience (?:with|in) ([\w\s,]+)', job_text.lower())
     for phrase in skill_phrases:
@@ -22,15 +37,91 @@ def analyze_job_listing(job_text):
             clean_skill = skill.strip()
             if clean_skill and clean_skill not in skills:
                 skills.append(clean_skill)
-    
+
     # Create basic job data
     return {
-        "required_skills": skills[:5],
-        "preferred_skills": skills[5:] if len(skills) > 5 else [],
+        "required_skills": skills[:REQUIRED_SKILL_COUNT],
+        "preferred_skills": skills[REQUIRED_SKILL_COUNT:],
         "responsibilities": ["Responsibilities as listed in job description"],
         "company_values": ["Team collaboration", "Professional environment"],
         "keywords": skills,
+        "skill_frequencies": {entry['skill']: entry['count'] for entry in ranked},
+        "skill_positions": {entry['skill']: entry['positions'] for entry in ranked},
         "experience_level": "As specified",
         "education": "As specified",
         "job_title": "Position"
     }
+
+def _analyze_chunk(job_texts):
+    """Analyze a chunk of listings in a worker process."""
+    return [analyze_job_listing(job_text) for job_text in job_texts]
+
+def _chunks(iterable, size):
+    """Lazily split an iterable into lists of at most size items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def analyze_job_listings(job_texts, workers=None, chunksize=32, ordered=True):
+    """
+    Analyze many job listings across a process pool.
+
+    The input is consumed lazily and only a bounded number of chunks is in
+    flight at once, so memory stays flat however large the feed is.
+
+    Args:
+        job_texts (iterable): Job listing strings
+        workers (int): Worker processes; defaults to the CPU count. With 1,
+            listings are analyzed in the calling process.
+        chunksize (int): Listings sent to a worker per task
+        ordered (bool): Yield results in input order, or as soon as each
+            chunk completes
+
+    Yields:
+        tuple: (index of the listing in the input, job data dict)
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(job_texts, chunksize)
+
+    if workers == 1:
+        index = 0
+        for chunk in chunks:
+            for result in _analyze_chunk(chunk):
+                yield index, result
+                index += 1
+        return
+
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()   # (start index, future) in submission order
+        next_index = 0
+        exhausted = False
+
+        while True:
+            # Keep the pool busy without reading ahead more than the window
+            while not exhausted and len(pending) < max_in_flight:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                pending.append((next_index, executor.submit(_analyze_chunk, chunk)))
+                next_index += len(chunk)
+
+            if not pending:
+                return
+
+            if ordered:
+                start, future = pending.popleft()
+                done = [(start, future)]
+            else:
+                finished, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                done = [item for item in pending if item[1] in finished]
+                for item in done:
+                    pending.remove(item)
+
+            for start, future in done:
+                for offset, result in enumerate(future.result()):
+                    yield start + offset, result
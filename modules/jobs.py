@@ -0,0 +1,182 @@
+"""
+Jobs Module - Runs optimizations on a bounded background executor.
+
+Requests submit work and get a job ID back immediately; the job's state can
+then be polled until its result is ready. Finished jobs expire after a TTL.
+"""
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from modules import metrics
+from modules.progress import ProgressReporter, reporting
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already queued or running."""
+
+
+class Job:
+    """State of a single background job."""
+
+    def __init__(self, job_id, kind=None):
+        self.id = job_id
+        self.kind = kind
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.progress = ProgressReporter()
+
+    @property
+    def pending(self):
+        """Whether the job has not finished yet."""
+        return self.state in (QUEUED, RUNNING)
+
+    def to_dict(self):
+        """
+        Summarize the job for status responses.
+
+        Returns:
+            dict: Job ID, state, error message and timings
+        """
+        return {
+            'job_id': self.id,
+            'state': self.state,
+            'error': self.error,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+            'stages': self.progress.timings(),
+        }
+
+
+class JobManager:
+    """
+    Bounded background executor with job tracking and TTL expiry.
+
+    Args:
+        max_workers (int): Jobs that run concurrently
+        max_pending (int): Maximum queued plus running jobs before submissions
+            are rejected
+        ttl (float): Seconds a finished job is kept before it expires
+    """
+
+    def __init__(self, max_workers=4, max_pending=32, ttl=3600):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Queue a function to run in the background.
+
+        Args:
+            fn (callable): Work to run; its return value becomes the job result
+
+        Returns:
+            str: ID of the new job
+
+        Raises:
+            JobQueueFull: If max_pending jobs are already queued or running
+        """
+        return self.submit_batch([(fn, args, kwargs)])[0]
+
+    def submit_batch(self, calls, kind=None, max_kind_pending=None):
+        """
+        Queue several functions at once; either all of them are queued or none.
+
+        Args:
+            calls (list): (fn, args, kwargs) tuples
+            kind (str): Label for the jobs, e.g. 'fanout'
+            max_kind_pending (int): Maximum queued plus running jobs of this
+                kind, so one kind of work cannot take the whole queue
+
+        Returns:
+            list: IDs of the new jobs, in the order of calls
+
+        Raises:
+            JobQueueFull: If the calls would take more than max_pending jobs,
+                or more than max_kind_pending jobs of their kind, queued or
+                running
+        """
+        self.sweep()
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job.pending)
+            if pending + len(calls) > self.max_pending:
+                raise JobQueueFull(f"{pending} jobs already in progress")
+            if max_kind_pending is not None:
+                kind_pending = sum(1 for job in self._jobs.values() if job.pending and job.kind == kind)
+                if kind_pending + len(calls) > max_kind_pending:
+                    raise JobQueueFull(f"{kind_pending} {kind} jobs already in progress")
+            jobs = [Job(uuid.uuid4().hex, kind) for _ in calls]
+            for job in jobs:
+                self._jobs[job.id] = job
+
+        for job, (fn, args, kwargs) in zip(jobs, calls):
+            self._executor.submit(self._run, job, fn, args, kwargs)
+        return [job.id for job in jobs]
+
+    def get(self, job_id):
+        """
+        Look up a job that has not expired.
+
+        Args:
+            job_id (str): ID returned by submit()
+
+        Returns:
+            Job or None: The job, or None if unknown or expired
+        """
+        if not job_id:
+            return None
+        self.sweep()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def sweep(self):
+        """
+        Remove finished jobs older than the TTL.
+
+        Returns:
+            list: Jobs that were expired
+        """
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [job for job in self._jobs.values()
+                       if job.finished is not None and job.finished < cutoff]
+            for job in expired:
+                del self._jobs[job.id]
+        return expired
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs and optionally wait for running ones."""
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job, fn, args, kwargs):
+        job.state = RUNNING
+        job.started = time.time()
+        try:
+            with reporting(job.progress):
+                job.result = fn(*args, **kwargs)
+            job.state = DONE
+        except Exception as e:
+            print(f"ERROR in job {job.id}: {str(e)}")
+            print(traceback.format_exc())
+            job.error = str(e)
+            job.state = FAILED
+        finally:
+            job.finished = time.time()
+            metrics.JOBS.inc(state=job.state)
+            job.progress.emit('job', job.state, error=job.error)
+            job.progress.close()
@@ -0,0 +1,284 @@
+"""
+LLM Cache Module - Caches model responses and coalesces identical requests.
+
+Responses are keyed on a normalized hash of the prompt inputs plus the model
+settings that affect the output. Identical requests that arrive while one is
+already in flight wait for that call instead of issuing their own.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import config
+
+
+def _normalize(value):
+    """Collapse insignificant whitespace in every string of a JSON-like value."""
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_key(inputs, model=None, temperature=None, max_output_tokens=None):
+    """
+    Build a cache key for a model request.
+
+    Args:
+        inputs: JSON-serializable prompt inputs (e.g. resume and job data)
+        model (str): Model name, defaults to config.GEMINI_MODEL
+        temperature (float): Defaults to config.OPTIMIZATION_TEMPERATURE
+        max_output_tokens (int): Defaults to config.MAX_OUTPUT_TOKENS
+
+    Returns:
+        str: Hex SHA-256 of the normalized inputs and settings
+    """
+    payload = {
+        'inputs': _normalize(inputs),
+        'model': model or config.GEMINI_MODEL,
+        'temperature': config.OPTIMIZATION_TEMPERATURE if temperature is None else temperature,
+        'max_output_tokens': config.MAX_OUTPUT_TOKENS if max_output_tokens is None else max_output_tokens,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class MemoryBackend:
+    """
+    In-process LRU store with per-entry TTL.
+
+    Args:
+        max_entries (int): Entries kept before the least recently used is evicted
+        ttl (float): Seconds an entry stays valid
+    """
+
+    def __init__(self, max_entries=1024, ttl=24 * 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.time():
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """
+    SQLite store with TTL and LRU eviction, shared between processes.
+
+    Args:
+        path (str): Database file
+        max_entries (int): Entries kept before the least recently used are evicted
+        ttl (float): Seconds an entry stays valid
+    """
+
+    def __init__(self, path, max_entries=10000, ttl=24 * 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS llm_cache ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' expires REAL NOT NULL,'
+            ' accessed REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed)')
+        self._db.commit()
+
+    def get(self, key):
+        with self._lock:
+            now = time.time()
+            row = self._db.execute('SELECT value, expires FROM llm_cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._db.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                self._db.commit()
+                self.evictions += 1
+                return None
+            self._db.execute('UPDATE llm_cache SET accessed = ? WHERE key = ?', (now, key))
+            self._db.commit()
+            return row[0]
+
+    def set(self, key, value):
+        with self._lock:
+            now = time.time()
+            self._db.execute(
+                'INSERT OR REPLACE INTO llm_cache (key, value, expires, accessed) VALUES (?, ?, ?, ?)',
+                (key, value, now + self.ttl, now)
+            )
+            self.evictions += self._db.execute('DELETE FROM llm_cache WHERE expires < ?', (now,)).rowcount
+            self.evictions += self._db.execute(
+                'DELETE FROM llm_cache WHERE key IN ('
+                ' SELECT key FROM llm_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            ).rowcount
+            self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Response cache with single-flight coalescing of identical requests.
+
+    Args:
+        backend: MemoryBackend, SQLiteBackend or any object with get/set
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+    def get(self, key):
+        """
+        Look up a cached response without computing it.
+
+        Args:
+            key (str): Key from make_key()
+
+        Returns:
+            str or None: The cached response, or None on a miss
+        """
+        value = self.backend.get(key)
+        if value is not None:
+            with self._lock:
+                self._counters['hits'] += 1
+        return value
+
+    def get_or_compute(self, key, compute, timeout=None):
+        """
+        Return the cached response for a key, computing it at most once.
+
+        If another thread is already computing the same key, this call waits
+        for that result (or its exception) instead of calling compute.
+        Failures are not cached.
+
+        With a timeout, a waiting call gives up after that many seconds, and
+        a computation running past its own timeout no longer takes followers:
+        a retry after a deadline starts a fresh call instead of rejoining the
+        one that missed it.
+
+        Args:
+            key (str): Key from make_key()
+            compute (callable): Produces the response string on a miss
+            timeout (float): Seconds to wait for, or to lead, a computation
+
+        Returns:
+            str: The response
+
+        Raises:
+            concurrent.futures.TimeoutError: If a shared computation does not
+                finish within the timeout
+        """
+        value = self.backend.get(key)
+        if value is not None:
+            with self._lock:
+                self._counters['hits'] += 1
+            return value
+
+        with self._lock:
+            now = time.monotonic()
+            inflight = self._inflight.get(key)
+            # (future, deadline); a leader past its deadline is abandoned, not joined
+            leader = inflight is None or (inflight[1] is not None and inflight[1] <= now)
+            if leader:
+                future = Future()
+                self._inflight[key] = (future, None if timeout is None else now + timeout)
+                self._counters['misses'] += 1
+            else:
+                future = inflight[0]
+                self._counters['coalesced'] += 1
+
+        if not leader:
+            return future.result(timeout)
+
+        try:
+            value = compute()
+            self.backend.set(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                # A newer leader may have replaced an abandoned computation
+                if self._inflight.get(key, (None,))[0] is future:
+                    del self._inflight[key]
+
+    def stats(self):
+        """
+        Report cache counters.
+
+        Returns:
+            dict: Hits, misses, coalesced waits, evictions and entry count
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        stats['evictions'] = self.backend.evictions
+        stats['entries'] = len(self.backend)
+        return stats
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache():
+    """
+    Return the shared response cache configured in config, creating it on first use.
+
+    Returns:
+        ResponseCache: Cache backed by config.LLM_CACHE_BACKEND
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                if config.LLM_CACHE_BACKEND == 'sqlite':
+                    backend = SQLiteBackend(config.LLM_CACHE_PATH, config.LLM_CACHE_MAX_ENTRIES,
+                                            config.LLM_CACHE_TTL)
+                else:
+                    backend = MemoryBackend(config.LLM_CACHE_MAX_ENTRIES, config.LLM_CACHE_TTL)
+                _default_cache = ResponseCache(backend)
+    return _default_cache
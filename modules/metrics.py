@@ -0,0 +1,503 @@
+"""
+Metrics Module - Stage latency histograms and counters in Prometheus text format.
+
+Recording is a dict update under a per-metric lock, cheap enough for every
+request and pipeline stage. Pipeline stages are timed through progress.stage;
+finer-grained steps such as section identification and file I/O use timed().
+Caches are exported by collectors that read their stats() when metrics are
+gathered.
+
+With a metrics directory configured (config.METRICS_DIR), every process
+writes its values to <pid>-<random id>.json there in the background, and
+/metrics in any process reports the sum over all of them, so counts are
+complete under multi-process servers. The random part keeps a process that
+reuses an exited one's PID from overwriting its file. Counters and
+histograms of exited processes are kept: their files are folded into a
+single exited.json by the next flush, so the directory does not grow with
+worker restarts. Collector values (cache sizes and counters) only count for
+live processes.
+"""
+import atexit
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import config
+
+# Latency buckets in seconds, from fast cache hits to slow model calls
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# Upload size buckets in bytes, up to the 16MB request limit
+SIZE_BUCKETS = tuple(1024 * 2 ** power for power in range(0, 15, 2))
+
+# File in the metrics directory holding the summed values of exited processes
+EXITED_NAME = 'exited.json'
+EXITED_LOCK = 'exited.lock'
+# A process file not written for this many flush intervals belongs to an exited
+# process even if its PID is alive again (the PID was reused)
+STALE_FLUSHES = 60
+
+# Stage names being timed in the current context, so nested calls are timed once
+_active_stages = contextvars.ContextVar('metrics_active_stages', default=())
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels.
+
+    Args:
+        name (str): Metric name
+        help_text (str): Description shown in the exposition
+        labelnames (tuple): Label names, passed to inc() as keyword arguments
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def family(self):
+        """Current values as a JSON-serializable metric family."""
+        with self._lock:
+            series = [[list(key), value] for key, value in self._series.items()]
+        return {'type': self.kind, 'help': self.help, 'labelnames': list(self.labelnames), 'series': series}
+
+
+class Histogram(Counter):
+    """
+    Histogram of observed values with optional labels.
+
+    Args:
+        name (str): Metric name
+        help_text (str): Description shown in the exposition
+        labelnames (tuple): Label names, passed to observe() as keyword arguments
+        buckets (tuple): Upper bounds of the buckets; +Inf is added
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def inc(self, amount=1, **labels):
+        raise TypeError("Histograms are recorded with observe()")
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+            series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def family(self):
+        with self._lock:
+            series = [[list(key), {'counts': list(value['counts']), 'sum': value['sum'], 'count': value['count']}]
+                      for key, value in self._series.items()]
+        return {'type': self.kind, 'help': self.help, 'labelnames': list(self.labelnames),
+                'buckets': list(self.buckets), 'series': series}
+
+
+def _merge(families, name, family):
+    """Add one family's series into a dict of merged families."""
+    merged = families.get(name)
+    if merged is None:
+        merged = families[name] = dict(family, series={})
+    for labels, value in family['series']:
+        key = tuple(labels)
+        current = merged['series'].get(key)
+        if current is None:
+            merged['series'][key] = value if not isinstance(value, dict) else {
+                'counts': list(value['counts']), 'sum': value['sum'], 'count': value['count']}
+        elif isinstance(value, dict):
+            current['counts'] = [a + b for a, b in zip(current['counts'], value['counts'])]
+            current['sum'] += value['sum']
+            current['count'] += value['count']
+        else:
+            merged['series'][key] = current + value
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _process_file_pid(name):
+    """PID in a per-process file name (<pid>-<id>.json), or None for other files."""
+    head, _, rest = name.partition('-')
+    if not rest.endswith('.json') or not head.isdigit():
+        return None
+    return int(head)
+
+
+def _write_json(path, value):
+    """Write a JSON file atomically."""
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(value, f)
+    os.replace(path + '.tmp', path)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+class Registry:
+    """
+    A set of metrics and collectors, optionally shared across processes.
+
+    Args:
+        directory (str): Directory where each process writes its values, or
+            None to report only this process
+        flush_interval (float): Seconds between writes to the directory
+    """
+
+    def __init__(self, directory=None, flush_interval=5):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._file_name = self._new_file_name()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._start_flusher()
+            atexit.register(self.flush)
+            # A forked worker starts from zero rather than repeating the parent's counts
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _start_flusher(self):
+        thread = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+        thread.start()
+
+    @staticmethod
+    def _new_file_name():
+        return f"{os.getpid()}-{uuid.uuid4().hex[:12]}.json"
+
+    def _after_fork(self):
+        for metric in self._metrics.values():
+            metric.reset()
+        self._file_name = self._new_file_name()
+        self._start_flusher()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Writing metrics failed: {str(e)}")
+
+    def counter(self, name, help_text, labelnames=()):
+        """Create and register a Counter."""
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        """Create and register a Histogram."""
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector):
+        """
+        Register a function that reports values when metrics are gathered.
+
+        Args:
+            collector (callable): Returns a dict of metric name to family
+                ({'type': 'counter' or 'gauge', 'help', 'labelnames', 'series':
+                [[label values, value], ...]})
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def snapshot(self):
+        """
+        This process's values.
+
+        Returns:
+            dict: 'metrics' and 'collected' metric families by name
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        collected = {}
+        for collector in collectors:
+            try:
+                for name, family in collector().items():
+                    _merge(collected, name, family)
+            except Exception as e:
+                print(f"Metrics collector {getattr(collector, '__qualname__', collector)} failed: {str(e)}")
+        for family in collected.values():
+            family['series'] = [[list(key), value] for key, value in family['series'].items()]
+        return {'metrics': {metric.name: metric.family() for metric in metrics}, 'collected': collected}
+
+    def flush(self):
+        """Write this process's values to the metrics directory and fold in exited processes."""
+        if not self.directory:
+            return
+        _write_json(os.path.join(self.directory, self._file_name), self.snapshot())
+        self._fold_exited()
+
+    def _is_exited(self, name, pid):
+        if not _pid_alive(pid):
+            return True
+        try:
+            age = time.time() - os.path.getmtime(os.path.join(self.directory, name))
+        except OSError:
+            return False
+        return age > STALE_FLUSHES * self.flush_interval
+
+    def _read_exited(self):
+        """The exited-process aggregate: summed metrics and the file names already folded in."""
+        try:
+            with open(os.path.join(self.directory, EXITED_NAME), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'metrics': {}, 'folded': []}
+
+    def _fold_exited(self):
+        """
+        Merge the files of exited processes into exited.json and remove them.
+
+        One process folds at a time, under a lock file. The aggregate records
+        which files it already holds, so a crash between writing it and
+        removing those files never counts them twice.
+        """
+        lock = os.path.join(self.directory, EXITED_LOCK)
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            # Another process is folding; break a lock left behind by one that died
+            try:
+                if os.path.getmtime(lock) < time.time() - STALE_FLUSHES * self.flush_interval:
+                    os.remove(lock)
+            except OSError:
+                pass
+            return
+        try:
+            names = os.listdir(self.directory)
+            aggregate = self._read_exited()
+            folded = set(aggregate['folded']) & set(names)
+            exited = [name for name in names
+                      if name not in folded and name != self._file_name
+                      and _process_file_pid(name) is not None
+                      and self._is_exited(name, _process_file_pid(name))]
+            if exited:
+                families = {}
+                for name, family in aggregate['metrics'].items():
+                    _merge(families, name, family)
+                for name in exited:
+                    try:
+                        with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as f:
+                            snapshot = json.load(f)
+                    except (OSError, ValueError):
+                        continue
+                    for metric_name, family in snapshot['metrics'].items():
+                        _merge(families, metric_name, family)
+                    folded.add(name)
+                for family in families.values():
+                    family['series'] = [[list(key), value] for key, value in family['series'].items()]
+                _write_json(os.path.join(self.directory, EXITED_NAME),
+                            {'metrics': families, 'folded': sorted(folded)})
+            elif not folded:
+                return
+            for name in folded:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+        finally:
+            try:
+                os.remove(lock)
+            except OSError:
+                pass
+
+    def _read_directory(self):
+        """(alive, snapshot) for the exited aggregate and every other process's file."""
+        for _ in range(3):
+            names = os.listdir(self.directory)
+            aggregate = self._read_exited()
+            folded = set(aggregate['folded'])
+            snapshots = [(False, {'metrics': aggregate['metrics'], 'collected': {}})]
+            vanished = False
+            for name in names:
+                pid = _process_file_pid(name)
+                if pid is None or name == self._file_name or name in folded:
+                    continue
+                try:
+                    with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as f:
+                        snapshot = json.load(f)
+                except FileNotFoundError:
+                    # Folded into the aggregate after it was read; read everything again
+                    vanished = True
+                    break
+                except (OSError, ValueError):
+                    continue
+                snapshots.append((not self._is_exited(name, pid), snapshot))
+            if not vanished:
+                break
+        return snapshots
+
+    def collect(self):
+        """
+        Values of all processes sharing the directory (or just this one), merged.
+
+        Returns:
+            dict: Metric name to family with series keyed by label values
+        """
+        families = {}
+        snapshots = [(True, self.snapshot())]
+        if self.directory:
+            snapshots.extend(self._read_directory())
+
+        for alive, snapshot in snapshots:
+            for name, family in snapshot['metrics'].items():
+                _merge(families, name, family)
+            if alive:
+                for name, family in snapshot['collected'].items():
+                    _merge(families, name, family)
+        return families
+
+    def exposition(self):
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text
+        """
+        lines = []
+        for name, family in sorted(self.collect().items()):
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            names = family['labelnames']
+            for labels, value in sorted(family['series'].items()):
+                if family['type'] != 'histogram':
+                    lines.append(f"{name}{_format_labels(names, labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(family['buckets']) + [float('inf')], value['counts']):
+                    cumulative += count
+                    le = ('le', _format_value(float(bound)))
+                    lines.append(f"{name}_bucket{_format_labels(names, labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(names, labels)} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{_format_labels(names, labels)} {value['count']}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry(config.METRICS_DIR or None, config.METRICS_FLUSH_INTERVAL)
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'resume_optimizer_stage_duration_seconds', 'Time spent in each pipeline stage', ('stage',))
+STAGE_ERRORS = REGISTRY.counter(
+    'resume_optimizer_stage_errors_total', 'Pipeline stages that raised an error', ('stage',))
+UPLOAD_BYTES = REGISTRY.histogram(
+    'resume_optimizer_upload_bytes', 'Size of uploaded resumes', buckets=SIZE_BUCKETS)
+REQUEST_SECONDS = REGISTRY.histogram(
+    'resume_optimizer_http_request_duration_seconds', 'HTTP request latency', ('endpoint', 'method', 'status'))
+JOBS = REGISTRY.counter('resume_optimizer_jobs_total', 'Finished optimization jobs', ('state',))
+
+
+@contextmanager
+def timed(stage):
+    """
+    Record the duration of a block, and an error if it raises, under a stage name.
+
+    A stage nested inside a block of the same name (e.g. the basic optimizer
+    run as a fallback inside the Gemini one) is only timed once.
+
+    Args:
+        stage (str): Stage name, e.g. 'sections'
+    """
+    active = _active_stages.get()
+    if stage in active:
+        yield
+        return
+
+    token = _active_stages.set(active + (stage,))
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        _active_stages.reset(token)
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+def add_cache(cache, stats, events, entries=None):
+    """
+    Export a cache's stats() counters as cache event counters.
+
+    Args:
+        cache (str): Cache name for the 'cache' label, e.g. 'parse'
+        stats (callable): The cache's stats method
+        events (tuple): Counter keys of stats() to export as events, e.g. hits and misses
+        entries (str): Key of stats() holding the current entry count, if any
+    """
+    def collect():
+        values = stats()
+        families = {
+            'resume_optimizer_cache_events_total': {
+                'type': 'counter', 'help': 'Cache lookups and evictions by outcome',
+                'labelnames': ['cache', 'event'],
+                'series': [[[cache, event], values.get(event, 0)] for event in events],
+            }
+        }
+        if entries:
+            families['resume_optimizer_cache_entries'] = {
+                'type': 'gauge', 'help': 'Entries currently held by each cache',
+                'labelnames': ['cache'], 'series': [[[cache], values.get(entries, 0)]],
+            }
+        return families
+
+    collect.__qualname__ = f"cache:{cache}"
+    REGISTRY.add_collector(collect)
@@ -0,0 +1,176 @@
+"""
+OOXML Extractor Module - Streams paragraph text straight out of a DOCX package.
+
+Reads the WordprocessingML parts from the zip archive with an incremental
+parse instead of building the python-docx object model, so large table-based
+resumes are read in a single pass with bounded memory.
+"""
+import re
+import zipfile
+
+from lxml import etree
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+MC_NS = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+
+MAIN_DOCUMENT_PART = 'word/document.xml'
+
+_P = f'{{{W_NS}}}p'
+_R = f'{{{W_NS}}}r'
+_T = f'{{{W_NS}}}t'
+_TAB = f'{{{W_NS}}}tab'
+_PTAB = f'{{{W_NS}}}ptab'
+_BR = f'{{{W_NS}}}br'
+_CR = f'{{{W_NS}}}cr'
+_NO_BREAK_HYPHEN = f'{{{W_NS}}}noBreakHyphen'
+_TC = f'{{{W_NS}}}tc'
+_V_MERGE = f'{{{W_NS}}}vMerge'
+_VAL = f'{{{W_NS}}}val'
+_TYPE = f'{{{W_NS}}}type'
+_FALLBACK = f'{{{MC_NS}}}Fallback'
+
+# Only these elements are reported by the parser; everything else stays in C
+_TAGS = (_P, _R, _T, _TAB, _PTAB, _BR, _CR, _NO_BREAK_HYPHEN, _TC, _V_MERGE, _FALLBACK)
+
+_HEADER_PART = re.compile(r'^word/header(\d*)\.xml$')
+_FOOTER_PART = re.compile(r'^word/footer(\d*)\.xml$')
+
+
+class OOXMLExtractionError(Exception):
+    """Raised when a package cannot be read by the streaming extractor."""
+
+
+class UnsupportedLayoutError(OOXMLExtractionError):
+    """Raised for a valid package whose parts are not where the streaming extractor looks for them."""
+
+
+def _iter_part_paragraphs(stream):
+    """
+    Yield the text of every paragraph in one WordprocessingML part.
+
+    Paragraphs are emitted in document order as their closing tag is seen.
+    Paragraphs nested inside text boxes are emitted before the paragraph that
+    anchors them. Vertically merged continuation cells are skipped so each
+    merged cell is read once, and ``mc:Fallback`` branches are ignored because
+    they duplicate the content of the preferred ``mc:Choice`` branch.
+
+    Args:
+        stream: Binary file object positioned at the start of the part
+
+    Yields:
+        str: Text of each paragraph
+    """
+    paragraphs = []      # Text buffers for the open (possibly nested) paragraphs
+    cells = []           # True for each open table cell that is a merge continuation
+    fallback_depth = 0
+    run_depth = 0
+
+    for event, elem in etree.iterparse(stream, events=('start', 'end'), tag=_TAGS,
+                                       resolve_entities=False):
+        tag = elem.tag
+        if event == 'start':
+            if tag == _P:
+                paragraphs.append([])
+            elif tag == _R:
+                run_depth += 1
+            elif tag == _TC:
+                cells.append(False)
+            elif tag == _FALLBACK:
+                fallback_depth += 1
+            continue
+
+        if tag == _T:
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag == _R:
+            run_depth -= 1
+        elif tag == _P:
+            text = ''.join(paragraphs.pop())
+            if not fallback_depth and not (cells and cells[-1]):
+                yield text
+            # Release finished siblings so memory stays flat on long documents
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        elif tag == _V_MERGE:
+            # A vMerge without val="restart" continues the cell above it
+            if cells and elem.get(_VAL, 'continue') != 'restart':
+                cells[-1] = True
+        elif tag == _TC:
+            cells.pop()
+        elif tag == _FALLBACK:
+            fallback_depth -= 1
+        elif run_depth and paragraphs:
+            # Run content only; w:tab also appears in w:pPr as a tab stop definition
+            if tag == _TAB or tag == _PTAB:
+                paragraphs[-1].append('\t')
+            elif tag == _BR:
+                # Only line breaks carry text; page and column breaks do not
+                if elem.get(_TYPE, 'textWrapping') == 'textWrapping':
+                    paragraphs[-1].append('\n')
+            elif tag == _CR:
+                paragraphs[-1].append('\n')
+            elif tag == _NO_BREAK_HYPHEN:
+                paragraphs[-1].append('-')
+
+
+def _part_sort_key(name, pattern):
+    """Order header/footer parts numerically (header2 before header10)."""
+    number = pattern.match(name).group(1)
+    return int(number) if number else 0
+
+
+def extract_paragraphs(source, include_headers=True):
+    """
+    Extract paragraph text from a DOCX package in document order.
+
+    Headers are emitted before the body and footers after it, matching the
+    order in which they appear on the page.
+
+    Args:
+        source: Path to the DOCX file or a binary file object
+        include_headers (bool): Whether to include header and footer parts
+
+    Returns:
+        list: Paragraph strings in document order
+
+    Raises:
+        UnsupportedLayoutError: If the main part is not at word/document.xml
+        OOXMLExtractionError: If the file is not a zip package or a part is
+            not well-formed XML
+    """
+    try:
+        with zipfile.ZipFile(source) as package:
+            names = package.namelist()
+            if MAIN_DOCUMENT_PART not in names:
+                raise UnsupportedLayoutError(f"Missing {MAIN_DOCUMENT_PART} in package")
+
+            headers, footers = [], []
+            if include_headers:
+                headers = sorted((n for n in names if _HEADER_PART.match(n)),
+                                 key=lambda n: _part_sort_key(n, _HEADER_PART))
+                footers = sorted((n for n in names if _FOOTER_PART.match(n)),
+                                 key=lambda n: _part_sort_key(n, _FOOTER_PART))
+
+            paragraphs = []
+            for part in headers + [MAIN_DOCUMENT_PART] + footers:
+                with package.open(part) as stream:
+                    paragraphs.extend(_iter_part_paragraphs(stream))
+            return paragraphs
+
+    except (zipfile.BadZipFile, etree.XMLSyntaxError, KeyError) as e:
+        raise OOXMLExtractionError(str(e)) from e
+
+
+def extract_text(source, include_headers=True):
+    """
+    Extract the full text of a DOCX package as newline-joined paragraphs.
+
+    Args:
+        source: Path to the DOCX file or a binary file object
+        include_headers (bool): Whether to include header and footer parts
+
+    Returns:
+        str: Full text content of the document
+    """
+    return '\n'.join(extract_paragraphs(source, include_headers=include_headers))
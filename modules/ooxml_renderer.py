@@ -0,0 +1,154 @@
+"""
+OOXML Renderer Module - Writes resume DOCX packages directly, without python-docx.
+
+Every package part except word/document.xml is copied from the cached style
+template (see docx_templates). The document body is generated as XML text and
+streamed into the zip entry paragraph by paragraph, which avoids building a
+python-docx object tree for every resume. The XML matches what the python-docx
+backend produces for the same layout.
+"""
+import io
+import re
+import threading
+import time
+import zipfile
+
+from modules.docx_templates import get_template, template_bytes
+from modules.resume_layout import BULLET, HEADING
+
+DOCUMENT_PART = 'word/document.xml'
+
+# Flush generated XML into the zip stream in chunks of about this many characters
+WRITE_CHUNK = 64 * 1024
+
+_RUN_BREAKS = re.compile(r'([\t\r\n])')
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+_packages = {}
+_packages_lock = threading.Lock()
+
+
+class _TemplatePackage:
+    """A template split into a zip of its static parts and the body's surrounding XML."""
+
+    def __init__(self, name):
+        source = zipfile.ZipFile(io.BytesIO(template_bytes(name)))
+        document = source.read(DOCUMENT_PART).decode('utf-8')
+        split = document.index('<w:sectPr')
+        self.document_head = document[:split].encode('utf-8')
+        self.document_tail = document[split:].encode('utf-8')
+        self.border_color = get_template(name)['border_color']
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as static:
+            for info in source.infolist():
+                if info.filename != DOCUMENT_PART:
+                    static.writestr(info.filename, source.read(info.filename))
+        self.static_zip = buffer.getvalue()
+
+
+def _package(name):
+    package = _packages.get(name)
+    if package is None:
+        with _packages_lock:
+            package = _packages.get(name)
+            if package is None:
+                package = _TemplatePackage(name)
+                _packages[name] = package
+    return package
+
+
+def _escape(text):
+    if _INVALID_XML.search(text):
+        raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def run_xml(text, bold=False):
+    """
+    Build the XML of a text run the way python-docx does.
+
+    Tabs become w:tab, line breaks become w:br, and text with leading or
+    trailing whitespace is marked xml:space="preserve".
+
+    Args:
+        text (str): Run text
+        bold (bool): Whether the run is bold
+
+    Returns:
+        str: A w:r element
+    """
+    parts = ['<w:r><w:rPr><w:b/></w:rPr>' if bold else '<w:r>']
+    for piece in _RUN_BREAKS.split(text):
+        if piece == '\t':
+            parts.append('<w:tab/>')
+        elif piece in ('\r', '\n'):
+            parts.append('<w:br/>')
+        elif piece:
+            space = ' xml:space="preserve"' if len(piece.strip()) < len(piece) else ''
+            parts.append(f'<w:t{space}>{_escape(piece)}</w:t>')
+    parts.append('</w:r>')
+    return ''.join(parts)
+
+
+def paragraph_xml(kind, style, text, border_color):
+    """
+    Build the XML of one laid-out paragraph.
+
+    Args:
+        kind (str): HEADING, PARAGRAPH or BULLET from resume_layout
+        style (str): Paragraph style ID
+        text (str): Paragraph text
+        border_color (str): Hex colour of the heading underline
+
+    Returns:
+        str: A w:p element
+    """
+    if kind == HEADING:
+        properties = (f'<w:pPr><w:pStyle w:val="{style}"/><w:pBdr><w:bottom w:val="single" w:sz="6" '
+                      f'w:space="1" w:color="{border_color}"/></w:pBdr></w:pPr>')
+    else:
+        properties = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>'
+
+    if kind == BULLET:
+        runs = run_xml("• ", bold=True) + run_xml(text)
+    else:
+        runs = run_xml(text) if text else ''
+    return f'<w:p>{properties}{runs}</w:p>'
+
+
+def render_ooxml(blocks, output, template):
+    """
+    Write a DOCX package from laid-out paragraphs.
+
+    Args:
+        blocks (iterable): (kind, style, text) tuples from resume_layout.layout_resume
+        output: Path to save the DOCX to, or a writable binary file object
+        template (str): Template name from docx_templates.TEMPLATES
+    """
+    package = _package(template)
+    buffer = io.BytesIO(package.static_zip)
+    with zipfile.ZipFile(buffer, 'a', zipfile.ZIP_DEFLATED) as archive:
+        info = zipfile.ZipInfo(DOCUMENT_PART, date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with archive.open(info, 'w') as document:
+            document.write(package.document_head)
+            pending = []
+            size = 0
+            for kind, style, text in blocks:
+                xml = paragraph_xml(kind, style, text, package.border_color)
+                pending.append(xml)
+                size += len(xml)
+                if size >= WRITE_CHUNK:
+                    document.write(''.join(pending).encode('utf-8'))
+                    pending = []
+                    size = 0
+            document.write(''.join(pending).encode('utf-8'))
+            document.write(package.document_tail)
+
+    data = buffer.getvalue()
+    if isinstance(output, (str, bytes)) or hasattr(output, '__fspath__'):
+        with open(output, 'wb') as f:
+            f.write(data)
+    else:
+        output.write(data)
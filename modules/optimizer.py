@@ -1,31 +1,169 @@
-"""Resume Optimizer Module - Simple version"""
+"""Resume Optimizer Module - Basic and Gemini-backed optimizers"""
+import json
+import re
 
+import config
+from modules import gemini_client
+from modules.llm_cache import get_default_cache, make_key
+from modules.progress import stage
+from modules.relevance import reorder_bullets
+from modules.resume_model import as_resume, to_plain
+
+@stage('optimize')
 def optimize_resume(resume_data, job_data):
     """Create an optimized resume directly."""
     print("Using simplified resume optimizer...")
     
-    # Create deep copy of the resume data to avoid structure loss
-    import copy
-    optimized = copy.deepcopy(resume_data)
+    # Parts left unchanged are shared with the input, not copied
+    resume = as_resume(resume_data)
     
     # Get job skills and current skills
     job_skills = job_data.get('required_skills', [])
-    current_skills = optimized.get('skills', [])
+    current_skills = list(resume.skills)
     
     # Add job skills to resume skills
+    known_skills = set(current_skills)
     for skill in job_skills:
-        if skill not in current_skills:
+        if skill not in known_skills:
+            known_skills.add(skill)
             current_skills.append(skill)
     
-    optimized['skills'] = current_skills
+    # Lead each job with the bullets most relevant to the listing
+    if config.REORDER_BULLETS:
+        resume, _ = reorder_bullets(resume, job_data)
     
     # Enhance summary
     skill_text = ', '.join(job_skills[:3]) if job_skills else "relevant skills"
-    if optimized.get('summary'):
-        optimized['summary'] = f"Professional with expertise in {skill_text}. " + optimized.get('summary')
+    if resume.summary:
+        summary = f"Professional with expertise in {skill_text}. " + resume.summary
     else:
-        optimized['summary'] = f"Professional with expertise in {skill_text} seeking new opportunities."
+        summary = f"Professional with expertise in {skill_text} seeking new opportunities."
     
     # Add optimization note
-    optimized['_optimization_note'] = "Basic optimization applied"
-    return optimized
+    return resume.replace(skills=current_skills, summary=summary,
+                          optimization_note="Basic optimization applied")
+
+# Resume fields sent to the model; raw_text duplicates them and only inflates the prompt
+PROMPT_RESUME_FIELDS = ('contact_info', 'summary', 'skills', 'experience', 'education',
+                        'projects', 'certifications', 'languages', 'interests')
+
+# Job fields that describe the target role
+PROMPT_JOB_FIELDS = ('job_title', 'required_skills', 'preferred_skills', 'responsibilities',
+                     'company_values', 'experience_level', 'education')
+
+OPTIMIZE_PROMPT = """You are an expert resume writer. Tailor the resume below to the job.
+Keep every fact truthful: do not invent employers, dates, degrees or contact details.
+Rewrite the summary and experience bullets to emphasize the job's skills and add
+relevant skills the candidate plausibly has. Return ONLY a JSON object with exactly
+the same keys and structure as the input resume.
+
+<job_json>
+{job_json}
+</job_json>
+
+<resume_json>
+{resume_json}
+</resume_json>
+"""
+
+def parse_model_json(text):
+    """
+    Parse a JSON object from a model response, tolerating code fences.
+
+    Args:
+        text (str): Model response text
+
+    Returns:
+        dict or list: Parsed JSON value
+
+    Raises:
+        ValueError: If no JSON value can be parsed
+    """
+    text = text.strip()
+    fenced = re.match(r'^```(?:json)?\s*(.*?)\s*```$', text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+    return json.loads(text)
+
+def parse_model_object(text):
+    """
+    Parse a JSON object from a model response.
+
+    Used as the cache validator for whole-resume rewrites, so a reply that
+    parses as a list or a string is rejected before it is cached.
+
+    Args:
+        text (str): Model response text
+
+    Returns:
+        dict: Parsed JSON object
+
+    Raises:
+        ValueError: If the response is not a JSON object
+    """
+    value = parse_model_json(text)
+    if not isinstance(value, dict):
+        raise ValueError("Model response is not a JSON object")
+    return value
+
+def cached_generate(prompt_inputs, prompt, cache=None, validate=None):
+    """
+    Generate a model response through the response cache.
+
+    Args:
+        prompt_inputs: JSON-serializable inputs that fully determine the prompt
+        prompt (str): Rendered prompt text
+        cache (ResponseCache): Cache to use, defaults to the shared cache
+        validate (callable): Called with the response text; raising rejects
+            the response so it is not cached
+
+    Returns:
+        str: Model response text
+    """
+    cache = cache or get_default_cache()
+    key = make_key(prompt_inputs)
+    
+    def compute():
+        text = gemini_client.generate(prompt)
+        if validate is not None:
+            validate(text)
+        return text
+    
+    return cache.get_or_compute(key, compute)
+
+@stage('optimize')
+def optimize_resume_with_gemini(resume_data, job_data, cache=None):
+    """
+    Tailor a resume to a job listing with Gemini.
+
+    Identical requests are served from the response cache, and concurrent
+    identical requests share a single model call. Falls back to the basic
+    optimizer if the model call fails or returns unusable output.
+
+    Args:
+        resume_data (Resume or dict): Parsed resume from parse_resume
+        job_data (dict): Job data from analyze_job_listing
+        cache (ResponseCache): Response cache, defaults to the shared cache
+
+    Returns:
+        Resume: Optimized resume
+    """
+    resume = as_resume(resume_data)
+    resume_input = {field: to_plain(resume[field]) for field in PROMPT_RESUME_FIELDS}
+    job_input = {field: job_data.get(field) for field in PROMPT_JOB_FIELDS}
+    prompt = OPTIMIZE_PROMPT.format(
+        job_json=json.dumps(job_input, indent=2),
+        resume_json=json.dumps(resume_input, indent=2)
+    )
+
+    try:
+        response = cached_generate({'task': 'optimize', 'resume': resume_input, 'job': job_input},
+                                   prompt, cache, validate=parse_model_object)
+        rewritten = parse_model_object(response)
+    except Exception as e:
+        print(f"Gemini optimization failed ({str(e)}), using basic optimizer")
+        return optimize_resume(resume, job_data)
+
+    # Keep fields the model did not return (e.g. raw_text) from the original
+    optimized = resume.with_updates({field: rewritten[field] for field in PROMPT_RESUME_FIELDS if field in rewritten})
+    return optimized.replace(optimization_note=f"Optimized with {config.GEMINI_MODEL}")
@@ -0,0 +1,227 @@
+"""
+Parse Cache Module - Content-addressed cache in front of parse_resume.
+
+Parsed resumes are keyed by a SHA-256 of the uploaded bytes plus the parser
+version, so re-uploads of the same file skip parsing entirely. Entries live in
+an in-process LRU tier backed by an on-disk SQLite tier with size- and
+age-based eviction.
+"""
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import config
+from modules import progress
+from modules.resume_model import as_resume, to_plain
+from modules.resume_parser import PARSER_VERSION, parse_resume
+from modules.section_classifier import DEFAULT_CLASSIFIER, SectionClassifier
+
+
+class ParseCache:
+    """
+    Two-tier cache of parse_resume results.
+
+    Cached values are immutable Resume records, so they are shared between
+    callers as-is; the disk tier stores them as JSON.
+
+    Args:
+        db_path (str): SQLite file for the disk tier, or None for memory only
+        memory_entries (int): Maximum entries in the in-process LRU tier
+        max_bytes (int): Maximum total size of serialized entries on disk
+        max_age (float): Maximum age of disk entries in seconds
+        classifier (SectionClassifier): Heading classifier passed to parse_resume
+    """
+
+    def __init__(self, db_path=None, memory_entries=256, max_bytes=64 * 1024 * 1024,
+                 max_age=7 * 24 * 3600, classifier=None):
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.classifier = classifier or DEFAULT_CLASSIFIER
+        # Headings change the parse output, so they are part of the version
+        self.version = f"{PARSER_VERSION}-{self.classifier.fingerprint}"
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'memory_evictions': 0,
+            'disk_evictions': 0,
+        }
+
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS parse_cache ('
+                ' key TEXT PRIMARY KEY,'
+                ' value TEXT NOT NULL,'
+                ' size INTEGER NOT NULL,'
+                ' created REAL NOT NULL,'
+                ' accessed REAL NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS parse_cache_accessed ON parse_cache (accessed)')
+            self._db.commit()
+
+    def key_for(self, data):
+        """
+        Compute the cache key for raw resume bytes.
+
+        Args:
+            data (bytes): Uploaded file contents
+
+        Returns:
+            str: Hex SHA-256 of the bytes, suffixed with the parser version
+        """
+        return f"{hashlib.sha256(data).hexdigest()}:{self.version}"
+
+    def get(self, key):
+        """
+        Look up a parsed resume by key.
+
+        Args:
+            key (str): Key from key_for()
+
+        Returns:
+            Resume or None: Parsed resume, or None on a miss
+        """
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self._counters['memory_hits'] += 1
+                return value
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT value, created FROM parse_cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row and time.time() - row[1] <= self.max_age:
+                    self._db.execute('UPDATE parse_cache SET accessed = ? WHERE key = ?',
+                                     (time.time(), key))
+                    self._db.commit()
+                    value = as_resume(json.loads(row[0]))
+                    self._remember(key, value)
+                    self._counters['disk_hits'] += 1
+                    return value
+
+            self._counters['misses'] += 1
+            return None
+
+    def put(self, key, value):
+        """
+        Store a parsed resume in both tiers.
+
+        Args:
+            key (str): Key from key_for()
+            value (Resume or dict): Parsed resume data
+        """
+        value = as_resume(value)
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                serialized = json.dumps(to_plain(value))
+                now = time.time()
+                self._db.execute(
+                    'INSERT OR REPLACE INTO parse_cache (key, value, size, created, accessed)'
+                    ' VALUES (?, ?, ?, ?, ?)',
+                    (key, serialized, len(serialized), now, now)
+                )
+                self._evict_disk(now)
+                self._db.commit()
+
+    def parse(self, source):
+        """
+        Parse a resume, reusing a cached result for identical bytes.
+
+        Args:
+            source: Path to a DOCX file, its bytes, or a binary file object
+
+        Returns:
+            tuple: (key, parsed Resume)
+        """
+        if isinstance(source, (bytes, bytearray)):
+            data = bytes(source)
+        elif hasattr(source, 'read'):
+            data = source.read()
+        else:
+            with open(source, 'rb') as f:
+                data = f.read()
+
+        key = self.key_for(data)
+        resume_data = self.get(key)
+        if resume_data is None:
+            resume_data = as_resume(parse_resume(io.BytesIO(data), self.classifier))
+            self.put(key, resume_data)
+        else:
+            progress.emit('parse', 'cached')
+        return key, resume_data
+
+    def stats(self):
+        """
+        Report cache counters and current size.
+
+        Returns:
+            dict: Hit, miss and eviction counters plus tier sizes
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_entries'] = len(self._memory)
+            if self._db is not None:
+                count, size = self._db.execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache'
+                ).fetchone()
+                stats['disk_entries'] = count
+                stats['disk_bytes'] = size
+        return stats
+
+    def _remember(self, key, value):
+        """Insert into the LRU tier, evicting the least recently used entries."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self._counters['memory_evictions'] += 1
+
+    def _evict_disk(self, now):
+        """Drop expired disk entries, then the least recently used ones over budget."""
+        expired = self._db.execute('DELETE FROM parse_cache WHERE created < ?',
+                                   (now - self.max_age,)).rowcount
+        self._counters['disk_evictions'] += expired
+
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM parse_cache').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+                'SELECT key, size FROM parse_cache ORDER BY accessed').fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute('DELETE FROM parse_cache WHERE key = ?', (key,))
+            total -= size
+            self._counters['disk_evictions'] += 1
+
+
+def new_parse_cache(db_path=None, **kwargs):
+    """
+    Create a parse cache that classifies headings with config.SECTION_SYNONYMS.
+
+    The web app, bulk runs and the resume index all build their caches here,
+    so a resume is split into sections the same way everywhere.
+
+    Args:
+        db_path (str): SQLite file for the disk tier, or None for memory only
+        **kwargs: Other ParseCache settings
+
+    Returns:
+        ParseCache: The new cache
+    """
+    return ParseCache(db_path=db_path, classifier=SectionClassifier(config.SECTION_SYNONYMS), **kwargs)
@@ -0,0 +1,112 @@
+"""
+Pipeline Module - Runs the full resume optimization pipeline for one job listing.
+"""
+import io
+import os
+
+import config
+from modules.resume_parser import parse_resume
+from modules.job_analyzer import analyze_job_listing
+from modules.optimizer import optimize_resume, optimize_resume_with_gemini
+from modules.section_optimizer import optimize_resume_concurrent
+from modules.docx_generator import generate_docx
+
+# Optimizers selectable with config.OPTIMIZER_BACKEND
+OPTIMIZERS = {
+    'basic': optimize_resume,
+    'gemini': optimize_resume_with_gemini,
+    'gemini-sections': optimize_resume_concurrent,
+}
+
+def run_optimization(resume_path, job_listing, original_filename, output_folder=None, parse_cache=None,
+                     optimizer=None, template=None):
+    """
+    Parse, analyze, optimize and render a resume for a job listing.
+
+    Args:
+        resume_path (str): Path to the uploaded resume DOCX
+        job_listing (str): Job listing text
+        original_filename (str): Uploaded filename, used to name the output
+        output_folder (str): Directory for the generated DOCX; if None the
+            document is rendered in memory
+        parse_cache (ParseCache): Optional cache to parse through
+        optimizer (str): Name of the optimizer in OPTIMIZERS, defaults to
+            config.OPTIMIZER_BACKEND
+        template (str): Name of the DOCX template, defaults to
+            config.DEFAULT_TEMPLATE
+
+    Returns:
+        dict: Download filename of the optimized resume, plus either its
+            output path or its bytes under 'content'
+    """
+    # Parse the resume (skipped when the same file was parsed before)
+    print("Parsing resume...")
+    if parse_cache is not None:
+        _, resume_data = parse_cache.parse(resume_path)
+    else:
+        resume_data = parse_resume(resume_path)
+    print("Resume parsed successfully")
+
+    return optimize_parsed_resume(resume_data, job_listing, original_filename, output_folder,
+                                  optimizer=optimizer, template=template)
+
+def optimize_parsed_resume(resume_data, job_listing, original_filename, output_folder=None, optimizer=None,
+                           template=None, job_data=None):
+    """
+    Analyze, optimize and render an already parsed resume for a job listing.
+
+    Args:
+        resume_data (dict): Parsed resume from parse_resume
+        job_listing (str): Job listing text
+        original_filename (str): Uploaded filename, used to name the output
+        output_folder (str): Directory for the generated DOCX; if None the
+            document is rendered in memory
+        optimizer (str): Name of the optimizer in OPTIMIZERS, defaults to
+            config.OPTIMIZER_BACKEND
+        template (str): Name of the DOCX template, defaults to
+            config.DEFAULT_TEMPLATE
+        job_data (dict): The listing already analyzed with
+            analyze_job_listing, if available
+
+    Returns:
+        dict: Download filename of the optimized resume, plus either its
+            output path or its bytes under 'content'
+    """
+    # Analyze the job listing
+    if job_data is None:
+        print("Analyzing job listing...")
+        job_data = analyze_job_listing(job_listing)
+        print("Job listing analyzed")
+
+    # Optimize the resume
+    print("Optimizing resume...")
+    optimize = OPTIMIZERS[optimizer or config.OPTIMIZER_BACKEND]
+    optimized_resume = optimize(resume_data, job_data)
+    print("Resume optimized")
+
+    # Generate the optimized DOCX file
+    print("Generating DOCX...")
+    filename_base = os.path.splitext(original_filename)[0]
+    output_filename = f"{filename_base}_optimized.docx"
+
+    if output_folder is None:
+        buffer = io.BytesIO()
+        generate_docx(optimized_resume, buffer, template=template)
+        print(f"DOCX generated in memory ({buffer.tell()} bytes)")
+        return {
+            'content': buffer.getvalue(),
+            'output_filename': output_filename
+        }
+
+    output_path = os.path.join(output_folder, output_filename)
+
+    # Ensure output directory exists
+    os.makedirs(output_folder, exist_ok=True)
+
+    generate_docx(optimized_resume, output_path, template=template)
+    print(f"DOCX generated at: {output_path}")
+
+    return {
+        'output_path': output_path,
+        'output_filename': output_filename
+    }
@@ -0,0 +1,144 @@
+"""
+Progress Module - Stage events emitted by the pipeline while a job runs.
+
+Pipeline modules wrap their work in ``stage()``; the events go to whichever
+reporter is active in the current context (set by the job runner), and are
+dropped at near-zero cost when nothing is listening.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from modules import metrics
+
+_current_reporter = contextvars.ContextVar('progress_reporter', default=None)
+
+
+class ProgressReporter:
+    """
+    Collects stage events for one job and lets readers wait for new ones.
+
+    Events are dicts with a sequence number, stage name, status
+    ('started', 'done', 'failed' or 'cached'), seconds elapsed since the
+    reporter was created and, for finished stages, the stage duration.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.closed = False
+        self._events = []
+        self._condition = threading.Condition()
+
+    def emit(self, stage, status, **details):
+        """
+        Record a stage event and wake up waiting readers.
+
+        Args:
+            stage (str): Stage name, e.g. 'parse'
+            status (str): Stage status
+            **details: Extra fields such as duration
+
+        Returns:
+            dict: The recorded event
+        """
+        with self._condition:
+            event = {
+                'seq': len(self._events) + 1,
+                'stage': stage,
+                'status': status,
+                'elapsed': round(time.perf_counter() - self.started, 3),
+            }
+            event.update(details)
+            self._events.append(event)
+            self._condition.notify_all()
+        return event
+
+    def close(self):
+        """Mark the job as finished; readers stop once they have every event."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def events_after(self, seq, timeout=None):
+        """
+        Get events newer than a sequence number, waiting for one if needed.
+
+        Args:
+            seq (int): Last sequence number the reader has seen
+            timeout (float): Seconds to wait for a new event, or None to wait
+                until one arrives or the reporter is closed
+
+        Returns:
+            tuple: (list of new events, whether the reporter is closed)
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: len(self._events) > seq or self.closed, timeout)
+            return self._events[seq:], self.closed
+
+    def timings(self):
+        """
+        Durations of the finished stages.
+
+        Returns:
+            dict: Stage name to duration in seconds
+        """
+        with self._condition:
+            return {e['stage']: e['duration'] for e in self._events if 'duration' in e}
+
+
+@contextmanager
+def reporting(reporter):
+    """
+    Route stage events in this context to a reporter.
+
+    Args:
+        reporter (ProgressReporter): Reporter that receives the events
+    """
+    token = _current_reporter.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _current_reporter.reset(token)
+
+
+def emit(stage, status, **details):
+    """
+    Emit a stage event to the active reporter, if any.
+
+    Args:
+        stage (str): Stage name
+        status (str): Stage status
+        **details: Extra event fields
+    """
+    reporter = _current_reporter.get()
+    if reporter is not None:
+        reporter.emit(stage, status, **details)
+
+
+@contextmanager
+def stage(name):
+    """
+    Emit 'started' and then 'done' or 'failed' events around a block.
+
+    The stage is also recorded in the latency metrics, whether or not a
+    reporter is listening.
+
+    Args:
+        name (str): Stage name
+    """
+    reporter = _current_reporter.get()
+    if reporter is None:
+        with metrics.timed(name):
+            yield
+        return
+
+    reporter.emit(name, 'started')
+    start = time.perf_counter()
+    try:
+        with metrics.timed(name):
+            yield
+    except Exception:
+        reporter.emit(name, 'failed', duration=round(time.perf_counter() - start, 3))
+        raise
+    reporter.emit(name, 'done', duration=round(time.perf_counter() - start, 3))
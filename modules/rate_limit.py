@@ -0,0 +1,89 @@
+"""
+Rate Limit Module - Token-bucket limiter for model requests and tokens.
+
+The limiter hands out reservations rather than blocking, so it can be shared
+by threads and by any number of asyncio event loops: callers sleep for the
+returned delay in whatever way suits them.
+"""
+import threading
+import time
+
+import config
+
+
+class _Bucket:
+    """A token bucket whose level may go negative to queue reservations."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # Requests larger than the bucket would never fit; charge a full bucket
+        self.level -= min(amount, self.capacity)
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+
+class RateLimiter:
+    """
+    Limits requests per minute and tokens per minute.
+
+    Args:
+        requests_per_minute (int): Request budget per minute
+        tokens_per_minute (int): Token budget (prompt plus output) per minute
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self._requests = _Bucket(requests_per_minute)
+        self._tokens = _Bucket(tokens_per_minute)
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens):
+        """
+        Reserve capacity for one request.
+
+        Args:
+            tokens (int): Estimated tokens the request will use
+
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            return max(self._requests.reserve(1, now), self._tokens.reserve(tokens, now))
+
+    def acquire(self, tokens):
+        """Reserve capacity and block the calling thread until it is available."""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+
+def estimate_tokens(text):
+    """Rough token count for budgeting (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+_default_limiter = None
+_default_lock = threading.Lock()
+
+
+def get_default_limiter():
+    """
+    Return the process-wide limiter for Gemini calls, creating it on first use.
+
+    Returns:
+        RateLimiter: Limiter using config.GEMINI_REQUESTS_PER_MINUTE and
+            config.GEMINI_TOKENS_PER_MINUTE
+    """
+    global _default_limiter
+    if _default_limiter is None:
+        with _default_lock:
+            if _default_limiter is None:
+                _default_limiter = RateLimiter(config.GEMINI_REQUESTS_PER_MINUTE,
+                                               config.GEMINI_TOKENS_PER_MINUTE)
+    return _default_limiter
@@ -0,0 +1,193 @@
+"""
+Relevance Module - TF-IDF scoring of resume bullets against job listings.
+
+Experience bullets, the resume as a whole and any number of analyzed job
+listings are turned into sparse term vectors over one shared vocabulary.
+Sublinear term frequencies are weighted by smoothed IDF and rows are L2
+normalized, so a single sparse matrix product gives the cosine similarity of
+every bullet (and the whole resume) with every job. Scoring one resume
+against hundreds of listings is one call.
+
+A job listing is represented by the skills analyze_job_listing found in it,
+each weighted by how often the listing mentions it.
+"""
+import re
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from modules.resume_model import as_resume
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or our that the their this
+to was were will with within across per via using used over under up we us you your
+""".split())
+
+
+def tokenize(text):
+    """
+    Split text into lowercase terms, keeping tokens like c++, c# and node.js.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: Terms, without stop words
+    """
+    return [term for term in _TOKEN.findall(text.lower()) if term not in STOP_WORDS]
+
+
+def entry_bullets(description):
+    """Bullet lines of an experience description (a list or newline-separated string)."""
+    lines = description if isinstance(description, (list, tuple)) else (description or '').split('\n')
+    return [line.strip() for line in lines if line.strip()]
+
+
+def job_terms(job_data):
+    """
+    Term counts of a job listing from its analyzed skills.
+
+    Args:
+        job_data (dict): Job data from analyze_job_listing
+
+    Returns:
+        Counter: Term to weight
+    """
+    frequencies = job_data.get('skill_frequencies') or {}
+    skills = job_data.get('keywords') or (
+        list(job_data.get('required_skills') or []) + list(job_data.get('preferred_skills') or []))
+    terms = Counter()
+    for skill in skills:
+        weight = max(frequencies.get(skill, 1), 1)
+        for term in tokenize(skill):
+            terms[term] += weight
+    return terms
+
+
+def _weighted_matrix(documents, vocabulary):
+    """TF-IDF rows, L2 normalized, for term-count documents over a vocabulary."""
+    indptr = [0]
+    indices = []
+    counts = []
+    for terms in documents:
+        for term, count in terms.items():
+            indices.append(vocabulary[term])
+            counts.append(count)
+        indptr.append(len(indices))
+
+    shape = (len(documents), len(vocabulary))
+    matrix = sparse.csr_matrix((np.asarray(counts, dtype=np.float64), indices, indptr), shape=shape)
+    if not matrix.nnz:
+        return matrix
+
+    # Smoothed IDF over all documents, with sublinear term frequency
+    document_frequency = np.bincount(matrix.indices, minlength=shape[1])
+    idf = np.log((1 + shape[0]) / (1 + document_frequency)) + 1
+    matrix.data = (1 + np.log(matrix.data)) * idf[matrix.indices]
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ matrix
+
+
+def score_resume(resume_data, jobs):
+    """
+    Score a resume and each of its experience bullets against job listings.
+
+    Args:
+        resume_data (Resume or dict): Parsed resume
+        jobs (list): Job data dicts from analyze_job_listing
+
+    Returns:
+        dict: 'match_scores' (array of one 0-1 score per job),
+            'bullet_scores' (array of bullets x jobs) and 'bullets'
+            ((experience index, bullet index) for each row of bullet_scores)
+    """
+    resume = as_resume(resume_data)
+
+    bullets = []
+    documents = []
+    for entry_index, entry in enumerate(resume.experience):
+        for bullet_index, line in enumerate(entry_bullets(entry.get('description', ()))):
+            bullets.append((entry_index, bullet_index))
+            documents.append(Counter(tokenize(line)))
+
+    # The whole resume: bullets plus summary and skills
+    skills = resume.skills if isinstance(resume.skills, (list, tuple)) else [resume.skills]
+    whole = Counter(tokenize(resume.summary or ''))
+    for skill in skills:
+        whole.update(tokenize(skill))
+    for terms in documents:
+        whole.update(terms)
+    documents.append(whole)
+    documents.extend(job_terms(job) for job in jobs)
+
+    vocabulary = {}
+    for terms in documents:
+        for term in terms:
+            vocabulary.setdefault(term, len(vocabulary))
+
+    matrix = _weighted_matrix(documents, vocabulary)
+    split = len(bullets) + 1
+    scores = (matrix[:split] @ matrix[split:].T).toarray()
+    return {
+        'match_scores': scores[-1],
+        'bullet_scores': scores[:-1],
+        'bullets': bullets,
+    }
+
+
+def rank_jobs(resume_data, jobs, top_n=None):
+    """
+    Rank job listings by how well a resume matches them.
+
+    Args:
+        resume_data (Resume or dict): Parsed resume
+        jobs (list): Job data dicts from analyze_job_listing
+        top_n (int): Return only the best matches
+
+    Returns:
+        list: (job index, match score) tuples, best first
+    """
+    if not jobs:
+        return []
+    match_scores = score_resume(resume_data, jobs)['match_scores']
+    order = np.argsort(-match_scores, kind='stable')[:top_n]
+    return [(int(index), float(match_scores[index])) for index in order]
+
+
+def reorder_bullets(resume_data, job_data):
+    """
+    Put each experience entry's most job-relevant bullets first.
+
+    Bullets with equal scores (including ones unrelated to the job) keep
+    their original order.
+
+    Args:
+        resume_data (Resume or dict): Parsed resume
+        job_data (dict): Job data from analyze_job_listing
+
+    Returns:
+        tuple: (Resume with reordered bullets, overall match score)
+    """
+    resume = as_resume(resume_data)
+    scored = score_resume(resume, [job_data])
+    scores = {}
+    for (entry_index, bullet_index), score in zip(scored['bullets'], scored['bullet_scores'][:, 0]):
+        scores.setdefault(entry_index, []).append(score)
+
+    experience = list(resume.experience)
+    for entry_index, bullet_scores in scores.items():
+        entry = experience[entry_index]
+        order = np.argsort(-np.asarray(bullet_scores), kind='stable')
+        if (order != np.arange(len(order))).any():
+            lines = entry_bullets(entry.description)
+            experience[entry_index] = entry.replace(description=[lines[index] for index in order])
+
+    match_score = float(scored['match_scores'][0])
+    if any(new is not old for new, old in zip(experience, resume.experience)):
+        return resume.replace(experience=experience), match_score
+    return resume, match_score
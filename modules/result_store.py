@@ -0,0 +1,221 @@
+"""
+Result Store Module - Keeps generated resumes in memory, spilling to disk when full.
+
+Results are keyed by a per-job ID rather than by filename, so concurrent users
+never overwrite each other's output. Recently used results stay in memory up
+to a byte budget; older ones are written to a spill directory, and everything
+expires after a TTL.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from modules.metrics import timed
+
+
+class StoredResult:
+    """A generated file held in memory or spilled to disk."""
+
+    __slots__ = ('key', 'filename', 'etag', 'size', 'created', 'data', 'path')
+
+    def __init__(self, key, filename, data):
+        self.key = key
+        self.filename = filename
+        self.etag = hashlib.sha256(data).hexdigest()
+        self.size = len(data)
+        self.created = time.time()
+        self.data = data
+        self.path = None
+
+    def open(self):
+        """
+        Open the result for reading.
+
+        Returns:
+            file: Binary file object positioned at the start
+        """
+        data = self.data
+        if data is not None:
+            return io.BytesIO(data)
+        return open(self.path, 'rb')
+
+
+class ResultStore:
+    """
+    Bounded store for generated files with spill-to-disk and TTL expiry.
+
+    Expired results are never returned by get(); they are removed by sweep(),
+    which the owner runs periodically (the app's background Sweeper) rather
+    than on every put.
+
+    Args:
+        max_memory_bytes (int): Bytes of results kept in memory
+        spill_dir (str): Directory for results pushed out of memory; if None
+            they are dropped instead
+        ttl (float): Seconds a result is kept
+    """
+
+    def __init__(self, max_memory_bytes=64 * 1024 * 1024, spill_dir=None, ttl=3600):
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_dir = spill_dir
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._memory_bytes = 0
+        self._spilling = set()
+        self._lock = threading.Lock()
+        self._counters = {'puts': 0, 'memory_hits': 0, 'disk_hits': 0, 'misses': 0,
+                          'spills': 0, 'drops': 0, 'expired': 0}
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def put(self, key, data, filename):
+        """
+        Store a generated file.
+
+        Args:
+            key (str): Result ID, unique per job
+            data (bytes): File contents
+            filename (str): Name to offer when the file is downloaded
+
+        Returns:
+            StoredResult: The stored entry
+        """
+        entry = StoredResult(key, filename, data)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._forget(old)
+            self._entries[key] = entry
+            self._memory_bytes += entry.size
+            self._counters['puts'] += 1
+            victims = self._over_budget()
+        self._spill(victims)
+        return entry
+
+    def get(self, key):
+        """
+        Look up a result that has not expired.
+
+        Args:
+            key (str): Result ID
+
+        Returns:
+            StoredResult or None: The entry, or None if unknown or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key) if key else None
+            if entry is None or entry.created < time.time() - self.ttl:
+                self._counters['misses'] += 1
+                return None
+            if entry.data is not None:
+                self._entries.move_to_end(key)
+                self._counters['memory_hits'] += 1
+            else:
+                self._counters['disk_hits'] += 1
+            return entry
+
+    def delete(self, key):
+        """Remove a result from memory and disk."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._forget(entry)
+
+    def sweep(self):
+        """
+        Remove expired results, including spill files left by earlier processes.
+
+        Returns:
+            int: Number of results removed
+        """
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [entry for entry in self._entries.values() if entry.created < cutoff]
+            for entry in expired:
+                del self._entries[entry.key]
+                self._forget(entry)
+            self._counters['expired'] += len(expired)
+
+        if self.spill_dir:
+            for name in os.listdir(self.spill_dir):
+                path = os.path.join(self.spill_dir, name)
+                try:
+                    if name.endswith('.part') or os.path.getmtime(path) >= cutoff:
+                        continue
+                    if name[:-len('.bin')] not in self._entries:
+                        os.remove(path)
+                except OSError:
+                    pass
+        return len(expired)
+
+    def stats(self):
+        """
+        Report store counters.
+
+        Returns:
+            dict: Hit, miss, spill and expiry counts plus current sizes
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['memory_bytes'] = self._memory_bytes
+        return stats
+
+    def _forget(self, entry):
+        # Caller holds the lock
+        if entry.data is not None:
+            self._memory_bytes -= entry.size
+            entry.data = None
+        if entry.path:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _over_budget(self):
+        # Caller holds the lock; picks least recently used in-memory entries
+        victims = []
+        excess = self._memory_bytes - self.max_memory_bytes
+        for entry in self._entries.values():
+            if excess <= 0:
+                break
+            if entry.data is not None:
+                excess -= entry.size
+                if entry.key not in self._spilling:
+                    victims.append(entry)
+        if not self.spill_dir:
+            for entry in victims:
+                del self._entries[entry.key]
+                self._memory_bytes -= entry.size
+                self._counters['drops'] += 1
+            return []
+        self._spilling.update(entry.key for entry in victims)
+        return victims
+
+    def _spill(self, victims):
+        # Files are written outside the lock; readers keep using the bytes until
+        # the entry is switched over to its file
+        for entry in victims:
+            data = entry.data
+            path = os.path.join(self.spill_dir, f"{entry.key}.bin")
+            if data is not None:
+                with timed('result_spill'):
+                    with open(path + '.part', 'wb') as f:
+                        f.write(data)
+                    os.replace(path + '.part', path)
+            with self._lock:
+                self._spilling.discard(entry.key)
+                if data is not None and self._entries.get(entry.key) is entry and entry.data is not None:
+                    entry.path = path
+                    entry.data = None
+                    self._memory_bytes -= entry.size
+                    self._counters['spills'] += 1
+                    continue
+            # Replaced or deleted while spilling
+            try:
+                os.remove(path)
+            except OSError:
+                pass
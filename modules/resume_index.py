@@ -0,0 +1,366 @@
+"""
+Resume Index Module - Inverted index for finding the best resumes for a job.
+
+Each resume is indexed under its word terms (relevance.tokenize) and under
+the taxonomy skills the skill matcher finds in it. Queries go through
+analyze_job_listing, so a job listing is read the same way as everywhere
+else, and resumes are ranked with BM25.
+
+The index has two parts: a base segment saved on disk and memory-mapped, and
+an in-memory delta of resumes added since the last save. Removing a resume
+only marks it deleted; save() merges the delta, drops deleted resumes and
+rewrites the file, so a large index loads without reading its postings.
+
+File format: an 8-byte magic, the length of a JSON header (little-endian
+uint64), the header (terms, resume IDs and array locations), then 8-byte
+aligned arrays: postings offsets per term, posting slots, term frequencies
+and resume lengths.
+"""
+import json
+import os
+import struct
+import threading
+from array import array
+from collections import Counter
+
+import numpy as np
+
+from modules.job_analyzer import analyze_job_listing
+from modules.relevance import tokenize
+from modules.resume_layout import layout_resume
+from modules.resume_model import as_resume
+from modules.skill_matcher import get_default_matcher
+
+MAGIC = b'RIDX0001'
+
+# Prefix of skill terms; tokenize never produces a ':' so they can't collide with words
+SKILL_PREFIX = 'skill:'
+
+MAX_TF = np.iinfo(np.uint16).max
+
+_ARRAYS = (('offsets', np.int64), ('slots', np.uint32), ('tfs', np.uint16), ('lengths', np.uint32))
+
+
+def resume_terms(resume_data, matcher=None):
+    """
+    Terms a resume is indexed under.
+
+    Args:
+        resume_data (Resume or dict): Parsed resume from parse_resume
+        matcher (SkillMatcher): Skill matcher, defaults to the shared one
+
+    Returns:
+        Counter: Term to frequency
+    """
+    matcher = matcher or get_default_matcher()
+    resume = as_resume(resume_data)
+    text = resume.raw_text or '\n'.join(text for _, _, text in layout_resume(resume))
+    terms = Counter(tokenize(text))
+    for entry in matcher.rank(text):
+        terms[SKILL_PREFIX + entry['skill']] += entry['count']
+    return terms
+
+
+def query_terms(job_text, matcher=None):
+    """
+    Weighted query terms for a job listing, from analyze_job_listing.
+
+    Args:
+        job_text (str): Job listing text
+        matcher (SkillMatcher): Skill matcher, defaults to the shared one
+
+    Returns:
+        Counter: Term to query weight
+    """
+    job_data = analyze_job_listing(job_text, matcher)
+    frequencies = job_data['skill_frequencies']
+    terms = Counter()
+    for skill in job_data['keywords']:
+        if skill in frequencies:
+            terms[SKILL_PREFIX + skill] += frequencies[skill]
+        for term in tokenize(skill):
+            terms[term] += 1
+    return terms
+
+
+class ResumeIndex:
+    """
+    BM25 inverted index over parsed resumes with incremental updates.
+
+    Args:
+        path (str): Index file; loaded if it exists, and the default for save()
+        k1 (float): BM25 term frequency saturation
+        b (float): BM25 length normalization
+        matcher (SkillMatcher): Skill matcher, defaults to the shared one
+    """
+
+    def __init__(self, path=None, k1=1.2, b=0.75, matcher=None):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.matcher = matcher or get_default_matcher()
+        self._lock = threading.Lock()
+        self._reset()
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def _reset(self):
+        # Base segment (memory-mapped from the index file)
+        self._base_terms = 0
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._base_slots = np.zeros(0, dtype=np.uint32)
+        self._base_tfs = np.zeros(0, dtype=np.uint16)
+        self._base_lengths = np.zeros(0, dtype=np.uint32)
+
+        # Shared vocabulary and resume slots; delta postings per term ID
+        self._terms = []
+        self._term_ids = {}
+        self._doc_ids = []
+        self._slot_of = {}
+        self._live = bytearray()
+        self._delta = {}
+        self._delta_lengths = array('I')
+        self._total_length = 0
+
+    def _load(self, path):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a resume index")
+            header_size, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_size).decode('utf-8'))
+
+        arrays = {}
+        for name, dtype in _ARRAYS:
+            offset, count = header['arrays'][name]
+            if count:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+            else:
+                arrays[name] = np.zeros(0, dtype=dtype)
+
+        self._reset()
+        self._terms = header['terms']
+        self._term_ids = {term: index for index, term in enumerate(self._terms)}
+        self._doc_ids = header['doc_ids']
+        self._slot_of = {doc_id: slot for slot, doc_id in enumerate(self._doc_ids)}
+        self._live = bytearray(b'\x01') * len(self._doc_ids)
+        self._base_terms = len(self._terms)
+        self._offsets = arrays['offsets']
+        self._base_slots = arrays['slots']
+        self._base_tfs = arrays['tfs']
+        self._base_lengths = arrays['lengths']
+        self._total_length = int(self._base_lengths.sum(dtype=np.int64))
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._slot_of
+
+    def add(self, doc_id, resume_data):
+        """
+        Index a resume, replacing any earlier version with the same ID.
+
+        Args:
+            doc_id (str): Resume ID, e.g. a file name or parse cache key
+            resume_data (Resume or dict): Parsed resume from parse_resume
+        """
+        terms = resume_terms(resume_data, self.matcher)
+        length = sum(terms.values())
+        with self._lock:
+            self._remove(doc_id)
+            slot = len(self._doc_ids)
+            self._doc_ids.append(doc_id)
+            self._slot_of[doc_id] = slot
+            self._live.append(1)
+            self._delta_lengths.append(length)
+            self._total_length += length
+            for term, tf in terms.items():
+                term_id = self._term_ids.get(term)
+                if term_id is None:
+                    term_id = self._term_ids[term] = len(self._terms)
+                    self._terms.append(term)
+                postings = self._delta.get(term_id)
+                if postings is None:
+                    postings = self._delta[term_id] = (array('I'), array('H'))
+                postings[0].append(slot)
+                postings[1].append(min(tf, MAX_TF))
+
+    def remove(self, doc_id):
+        """
+        Drop a resume from search results; its space is reclaimed by save().
+
+        Args:
+            doc_id (str): Resume ID
+
+        Returns:
+            bool: Whether the resume was indexed
+        """
+        with self._lock:
+            return self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        slot = self._slot_of.pop(doc_id, None)
+        if slot is None:
+            return False
+        self._live[slot] = 0
+        base_count = len(self._base_lengths)
+        length = self._base_lengths[slot] if slot < base_count else self._delta_lengths[slot - base_count]
+        self._total_length -= int(length)
+        return True
+
+    def _lengths(self):
+        if not self._delta_lengths:
+            return self._base_lengths
+        return np.concatenate([self._base_lengths, np.frombuffer(self._delta_lengths, dtype=np.uint32)])
+
+    def _postings(self, term_id):
+        """Posting slots and term frequencies of a term in the base and delta."""
+        slots = [self._base_slots[self._offsets[term_id]:self._offsets[term_id + 1]]] \
+            if term_id < self._base_terms else []
+        tfs = [self._base_tfs[self._offsets[term_id]:self._offsets[term_id + 1]]] \
+            if term_id < self._base_terms else []
+        if term_id in self._delta:
+            delta_slots, delta_tfs = self._delta[term_id]
+            slots.append(np.frombuffer(delta_slots, dtype=np.uint32))
+            tfs.append(np.frombuffer(delta_tfs, dtype=np.uint16))
+        if not slots:
+            return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint16)
+        return np.concatenate(slots), np.concatenate(tfs)
+
+    def top_k(self, job_text, k=10):
+        """
+        Find the resumes that best match a job listing.
+
+        Args:
+            job_text (str): Job listing text
+            k (int): Number of resumes to return
+
+        Returns:
+            list: (resume ID, BM25 score) tuples, best first; resumes that
+                share no terms with the listing are left out
+        """
+        query = query_terms(job_text, self.matcher)
+        with self._lock:
+            count = len(self._slot_of)
+            if not count or k <= 0:
+                return []
+            live = np.frombuffer(bytes(self._live), dtype=np.bool_)
+            lengths = self._lengths().astype(np.float64)
+            norms = self.k1 * (1 - self.b + self.b * lengths / (self._total_length / count))
+
+            scores = np.zeros(len(self._doc_ids))
+            for term, weight in query.items():
+                term_id = self._term_ids.get(term)
+                if term_id is None:
+                    continue
+                slots, tfs = self._postings(term_id)
+                alive = live[slots]
+                slots = slots[alive]
+                if not len(slots):
+                    continue
+                tfs = tfs[alive].astype(np.float64)
+                idf = np.log(1 + (count - len(slots) + 0.5) / (len(slots) + 0.5))
+                # A resume appears at most once per term, so fancy-index += is safe
+                scores[slots] += weight * idf * tfs * (self.k1 + 1) / (tfs + norms[slots])
+
+            k = min(k, len(scores))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best], kind='stable')]
+            return [(self._doc_ids[slot], float(scores[slot])) for slot in best if scores[slot] > 0]
+
+    def save(self, path=None):
+        """
+        Merge added resumes into the base segment, drop removed ones and write the file.
+
+        The file is written next to the target and moved into place, so
+        readers never see a partial index.
+
+        Args:
+            path (str): Index file, defaults to the path the index was opened with
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No index path given")
+
+        with self._lock:
+            term_ids = [np.repeat(np.arange(self._base_terms, dtype=np.int64), np.diff(self._offsets))]
+            slots = [np.asarray(self._base_slots)]
+            tfs = [np.asarray(self._base_tfs)]
+            for term_id, (delta_slots, delta_tfs) in self._delta.items():
+                term_ids.append(np.full(len(delta_slots), term_id, dtype=np.int64))
+                slots.append(np.frombuffer(delta_slots, dtype=np.uint32))
+                tfs.append(np.frombuffer(delta_tfs, dtype=np.uint16))
+            term_ids = np.concatenate(term_ids)
+            slots = np.concatenate(slots)
+            tfs = np.concatenate(tfs)
+
+            # Drop postings of removed resumes and renumber slots and terms densely
+            live = np.frombuffer(bytes(self._live), dtype=np.bool_)
+            keep = live[slots]
+            new_slot = np.cumsum(live, dtype=np.int64) - 1
+            slots = new_slot[slots[keep]].astype(np.uint32)
+            tfs = tfs[keep]
+            used_terms, term_ids = np.unique(term_ids[keep], return_inverse=True)
+
+            order = np.lexsort((slots, term_ids))
+            offsets = np.zeros(len(used_terms) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(term_ids, minlength=len(used_terms)), out=offsets[1:])
+            arrays = {
+                'offsets': offsets,
+                'slots': slots[order],
+                'tfs': tfs[order],
+                'lengths': self._lengths()[live].astype(np.uint32),
+            }
+            terms = [self._terms[term_id] for term_id in used_terms]
+            doc_ids = [doc_id for slot, doc_id in enumerate(self._doc_ids) if self._live[slot]]
+
+            self._write(path, terms, doc_ids, arrays)
+            self._load(path)
+            self.path = path
+
+    @staticmethod
+    def _write(path, terms, doc_ids, arrays):
+        def aligned(position):
+            return (position + 7) // 8 * 8
+
+        # Reserve room for the header's own array offsets, then pad it with spaces
+        locations = {name: [0, len(arrays[name])] for name, _ in _ARRAYS}
+        reserved = len(json.dumps({'terms': terms, 'doc_ids': doc_ids, 'arrays': locations})) + 32 * len(_ARRAYS)
+        position = aligned(len(MAGIC) + 8 + reserved)
+        for name, _ in _ARRAYS:
+            locations[name] = [position, len(arrays[name])]
+            position = aligned(position + arrays[name].nbytes)
+        header = json.dumps({'terms': terms, 'doc_ids': doc_ids, 'arrays': locations}).encode('utf-8')
+        header += b' ' * (locations[_ARRAYS[0][0]][0] - len(MAGIC) - 8 - len(header))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC)
+                f.write(struct.pack('<Q', len(header)))
+                f.write(header)
+                for name, dtype in _ARRAYS:
+                    f.write(b'\0' * (locations[name][0] - f.tell()))
+                    f.write(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def stats(self):
+        """
+        Report index size.
+
+        Returns:
+            dict: Resume, term and posting counts, and pending changes since the last save
+        """
+        with self._lock:
+            return {
+                'resumes': len(self._slot_of),
+                'terms': len(self._terms),
+                'base_postings': len(self._base_slots),
+                'delta_postings': sum(len(slots) for slots, _ in self._delta.values()),
+                'deleted': len(self._doc_ids) - len(self._slot_of),
+            }
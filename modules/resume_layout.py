@@ -0,0 +1,123 @@
+"""
+Resume Layout Module - Turns resume data into the ordered paragraphs of the document.
+
+Both DOCX renderers draw from the same layout, so they produce the same
+document for the same resume.
+"""
+
+# Paragraph kinds
+HEADING = 'heading'  # Section header, drawn with a bottom border
+PARAGRAPH = 'paragraph'  # Plain text in a single run
+BULLET = 'bullet'  # Bold bullet character followed by the text
+
+
+def _bullet_lines(value):
+    """Yield the non-empty bullet texts of a list or newline-separated string."""
+    lines = value if isinstance(value, (list, tuple)) else value.split('\n')
+    for line in lines:
+        if line.strip():
+            yield line.strip()
+
+
+def layout_resume(optimized_resume):
+    """
+    Lay out a resume as a sequence of styled paragraphs.
+
+    Args:
+        optimized_resume (Resume or dict): Resume in the parse_resume shape
+
+    Yields:
+        tuple: (kind, style, text) where kind is HEADING, PARAGRAPH or BULLET
+            and style is a paragraph style from docx_templates.STYLE_NAMES
+    """
+    # ----- CONTACT INFORMATION -----
+    contact = optimized_resume.get('contact_info', {})
+    name = contact.get('name', '')
+
+    if name:
+        yield PARAGRAPH, 'Name', name.upper()
+
+    # Contact details
+    contact_parts = [contact[field] for field in ('email', 'phone', 'location') if contact.get(field)]
+    if contact_parts:
+        yield PARAGRAPH, 'Contact', ' | '.join(contact_parts)
+
+    # Links (LinkedIn, website)
+    link_parts = [contact[field] for field in ('linkedin', 'website') if contact.get(field)]
+    if link_parts:
+        yield PARAGRAPH, 'Contact', ' | '.join(link_parts)
+
+    # ----- PROFESSIONAL SUMMARY -----
+    summary = optimized_resume.get('summary', '')
+    if summary:
+        yield HEADING, 'Section', "PROFESSIONAL SUMMARY"
+
+        # Split summary into paragraphs for better readability
+        for para in summary.split('\n'):
+            if para.strip():
+                yield PARAGRAPH, 'Summary', para.strip()
+
+    # ----- SKILLS -----
+    skills = optimized_resume.get('skills', [])
+    if skills:
+        yield HEADING, 'Section', "SKILLS"
+
+        # Format skills as a readable list
+        skill_text = ', '.join(skills) if isinstance(skills, (list, tuple)) else skills
+        yield PARAGRAPH, 'Skill', skill_text
+
+    # ----- PROFESSIONAL EXPERIENCE -----
+    experience = optimized_resume.get('experience', [])
+    if experience:
+        yield HEADING, 'Section', "PROFESSIONAL EXPERIENCE"
+
+        for job in experience:
+            title = job.get('title', '')
+            if title:
+                yield PARAGRAPH, 'JobTitle', title
+
+            # Company and Location
+            company_text = job.get('company', '')
+            location = job.get('location', '')
+            if location:
+                company_text += f" | {location}"
+            if company_text:
+                yield PARAGRAPH, 'Company', company_text
+
+            # Date Range - Right aligned
+            date_range = job.get('date_range', '')
+            if date_range:
+                yield PARAGRAPH, 'Date', date_range
+
+            # Description bullets
+            descriptions = job.get('description', [])
+            if descriptions:
+                for line in _bullet_lines(descriptions):
+                    yield BULLET, 'Bullet', line
+
+    # ----- EDUCATION -----
+    education = optimized_resume.get('education', [])
+    if education:
+        yield HEADING, 'Section', "EDUCATION"
+
+        for edu in education:
+            edu_line = [part for part in (edu.get('degree', ''), edu.get('institution', '')) if part]
+            if edu_line:
+                yield PARAGRAPH, 'JobTitle', ' - '.join(edu_line)
+
+            date_range = edu.get('date_range', '')
+            if date_range:
+                yield PARAGRAPH, 'Date', date_range
+
+            details = edu.get('details', [])
+            if details:
+                for line in _bullet_lines(details):
+                    yield BULLET, 'Bullet', line
+
+    # ----- CERTIFICATIONS AND PROJECTS (if present) -----
+    for key, title in (('certifications', "CERTIFICATIONS"), ('projects', "PROJECTS")):
+        value = optimized_resume.get(key, '')
+        if value:
+            yield HEADING, 'Section', title
+            for line in _bullet_lines(value):
+                yield BULLET, 'Bullet', line
@@ -0,0 +1,203 @@
+"""
+Resume Model Module - Compact, immutable resume records with structural sharing.
+
+Parsed resumes are frozen into slotted records whose lists are tuples. Records
+are never modified in place: replace() returns a new record that shares every
+unchanged field with the original, so optimizers can derive a tailored resume
+without copying the rest of it (raw_text in particular).
+
+Records are read-only mappings with the same keys as the parse_resume dicts,
+so code that reads resumes with .get() or [] works unchanged; to_plain()
+converts back to dicts and lists for JSON.
+"""
+from collections.abc import Mapping
+
+
+def freeze(value):
+    """Recursively turn lists into tuples so a value can be shared safely."""
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def to_plain(value):
+    """
+    Convert records and tuples back into plain dicts and lists.
+
+    Args:
+        value: A record, or any JSON-like value containing records
+
+    Returns:
+        A JSON-serializable copy of the value
+    """
+    if isinstance(value, Record):
+        return {field: to_plain(getattr(value, field)) for field in value._fields}
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    return value
+
+
+def _rebuild(cls, values):
+    record = object.__new__(cls)
+    for field, value in zip(cls.__slots__, values):
+        object.__setattr__(record, field, value)
+    return record
+
+
+class Record(Mapping):
+    """
+    Base class for immutable slotted records that read like dicts.
+
+    Subclasses list their fields in __slots__ and the defaults in _defaults.
+    """
+
+    __slots__ = ()
+    _defaults = {}
+
+    @property
+    def _fields(self):
+        return type(self).__slots__
+
+    def __init__(self, **values):
+        for field in self._fields:
+            object.__setattr__(self, field, freeze(values.pop(field, self._defaults.get(field, ''))))
+        if values:
+            raise TypeError(f"{type(self).__name__} has no fields {', '.join(sorted(values))}")
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a record from a dict, ignoring keys that are not fields.
+
+        Args:
+            data (Mapping): Dict in the parse_resume shape, or a record
+
+        Returns:
+            Record: The record (data itself if it already is one)
+        """
+        if isinstance(data, cls):
+            return data
+        return cls(**{field: data[field] for field in cls.__slots__ if field in data})
+
+    def replace(self, **changes):
+        """
+        Return a copy with some fields changed, sharing all other fields.
+
+        Args:
+            **changes: New field values
+
+        Returns:
+            Record: The new record
+        """
+        record = object.__new__(type(self))
+        for field in self._fields:
+            value = freeze(changes.pop(field)) if field in changes else getattr(self, field)
+            object.__setattr__(record, field, value)
+        if changes:
+            raise TypeError(f"{type(self).__name__} has no fields {', '.join(sorted(changes))}")
+        return record
+
+    def to_dict(self):
+        """Convert to plain dicts and lists, e.g. for JSON."""
+        return to_plain(self)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable; use replace()")
+
+    def __reduce__(self):
+        return _rebuild, (type(self), tuple(getattr(self, field) for field in self._fields))
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __repr__(self):
+        fields = ', '.join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+
+class ContactInfo(Record):
+    """Name and contact details."""
+
+    __slots__ = ('name', 'email', 'phone', 'location', 'linkedin', 'website')
+
+
+class ExperienceEntry(Record):
+    """One job in the experience section."""
+
+    __slots__ = ('title', 'company', 'location', 'date_range', 'description')
+    _defaults = {'description': ()}
+
+
+class EducationEntry(Record):
+    """One entry in the education section."""
+
+    __slots__ = ('institution', 'degree', 'date_range', 'details')
+    _defaults = {'details': ()}
+
+
+class Resume(Record):
+    """
+    A parsed or optimized resume.
+
+    Free-text sections are strings; skills, experience and education are
+    tuples. optimization_note describes how an optimized resume was produced.
+    """
+
+    __slots__ = ('contact_info', 'summary', 'skills', 'experience', 'education', 'projects',
+                 'certifications', 'languages', 'interests', 'other', 'raw_text', 'optimization_note')
+    _defaults = {'contact_info': ContactInfo(), 'skills': (), 'experience': (), 'education': ()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a resume from a parse_resume dict (or a model response in that shape).
+
+        Args:
+            data (Mapping): Resume dict, or a Resume
+
+        Returns:
+            Resume: The frozen resume
+        """
+        if isinstance(data, cls):
+            return data
+        values = {field: data[field] for field in cls.__slots__ if field in data}
+        if '_optimization_note' in data:
+            values['optimization_note'] = data['_optimization_note']
+        if isinstance(values.get('contact_info'), Mapping):
+            values['contact_info'] = ContactInfo.from_dict(values['contact_info'])
+        for field, entry_type in (('experience', ExperienceEntry), ('education', EducationEntry)):
+            if isinstance(values.get(field), (list, tuple)):
+                values[field] = tuple(entry_type.from_dict(entry) if isinstance(entry, Mapping) else entry
+                                      for entry in values[field])
+        return cls(**values)
+
+    def with_updates(self, updates):
+        """
+        Merge rewritten top-level fields (e.g. from a model response) into the resume.
+
+        Args:
+            updates (Mapping): Field name to new value, in the parse_resume shape
+
+        Returns:
+            Resume: New resume sharing every field not in updates
+        """
+        changed = Resume.from_dict({field: updates[field] for field in self._fields if field in updates})
+        return self.replace(**{field: getattr(changed, field) for field in self._fields if field in updates})
+
+
+def as_resume(resume_data):
+    """Return resume_data as a Resume, converting a parse_resume dict if needed."""
+    return Resume.from_dict(resume_data)
@@ -2,13 +2,58 @@
 Resume Parser Module - Extracts structured data from resume DOCX files.
 """
 import json
+import logging
 import docx
 import re
 
+from modules.entry_lexer import (BULLET, COMPANY, DATE_RANGE, DEGREE, INSTITUTION, LOCATION,
+                                 tokenize_education, tokenize_experience)
+from modules.ooxml_extractor import extract_text, UnsupportedLayoutError
+from modules.section_classifier import DEFAULT_CLASSIFIER
+from modules.metrics import timed
+from modules.progress import stage
+
+# Bump whenever a change alters parse_resume output so cached parses are invalidated
+PARSER_VERSION = "2"
+
+logger = logging.getLogger(__name__)
+
+# Entry dict keys of the entry lexer's token kinds
+_EXPERIENCE_FIELDS = {COMPANY: 'company', LOCATION: 'location', DATE_RANGE: 'date_range'}
+_EDUCATION_FIELDS = {INSTITUTION: 'institution', DEGREE: 'degree', DATE_RANGE: 'date_range'}
+
 def extract_text_from_docx(docx_path):
     """
     Extract all text content from a DOCX file.
     
+    Uses the streaming OOXML extractor, which reads paragraphs (including
+    headers, footers, text boxes and tables) in document order. Falls back to
+    the python-docx object model only for packages whose main part is not at
+    the standard location; python-docx finds it through the package
+    relationships. Files that are not zip packages or hold malformed XML
+    cannot be read by either, so their error is raised as is.
+    
+    Args:
+        docx_path (str): Path to the DOCX file
+        
+    Returns:
+        str: Full text content of the document
+
+    Raises:
+        OOXMLExtractionError: If the file is not a readable DOCX package
+    """
+    try:
+        return extract_text(docx_path)
+    except UnsupportedLayoutError as e:
+        logger.warning("Streaming extraction failed (%s), falling back to python-docx", e)
+        if hasattr(docx_path, 'seek'):
+            docx_path.seek(0)
+        return extract_text_from_docx_legacy(docx_path)
+
+def extract_text_from_docx_legacy(docx_path):
+    """
+    Extract all text content from a DOCX file using python-docx.
+    
     Args:
         docx_path (str): Path to the DOCX file
         
@@ -31,31 +76,24 @@ def extract_text_from_docx(docx_path):
     
     return '\n'.join(full_text)
 
-def identify_sections(text):
+@timed('sections')
+def identify_sections(text, classifier=None):
     """
     Attempt to identify resume sections based on common headings.
     
     Args:
         text (str): Full resume text
+        classifier (SectionClassifier): Heading classifier to use. Defaults
+            to the shared classifier for the built-in headings.
         
     Returns:
         dict: Dictionary with identified sections
     """
-    # Common section headers in resumes
-    section_patterns = {
-        'contact': r'(?i)(personal\s+information|contact|contact\s+information)',
-        'summary': r'(?i)(summary|professional\s+summary|profile|objective)',
-        'skills': r'(?i)(skills|technical\s+skills|core\s+competencies|expertise)',
-        'experience': r'(?i)(experience|work\s+experience|professional\s+experience|employment)',
-        'education': r'(?i)(education|academic|qualifications)',
-        'projects': r'(?i)(projects|personal\s+projects)',
-        'certifications': r'(?i)(certifications|certificates|accreditations)',
-        'languages': r'(?i)(languages|language\s+proficiency)',
-        'interests': r'(?i)(interests|hobbies)'
-    }
+    classifier = classifier or DEFAULT_CLASSIFIER
     
-    # Split text into lines for processing
-    lines = text.split('\n')
+    # Split text into stripped, non-empty lines for processing
+    lines = [line.strip() for line in text.split('\n')]
+    lines = [line for line in lines if line]
     
     # Initialize sections dictionary
     sections = {
@@ -70,25 +108,17 @@ def identify_sections(text):
         'interests': [],
         'other': []  # For content that doesn't fit into known sections
     }
+    for section in classifier.sections:
+        sections.setdefault(section, [])
     
     # Initialize current section
     current_section = 'other'
     
-    # Process each line
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Check if this line is a section header
-        found_section = False
-        for section, pattern in section_patterns.items():
-            if re.match(pattern, line, re.IGNORECASE) and len(line) < 50:  # Simple length check to avoid false positives
-                current_section = section
-                found_section = True
-                break
-        
-        if not found_section:
+    # Classify every line in one pass; headings switch the current section
+    for line, section in zip(lines, classifier.classify_lines(lines)):
+        if section:
+            current_section = section
+        else:
             sections[current_section].append(line)
     
     return sections
@@ -180,79 +210,35 @@ def extract_skills(skills_section):
 
 def extract_experience(experience_section):
     """
-    Extract work experience with improved structure detection.
+    Extract work experience entries from the experience section.
+
+    Args:
+        experience_section (list): List of text lines from the experience section
+
+    Returns:
+        list: Entries with title, company, location, date_range and description
     """
     experiences = []
     current_job = None
-    current_role = None
-    date_pattern = r'(?:\d{1,2}/\d{1,2}|\d{1,2}/\d{4}|\d{4}|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)'
-    
-    # If we have a large block of text, let's try to split it into sections first
-    if len(experience_section) > 0 and any('\n' in line for line in experience_section):
-        # Flatten and re-split by newlines
-        full_text = '\n'.join(experience_section)
-        experience_section = [line.strip() for line in full_text.split('\n') if line.strip()]
-    
-    i = 0
-    while i < len(experience_section):
-        line = experience_section[i].strip()
-        
-        # Skip empty lines
-        if not line:
-            i += 1
-            continue
-            
-        # Check if this could be a job title (short capitalized text, no punctuation)
-        if len(line) < 50 and line[0].isupper() and not any(x in line for x in ['.', ':', ',', ';']):
-            # Save previous job if we have one
-            if current_job:
-                experiences.append(current_job)
-                
-            # Start a new job object
+
+    for kind, text, start in tokenize_experience(experience_section):
+        if start:
             current_job = {
-                'title': line,
+                'title': text,
                 'company': '',
                 'location': '',
                 'date_range': '',
                 'description': []
             }
-            i += 1
-            
-            # Check if next line might be company name
-            if i < len(experience_section):
-                company_line = experience_section[i].strip()
-                if company_line and len(company_line) < 50:
-                    current_job['company'] = company_line
-                    i += 1
-                    
-                    # Check if next line might be location
-                    if i < len(experience_section):
-                        location_line = experience_section[i].strip()
-                        # Location typically has a state/province code
-                        if location_line and len(location_line) < 50 and re.search(r'[A-Z]{2}', location_line):
-                            current_job['location'] = location_line
-                            i += 1
-                
-                    # Check if next line might be date range
-                    if i < len(experience_section):
-                        date_line = experience_section[i].strip()
-                        if date_line and re.search(date_pattern, date_line):
-                            current_job['date_range'] = date_line
-                            i += 1
-        
-        # If we have a job and this isn't a new job title, it's probably a bullet point
-        elif current_job:
-            # This is a description/bullet point for the current job
-            current_job['description'].append(line)
-            i += 1
+            experiences.append(current_job)
+        elif current_job is None:
+            # Lines before the first job title are dropped
+            continue
+        elif kind == BULLET:
+            current_job['description'].append(text)
         else:
-            # If we can't categorize this line, just move on
-            i += 1
-    
-    # Don't forget to add the last job
-    if current_job:
-        experiences.append(current_job)
-    
+            current_job[_EXPERIENCE_FIELDS[kind]] = text
+
     return experiences
 
 def extract_education(education_section):
@@ -267,71 +253,34 @@ def extract_education(education_section):
     """
     education = []
     current_education = None
-    
-    for line in education_section:
-        # Try to detect new education entry
-        date_pattern = r'(?:\d{1,2}/\d{1,2}|\d{1,2}/\d{4}|\d{4}|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)'
-        is_new_entry = (
-            bool(re.search(rf'{date_pattern}.*{date_pattern}|{date_pattern}.*present|{date_pattern}.*current', line, re.IGNORECASE)) or
-            bool(re.search(r'^[A-Z][^,\.]{0,50}$', line)) or  # Capitalized short line
-            bool(re.search(r'(?:University|College|Institute|School)', line))
-        )
-        
-        if is_new_entry:
-            # Save previous entry if exists
-            if current_education:
-                education.append(current_education)
-            
-            # Initialize new education entry
+
+    for kind, text, start in tokenize_education(education_section):
+        if start:
             current_education = {
                 'institution': '',
                 'degree': '',
                 'date_range': '',
                 'details': []
             }
-            
-            # Try to extract date range
-            date_match = re.search(rf'({date_pattern}.*?{date_pattern}|{date_pattern}.*?present|{date_pattern}.*?current)', line, re.IGNORECASE)
-            if date_match:
-                current_education['date_range'] = date_match.group(0)
-                # Remove date from line for further processing
-                line = re.sub(rf'{re.escape(date_match.group(0))}', '', line).strip()
-            
-            # Check for degree information
-            degree_patterns = [
-                r'(?:Bachelor|Master|PhD|Doctorate|B\.S\.|M\.S\.|B\.A\.|M\.B\.A\.|Ph\.D\.)[^,\.]*',
-                r'(?:BS|MS|BA|MBA|PhD)[^,\.]*'
-            ]
-            
-            for pattern in degree_patterns:
-                degree_match = re.search(pattern, line, re.IGNORECASE)
-                if degree_match:
-                    current_education['degree'] = degree_match.group(0).strip()
-                    # Remove degree from line
-                    line = re.sub(rf'{re.escape(degree_match.group(0))}', '', line).strip()
-                    break
-            
-            # Assume what's left is the institution
-            if line:
-                current_education['institution'] = line
-                
-        elif current_education:
-            # Add line to details of current education
-            if line.strip():
-                current_education['details'].append(line.strip())
-    
-    # Add the last education entry
-    if current_education:
-        education.append(current_education)
-    
+            education.append(current_education)
+        if current_education is None:
+            continue
+        if kind == BULLET:
+            current_education['details'].append(text)
+        else:
+            current_education[_EDUCATION_FIELDS[kind]] = text
+
     return education
 
-def parse_resume(docx_path):
+@stage('parse')
+def parse_resume(docx_path, classifier=None):
     """
     Main function to parse a resume DOCX and extract structured data.
     
     Args:
         docx_path (str): Path to the resume DOCX file
+        classifier (SectionClassifier): Optional heading classifier, e.g. one
+            built with user-configured heading synonyms
         
     Returns:
         dict: Structured resume data in JSON format
@@ -341,7 +290,7 @@ def parse_resume(docx_path):
         resume_text = extract_text_from_docx(docx_path)
         
         # Identify sections
-        sections = identify_sections(resume_text)
+        sections = identify_sections(resume_text, classifier)
         
         # Extract structured information from each section
         contact_info = extract_contact_info(sections['contact'])
@@ -0,0 +1,152 @@
+"""
+Section Classifier Module - Recognizes resume section headings.
+
+All built-in headings are compiled once at import into a single alternation
+with one named group per section, and exact heading text is resolved with a
+dictionary lookup before the regex is tried.
+"""
+import hashlib
+import json
+import re
+
+# Built-in heading phrases per section, in priority order. A line whose start
+# matches a phrase of an earlier section is classified as that section.
+SECTION_HEADINGS = {
+    'contact': ['personal information', 'contact', 'contact information'],
+    'summary': ['summary', 'professional summary', 'profile', 'objective'],
+    'skills': ['skills', 'technical skills', 'core competencies', 'expertise'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment'],
+    'education': ['education', 'academic', 'qualifications'],
+    'projects': ['projects', 'personal projects'],
+    'certifications': ['certifications', 'certificates', 'accreditations'],
+    'languages': ['languages', 'language proficiency'],
+    'interests': ['interests', 'hobbies'],
+}
+
+# Lines this long or longer are never treated as headings
+MAX_HEADING_LENGTH = 50
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_heading(line):
+    """
+    Normalize a line for exact heading lookup.
+
+    Args:
+        line (str): Raw line text
+
+    Returns:
+        str: Lowercased text with collapsed whitespace and trailing colon removed
+    """
+    return _WHITESPACE.sub(' ', line).strip().rstrip(':').strip().lower()
+
+
+def _phrase_pattern(phrase):
+    """Turn a heading phrase into a regex fragment that tolerates any whitespace."""
+    return r'\s+'.join(re.escape(word) for word in phrase.split())
+
+
+class SectionClassifier:
+    """
+    Classifies lines as section headings in a single regex pass.
+
+    Args:
+        synonyms (dict): Optional mapping of section name to extra heading
+            phrases. Synonyms take precedence over built-in headings on an
+            exact match. Section names must be keys of SECTION_HEADINGS,
+            since parse_resume only outputs those sections.
+
+    Raises:
+        ValueError: If a synonym names a section that is not built in
+    """
+
+    def __init__(self, synonyms=None):
+        unknown = sorted(set(synonyms or {}) - set(SECTION_HEADINGS))
+        if unknown:
+            raise ValueError(
+                f"Unknown section(s) in heading synonyms: {', '.join(unknown)}; "
+                f"expected one of {', '.join(SECTION_HEADINGS)}"
+            )
+
+        headings = {section: list(phrases) for section, phrases in SECTION_HEADINGS.items()}
+        for section, phrases in (synonyms or {}).items():
+            headings[section].extend(phrases)
+
+        self.sections = list(headings)
+        # Stable digest of the heading table, for callers that cache parse output
+        self.fingerprint = hashlib.sha256(
+            json.dumps(headings, sort_keys=True).encode('utf-8')
+        ).hexdigest()[:12]
+
+        # Exact lookup; built-ins first so user synonyms override them
+        self._exact = {}
+        for section, phrases in SECTION_HEADINGS.items():
+            for phrase in phrases:
+                self._exact.setdefault(normalize_heading(phrase), section)
+        for section, phrases in (synonyms or {}).items():
+            for phrase in phrases:
+                self._exact[normalize_heading(phrase)] = section
+
+        # Group names must be identifiers, so map them back to section names
+        self._group_names = {}
+        alternatives = []
+        for index, (section, phrases) in enumerate(headings.items()):
+            if not phrases:
+                continue
+            group = f's{index}'
+            self._group_names[group] = section
+            body = '|'.join(_phrase_pattern(phrase) for phrase in phrases)
+            alternatives.append(f'(?P<{group}>{body})')
+        self._pattern = re.compile('|'.join(alternatives), re.IGNORECASE)
+
+    def classify(self, line):
+        """
+        Classify a single stripped line.
+
+        Args:
+            line (str): Line text
+
+        Returns:
+            str or None: Section name if the line is a heading, otherwise None
+        """
+        if not line or len(line) >= MAX_HEADING_LENGTH:
+            return None
+
+        section = self._exact.get(normalize_heading(line))
+        if section:
+            return section
+
+        match = self._pattern.match(line)
+        if match:
+            return self._group_names[match.lastgroup]
+        return None
+
+    def classify_lines(self, lines):
+        """
+        Classify a list of lines in one call.
+
+        Args:
+            lines (list): Stripped line strings
+
+        Returns:
+            list: Section name or None for each line
+        """
+        exact = self._exact
+        match = self._pattern.match
+        group_names = self._group_names
+        results = []
+        for line in lines:
+            section = None
+            if line and len(line) < MAX_HEADING_LENGTH:
+                section = exact.get(normalize_heading(line))
+                if section is None:
+                    m = match(line)
+                    if m:
+                        section = group_names[m.lastgroup]
+            results.append(section)
+        return results
+
+
+# Shared classifier for the built-in headings, compiled once at import
+DEFAULT_CLASSIFIER = SectionClassifier()
@@ -0,0 +1,280 @@
+"""
+Section Optimizer Module - Optimizes resume sections with concurrent Gemini calls.
+
+Instead of one large prompt, the resume is split into independent units (the
+summary, the skills list and each experience entry) that are rewritten
+concurrently under a shared rate limiter, then reassembled into the same
+dict shape parse_resume produces.
+"""
+import asyncio
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from modules import gemini_client
+from modules.llm_cache import get_default_cache, make_key
+from modules.optimizer import PROMPT_JOB_FIELDS, parse_model_json
+from modules.progress import stage
+from modules.rate_limit import estimate_tokens, get_default_limiter
+from modules.resume_model import ExperienceEntry, as_resume, to_plain
+
+UNIT_PROMPT = """You are an expert resume writer tailoring one part of a resume to a job.
+{instructions}
+Keep every fact truthful: do not invent employers, dates, degrees or metrics.
+Return ONLY JSON of the same type and structure as the input.
+
+<job_json>
+{job_json}
+</job_json>
+
+<{kind}_json>
+{unit_json}
+</{kind}_json>
+"""
+
+UNIT_INSTRUCTIONS = {
+    'summary': "Rewrite this professional summary (a string) to emphasize the job's key skills.",
+    'skills': "Reorder this skills list (a JSON array) by relevance to the job and add relevant "
+              "skills the candidate plausibly has.",
+    'experience': "Rewrite the description bullets of this experience entry (a JSON object) to "
+                  "emphasize work relevant to the job. Keep title, company, location and dates.",
+}
+
+# Exception class names from the SDK and transport that are worth retrying
+RETRYABLE_ERRORS = {
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'InternalServerError',
+    'DeadlineExceeded', 'GatewayTimeout', 'BadGateway', 'TimeoutError', 'ConnectionError',
+    'Timeout', 'ReadTimeout',
+}
+
+
+def is_retryable(error):
+    """
+    Check whether a failed model call should be retried.
+
+    Args:
+        error (Exception): The failure
+
+    Returns:
+        bool: True for timeouts, rate limiting and transient server errors
+    """
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__):
+        return True
+    message = str(error)
+    return any(code in message for code in ('429', '500', '502', '503', '504'))
+
+
+def backoff_delay(attempt, base=None, cap=None):
+    """
+    Full-jitter exponential backoff delay.
+
+    Args:
+        attempt (int): Zero-based retry number
+        base (float): Delay scale in seconds, defaults to config.GEMINI_BACKOFF_BASE
+        cap (float): Maximum delay, defaults to config.GEMINI_BACKOFF_MAX
+
+    Returns:
+        float: Seconds to wait before the next attempt
+    """
+    base = config.GEMINI_BACKOFF_BASE if base is None else base
+    cap = config.GEMINI_BACKOFF_MAX if cap is None else cap
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_unit(kind, text):
+    """
+    Parse a model reply for one unit and check it has the unit's shape.
+
+    Used as the cache validator, so a reply of the wrong type is rejected
+    (and retried) instead of being cached and then skipped by reassemble.
+
+    Args:
+        kind (str): 'summary', 'skills' or 'experience'
+        text (str): Model response text
+
+    Returns:
+        str, list or dict: The parsed unit
+
+    Raises:
+        ValueError: If the reply is not JSON or not shaped like the unit
+    """
+    value = parse_model_json(text)
+    if kind == 'summary':
+        valid = isinstance(value, str)
+    elif kind == 'skills':
+        valid = isinstance(value, list) and all(isinstance(skill, str) for skill in value)
+    else:
+        valid = isinstance(value, dict) and isinstance(value.get('description'), list)
+    if not valid:
+        raise ValueError(f"Model response is not a valid {kind} unit")
+    return value
+
+
+def split_units(resume):
+    """
+    Split a parsed resume into independently optimizable units.
+
+    Args:
+        resume (Resume): Parsed resume
+
+    Returns:
+        list: (kind, index, value) tuples with plain JSON values; index is set
+            for experience entries
+    """
+    units = []
+    if resume.summary:
+        units.append(('summary', None, resume.summary))
+    if resume.skills:
+        units.append(('skills', None, to_plain(resume.skills)))
+    for index, entry in enumerate(resume.experience):
+        units.append(('experience', index, to_plain(entry)))
+    return units
+
+
+def reassemble(resume, results):
+    """
+    Merge optimized units back into the resume.
+
+    Args:
+        resume (Resume): Original parsed resume
+        results (list): (kind, index, value) tuples; units that failed keep
+            their original value
+
+    Returns:
+        Resume: Optimized resume sharing every unit that did not change
+    """
+    changes = {}
+    experience = list(resume.experience)
+    for kind, index, value in results:
+        if kind == 'summary' and isinstance(value, str):
+            changes['summary'] = value
+        elif kind == 'skills' and isinstance(value, list):
+            changes['skills'] = value
+        elif kind == 'experience' and isinstance(value, dict):
+            # Structural fields always come from the original entry
+            original = experience[index]
+            if isinstance(original, ExperienceEntry):
+                experience[index] = original.replace(description=value.get('description', original.description))
+                changes['experience'] = experience
+    return resume.replace(**changes)
+
+
+class SectionOptimizer:
+    """
+    Concurrent per-unit optimizer with rate limiting, retries and deadlines.
+
+    Args:
+        cache (ResponseCache): Response cache, defaults to the shared cache
+        limiter (RateLimiter): Rate limiter, defaults to the process-wide one
+        concurrency (int): Maximum model calls in flight per resume
+        max_retries (int): Retries per unit after the first attempt
+        timeout (float): Deadline in seconds for each model call
+    """
+
+    def __init__(self, cache=None, limiter=None, concurrency=None, max_retries=None, timeout=None):
+        self.cache = cache or get_default_cache()
+        self.limiter = limiter or get_default_limiter()
+        self.concurrency = concurrency or config.GEMINI_CONCURRENCY
+        self.max_retries = config.GEMINI_MAX_RETRIES if max_retries is None else max_retries
+        self.timeout = timeout or config.GEMINI_CALL_TIMEOUT
+
+    async def _call(self, executor, kind, key, prompt, expected_output):
+        """
+        One model call through the cache, charged against the rate limiter.
+
+        The deadline is passed to the model request itself, so the worker
+        thread is released when it passes; wait_for only stops this coroutine
+        from waiting on a thread that outlives it.
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        delay = self.limiter.reserve(estimate_tokens(prompt) + estimate_tokens(expected_output))
+        if delay:
+            await asyncio.sleep(delay)
+
+        def compute():
+            text = gemini_client.generate(prompt, timeout=self.timeout)
+            parse_unit(kind, text)  # Unparseable or wrongly shaped responses raise and are not cached
+            return text
+
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(executor, self.cache.get_or_compute, key, compute, self.timeout),
+            self.timeout
+        )
+
+    async def _optimize_unit(self, executor, semaphore, kind, index, value, job_input):
+        unit_json = json.dumps(value, indent=2)
+        prompt = UNIT_PROMPT.format(
+            instructions=UNIT_INSTRUCTIONS[kind],
+            job_json=json.dumps(job_input, indent=2),
+            kind=kind,
+            unit_json=unit_json
+        )
+        key = make_key({'task': 'optimize_unit', 'kind': kind, 'unit': value, 'job': job_input})
+
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return kind, index, parse_unit(kind, await self._call(executor, kind, key, prompt, unit_json))
+                except Exception as e:
+                    if attempt == self.max_retries or not (is_retryable(e) or isinstance(e, ValueError)):
+                        print(f"Optimizing {kind} unit failed ({type(e).__name__}: {e}), keeping original")
+                        return kind, index, value
+                    await asyncio.sleep(backoff_delay(attempt))
+
+    async def optimize_async(self, resume_data, job_data):
+        """
+        Optimize all units of a resume concurrently.
+
+        Model calls run on a private thread pool rather than the loop's
+        default executor, which asyncio.run joins on exit: a call abandoned
+        at its deadline must not hold up the result.
+
+        Args:
+            resume_data (Resume or dict): Parsed resume from parse_resume
+            job_data (dict): Job data from analyze_job_listing
+
+        Returns:
+            Resume: Optimized resume
+        """
+        resume = as_resume(resume_data)
+        job_input = {field: job_data.get(field) for field in PROMPT_JOB_FIELDS}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # One thread per attempt in the worst case, so retries never queue behind abandoned calls
+        executor = ThreadPoolExecutor(max_workers=self.concurrency * (self.max_retries + 1),
+                                      thread_name_prefix='section-optimizer')
+        try:
+            results = await asyncio.gather(*(
+                self._optimize_unit(executor, semaphore, kind, index, value, job_input)
+                for kind, index, value in split_units(resume)
+            ))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        optimized = reassemble(resume, results)
+        return optimized.replace(optimization_note=f"Optimized per section with {config.GEMINI_MODEL}")
+
+    def optimize(self, resume_data, job_data):
+        """Synchronous wrapper around optimize_async for worker threads and CLIs."""
+        return asyncio.run(self.optimize_async(resume_data, job_data))
+
+
+@stage('optimize')
+def optimize_resume_concurrent(resume_data, job_data, cache=None):
+    """
+    Tailor a resume to a job listing with concurrent per-section Gemini calls.
+
+    Args:
+        resume_data (Resume or dict): Parsed resume from parse_resume
+        job_data (dict): Job data from analyze_job_listing
+        cache (ResponseCache): Response cache, defaults to the shared cache
+
+    Returns:
+        Resume: Optimized resume
+    """
+    return SectionOptimizer(cache=cache).optimize(resume_data, job_data)
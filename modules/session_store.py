@@ -0,0 +1,298 @@
+"""
+Session Store Module - Server-side Flask sessions.
+
+Session data (parse cache keys, the job listing text, job IDs, flashed
+messages) is kept in a backend on the server; the cookie only carries a
+signed, random session ID. Request headers stay small however long the
+job listing is, and nothing is lost to the browser's cookie size limit.
+
+Backends: MemoryBackend (one process, for development), SQLiteBackend and
+FileBackend (shared by all worker processes on a host). A session expires
+its TTL after it was last changed; expired sessions are dropped when read
+and by sweep().
+"""
+import hashlib
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+import config
+
+
+class MemoryBackend:
+    """
+    In-process session store.
+
+    Args:
+        ttl (float): Seconds a session is kept after it was last changed
+    """
+
+    def __init__(self, ttl=24 * 3600):
+        self.ttl = ttl
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, sid):
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if entry is None:
+                return None
+            expires, data = entry
+            if expires < time.time():
+                del self._sessions[sid]
+                return None
+            return data
+
+    def set(self, sid, data):
+        with self._lock:
+            self._sessions[sid] = (time.time() + self.ttl, data)
+
+    def delete(self, sid):
+        with self._lock:
+            self._sessions.pop(sid, None)
+
+    def sweep(self):
+        """
+        Remove expired sessions.
+
+        Returns:
+            int: Sessions removed
+        """
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, (expires, _) in self._sessions.items() if expires < now]
+            for sid in expired:
+                del self._sessions[sid]
+        return len(expired)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class SQLiteBackend:
+    """
+    SQLite session store, shared between processes.
+
+    Args:
+        path (str): Database file
+        ttl (float): Seconds a session is kept after it was last changed
+    """
+
+    def __init__(self, path, ttl=24 * 3600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS sessions ('
+            ' sid TEXT PRIMARY KEY,'
+            ' data TEXT NOT NULL,'
+            ' expires REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires)')
+        self._db.commit()
+
+    def get(self, sid):
+        with self._lock:
+            row = self._db.execute('SELECT data, expires FROM sessions WHERE sid = ?', (sid,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                # Unless another process has refreshed it since it was read
+                self._db.execute('DELETE FROM sessions WHERE sid = ? AND expires = ?', (sid, row[1]))
+                self._db.commit()
+                return None
+            return row[0]
+
+    def set(self, sid, data):
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO sessions (sid, data, expires) VALUES (?, ?, ?)',
+                             (sid, data, time.time() + self.ttl))
+            self._db.commit()
+
+    def delete(self, sid):
+        with self._lock:
+            self._db.execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+            self._db.commit()
+
+    def sweep(self):
+        """
+        Remove expired sessions.
+
+        Returns:
+            int: Sessions removed
+        """
+        with self._lock:
+            removed = self._db.execute('DELETE FROM sessions WHERE expires < ?', (time.time(),)).rowcount
+            self._db.commit()
+        return removed
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+
+
+class FileBackend:
+    """
+    One file per session in a directory, shared between processes.
+
+    A session's expiry is its file's modification time plus the TTL. Files
+    are replaced atomically, so readers never see a partial write.
+
+    Args:
+        directory (str): Directory for the session files
+        ttl (float): Seconds a session is kept after it was last changed
+    """
+
+    def __init__(self, directory, ttl=24 * 3600):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, sid):
+        # Session IDs are URL-safe tokens, but never trust them as file names
+        return os.path.join(self.directory, hashlib.sha256(sid.encode('utf-8')).hexdigest())
+
+    def get(self, sid):
+        path = self._path(sid)
+        try:
+            if os.path.getmtime(path) + self.ttl < time.time():
+                os.remove(path)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, sid, data):
+        path = self._path(sid)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def delete(self, sid):
+        try:
+            os.remove(self._path(sid))
+        except FileNotFoundError:
+            pass
+
+    def sweep(self):
+        """
+        Remove expired session files and stale temporary files.
+
+        Returns:
+            int: Files removed
+        """
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def __len__(self):
+        return sum(1 for name in os.listdir(self.directory) if not name.endswith('.tmp'))
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Session data loaded from a backend; tracks changes so unchanged sessions are not written back."""
+
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(session):
+            session.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+
+class ServerSessionInterface(SessionInterface):
+    """
+    Flask session interface storing session data in a backend.
+
+    Args:
+        backend: MemoryBackend, SQLiteBackend, FileBackend or any object with
+            get/set/delete
+    """
+
+    serializer = TaggedJSONSerializer()
+    salt = 'server-session'
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt=self.salt)
+
+    def open_session(self, app, request):
+        if not app.secret_key:
+            return None
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode('utf-8')
+            except BadSignature:
+                sid = None
+            data = self.backend.get(sid) if sid else None
+            if data is not None:
+                try:
+                    return ServerSession(self.serializer.loads(data), sid=sid)
+                except ValueError:
+                    pass
+        # No cookie, a forged or expired ID: start over with a fresh ID
+        return ServerSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and not session.new:
+                self.backend.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path, secure=self.get_cookie_secure(app),
+                                       httponly=self.get_cookie_httponly(app),
+                                       samesite=self.get_cookie_samesite(app))
+            return
+
+        if session.modified:
+            self.backend.set(session.sid, self.serializer.dumps(dict(session)))
+            response.vary.add('Cookie')
+        if session.new or (session.permanent and app.config['SESSION_REFRESH_EACH_REQUEST']):
+            response.set_cookie(
+                name,
+                self._signer(app).sign(session.sid.encode('utf-8')).decode('utf-8'),
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+
+def backend_from_config():
+    """
+    Create the session backend selected in config.
+
+    Returns:
+        MemoryBackend, SQLiteBackend or FileBackend: Per config.SESSION_BACKEND
+    """
+    if config.SESSION_BACKEND == 'sqlite':
+        return SQLiteBackend(config.SESSION_SQLITE_PATH, config.SESSION_TTL)
+    if config.SESSION_BACKEND == 'filesystem':
+        return FileBackend(config.SESSION_FOLDER, config.SESSION_TTL)
+    return MemoryBackend(config.SESSION_TTL)
@@ -0,0 +1,198 @@
+"""
+Skill Matcher Module - Finds taxonomy skills in text with an Aho-Corasick automaton.
+
+Every skill name and alias from the taxonomy file is compiled into one
+automaton, so a job listing is scanned in a single linear pass regardless of
+how many skills the taxonomy holds. Matches respect word boundaries and are
+reported under their canonical skill name.
+"""
+import json
+import os
+import threading
+from collections import deque
+
+DEFAULT_TAXONOMY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'skills.json'
+)
+
+
+def _normalize(text):
+    """Lowercase and collapse whitespace runs to single spaces."""
+    return ' '.join(text.lower().split())
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick matcher over a skill taxonomy.
+
+    Args:
+        taxonomy (dict): Mapping of canonical skill name to a list of aliases
+    """
+
+    def __init__(self, taxonomy):
+        self._goto = [{}]       # Transitions per state
+        self._fail = [0]        # Failure link per state
+        self._output = [-1]     # Pattern index ending at this state, or -1
+        self._dict_link = [0]   # Nearest state on the failure chain with an output
+        self._patterns = []     # (normalized phrase, canonical skill)
+
+        seen = set()
+        for skill, aliases in taxonomy.items():
+            for phrase in [skill] + list(aliases):
+                phrase = _normalize(phrase)
+                if phrase and phrase not in seen:
+                    seen.add(phrase)
+                    self._add(phrase, skill)
+        self._build()
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_TAXONOMY_PATH):
+        """
+        Load a matcher from a JSON taxonomy file.
+
+        The file holds ``{"skills": {"canonical": ["alias", ...], ...}}``.
+
+        Args:
+            path (str): Path to the taxonomy file
+
+        Returns:
+            SkillMatcher: Compiled matcher
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('skills', {}))
+
+    @property
+    def skill_count(self):
+        """Number of canonical skills in the taxonomy."""
+        return len({skill for _, skill in self._patterns})
+
+    def _add(self, phrase, skill):
+        state = 0
+        for ch in phrase:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(-1)
+                self._dict_link.append(0)
+            state = next_state
+        self._output[state] = len(self._patterns)
+        self._patterns.append((phrase, skill))
+
+    def _build(self):
+        """Compute failure and dictionary links breadth-first."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                link = self._fail[child]
+                self._dict_link[child] = link if self._output[link] >= 0 else self._dict_link[link]
+
+    def find(self, text):
+        """
+        Find every skill mention in the text.
+
+        Overlapping mentions are resolved leftmost-longest, so "node.js" wins
+        over "node" at the same position.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            list: Dicts with skill, matched phrase, start and end offsets
+        """
+        goto, fail, output, dict_link = self._goto, self._fail, self._output, self._dict_link
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Some characters change length when lowercased; keep offsets valid
+            lowered = ''.join(ch.lower()[0] for ch in text)
+
+        positions = []   # Original offset of each normalized character
+        candidates = []
+        state = 0
+        previous_space = True
+        for index, ch in enumerate(lowered):
+            if ch.isspace():
+                if previous_space:
+                    continue
+                ch = ' '
+                previous_space = True
+            else:
+                previous_space = False
+            positions.append(index)
+
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            hit = state if output[state] >= 0 else dict_link[state]
+            while hit:
+                pattern = output[hit]
+                length = len(self._patterns[pattern][0])
+                start = positions[len(positions) - length]
+                end = index + 1
+                if ((start == 0 or not _is_word_char(lowered[start - 1])) and
+                        (end == len(lowered) or not _is_word_char(lowered[end]))):
+                    candidates.append((start, end, pattern))
+                hit = dict_link[hit]
+
+        candidates.sort(key=lambda c: (c[0], c[0] - c[1]))
+        matches = []
+        last_end = 0
+        for start, end, pattern in candidates:
+            if start < last_end:
+                continue
+            phrase, skill = self._patterns[pattern]
+            matches.append({'skill': skill, 'phrase': text[start:end], 'start': start, 'end': end})
+            last_end = end
+        return matches
+
+    def rank(self, text):
+        """
+        Rank the skills mentioned in the text.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            list: Dicts with skill, count and positions, most frequent first
+                and ties broken by first mention
+        """
+        ranked = {}
+        for match in self.find(text):
+            entry = ranked.setdefault(match['skill'], {'skill': match['skill'], 'count': 0, 'positions': []})
+            entry['count'] += 1
+            entry['positions'].append([match['start'], match['end']])
+        return sorted(ranked.values(), key=lambda e: (-e['count'], e['positions'][0][0]))
+
+
+_default_matcher = None
+_default_lock = threading.Lock()
+
+
+def get_default_matcher():
+    """
+    Return the shared matcher for the bundled taxonomy, loading it on first use.
+
+    Returns:
+        SkillMatcher: Matcher built from data/skills.json
+    """
+    global _default_matcher
+    if _default_matcher is None:
+        with _default_lock:
+            if _default_matcher is None:
+                _default_matcher = SkillMatcher.from_file(DEFAULT_TAXONOMY_PATH)
+    return _default_matcher
@@ -0,0 +1,301 @@
+"""
+Upload Store Module - Content-addressed storage for uploaded resumes.
+
+Each distinct file is stored once, under its SHA-256, in a two-level fan-out
+directory. Uploads get a reference ID that points at the blob; references
+expire after a TTL, blobs without live references are deleted, and a total
+size quota evicts the least recently used blobs. A SQLite index tracks blobs
+and references so several worker processes can share one store.
+"""
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+from modules.metrics import timed
+
+COPY_CHUNK = 1024 * 1024
+
+
+class UploadStore:
+    """
+    Deduplicating blob store with reference TTLs and a size quota.
+
+    Args:
+        root (str): Directory for blobs and the index
+        ttl (float): Seconds a reference lives after it was last used
+        max_bytes (int): Total blob size kept before least recently used
+            blobs are evicted
+    """
+
+    def __init__(self, root, ttl=24 * 3600, max_bytes=1024 * 1024 * 1024):
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._blob_dir = os.path.join(root, 'blobs')
+        os.makedirs(self._blob_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._counters = {'uploads': 0, 'deduplicated': 0, 'sweeps': 0, 'expired_refs': 0,
+                          'deleted_blobs': 0, 'evicted_blobs': 0, 'freed_bytes': 0}
+        self.last_sweep = None
+
+        self._db = sqlite3.connect(os.path.join(root, 'index.sqlite3'), check_same_thread=False, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS blobs ('
+            ' digest TEXT PRIMARY KEY,'
+            ' size INTEGER NOT NULL,'
+            ' created REAL NOT NULL,'
+            ' accessed REAL NOT NULL)'
+        )
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS refs ('
+            ' ref TEXT PRIMARY KEY,'
+            ' digest TEXT NOT NULL,'
+            ' created REAL NOT NULL,'
+            ' accessed REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS refs_digest ON refs (digest)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS refs_accessed ON refs (accessed)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS blobs_accessed ON blobs (accessed)')
+        self._db.commit()
+
+    def blob_path(self, digest):
+        """Path of the blob with the given SHA-256."""
+        return os.path.join(self._blob_dir, digest[:2], digest)
+
+    def add(self, source):
+        """
+        Store an upload and create a reference to it.
+
+        Args:
+            source: File contents as bytes, or a binary file object (read in chunks)
+
+        Returns:
+            str: Reference ID for the upload
+        """
+        with timed('upload_store'):
+            return self._add(source)
+
+    def _add(self, source):
+        fd, tmp_path = tempfile.mkstemp(dir=self._blob_dir, suffix='.part')
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                chunks = [source] if isinstance(source, (bytes, bytearray)) else iter(
+                    lambda: source.read(COPY_CHUNK), b'')
+                for chunk in chunks:
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            digest = digest.hexdigest()
+
+            path = self.blob_path(digest)
+            now = time.time()
+            ref = uuid.uuid4().hex
+            # The write lock serializes this check with sweeps in other processes
+            with self._lock:
+                self._db.execute('BEGIN IMMEDIATE')
+                try:
+                    existing = self._db.execute('SELECT 1 FROM blobs WHERE digest = ?', (digest,)).fetchone()
+                    if existing and os.path.exists(path):
+                        self._counters['deduplicated'] += 1
+                    else:
+                        os.makedirs(os.path.dirname(path), exist_ok=True)
+                        os.replace(tmp_path, path)
+                        tmp_path = None
+                    self._db.execute(
+                        'INSERT INTO blobs (digest, size, created, accessed) VALUES (?, ?, ?, ?)'
+                        ' ON CONFLICT (digest) DO UPDATE SET accessed = excluded.accessed',
+                        (digest, size, now, now)
+                    )
+                    self._db.execute('INSERT INTO refs (ref, digest, created, accessed) VALUES (?, ?, ?, ?)',
+                                     (ref, digest, now, now))
+                    self._db.commit()
+                except BaseException:
+                    self._db.rollback()
+                    raise
+                self._counters['uploads'] += 1
+            return ref
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def digest(self, ref):
+        """
+        Look up the blob digest of a live reference.
+
+        Args:
+            ref (str): Reference ID from add()
+
+        Returns:
+            str or None: SHA-256 of the upload, or None if unknown or expired
+        """
+        if not ref:
+            return None
+        with self._lock:
+            row = self._db.execute('SELECT digest, accessed FROM refs WHERE ref = ?', (ref,)).fetchone()
+            if row is None or row[1] < time.time() - self.ttl:
+                return None
+            return row[0]
+
+    def path(self, ref):
+        """
+        Resolve a reference to its blob file and mark both as recently used.
+
+        Args:
+            ref (str): Reference ID from add()
+
+        Returns:
+            str or None: Path of the blob, or None if unknown, expired or evicted
+        """
+        digest = self.digest(ref)
+        if digest is None:
+            return None
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            return None
+        now = time.time()
+        with self._lock:
+            self._db.execute('UPDATE refs SET accessed = ? WHERE ref = ?', (now, ref))
+            self._db.execute('UPDATE blobs SET accessed = ? WHERE digest = ?', (now, digest))
+            self._db.commit()
+        return path
+
+    def release(self, ref):
+        """Drop a reference; its blob is deleted by the next sweep if unreferenced."""
+        with self._lock:
+            self._db.execute('DELETE FROM refs WHERE ref = ?', (ref,))
+            self._db.commit()
+
+    def sweep(self):
+        """
+        Expire old references, delete unreferenced blobs and enforce the quota.
+
+        Returns:
+            dict: What this sweep removed and how long it took
+        """
+        start = time.perf_counter()
+        now = time.time()
+        with self._lock:
+            # Blob files are removed inside the write transaction, so an upload of the
+            # same content in another process can't reuse a blob that is being deleted
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                expired_refs = self._db.execute('DELETE FROM refs WHERE accessed < ?',
+                                                (now - self.ttl,)).rowcount
+
+                orphans = self._db.execute(
+                    'SELECT digest, size FROM blobs WHERE digest NOT IN (SELECT digest FROM refs)'
+                ).fetchall()
+
+                evicted = []
+                total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+                total -= sum(size for _, size in orphans)
+                if total > self.max_bytes:
+                    for digest, size in self._db.execute(
+                            'SELECT digest, size FROM blobs WHERE digest IN (SELECT digest FROM refs)'
+                            ' ORDER BY accessed').fetchall():
+                        if total <= self.max_bytes:
+                            break
+                        evicted.append((digest, size))
+                        total -= size
+
+                removed = orphans + evicted
+                for digest, _ in evicted:
+                    self._db.execute('DELETE FROM refs WHERE digest = ?', (digest,))
+                self._db.executemany('DELETE FROM blobs WHERE digest = ?', [(digest,) for digest, _ in removed])
+                for digest, _ in removed:
+                    try:
+                        os.remove(self.blob_path(digest))
+                    except OSError:
+                        pass
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+
+        removed_stale = self._remove_stale_files(now - self.ttl)
+
+        result = {
+            'expired_refs': expired_refs,
+            'deleted_blobs': len(orphans),
+            'evicted_blobs': len(evicted),
+            'freed_bytes': sum(size for _, size in removed),
+            'stale_files': removed_stale,
+            'duration': time.perf_counter() - start,
+            'finished': time.time(),
+        }
+        with self._lock:
+            self._counters['sweeps'] += 1
+            for key in ('expired_refs', 'deleted_blobs', 'evicted_blobs', 'freed_bytes'):
+                self._counters[key] += result[key]
+            self.last_sweep = result
+        return result
+
+    def stats(self):
+        """
+        Report store size and cumulative sweep counters.
+
+        Returns:
+            dict: Blob, reference and byte counts, counters and the last sweep
+        """
+        with self._lock:
+            blobs, total = self._db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs').fetchone()
+            refs = self._db.execute('SELECT COUNT(*) FROM refs').fetchone()[0]
+            stats = dict(self._counters)
+            stats.update({'blobs': blobs, 'bytes': total, 'refs': refs, 'max_bytes': self.max_bytes,
+                          'last_sweep': self.last_sweep})
+        return stats
+
+    def _remove_stale_files(self, cutoff):
+        """Remove partial writes abandoned by crashed uploads."""
+        removed = 0
+        for name in os.listdir(self._blob_dir):
+            if not name.endswith('.part'):
+                continue
+            try:
+                path = os.path.join(self._blob_dir, name)
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+class Sweeper:
+    """
+    Background thread that calls cleanup functions at a fixed interval.
+
+    Args:
+        interval (float): Seconds between sweeps
+        targets (list): Callables to run on each sweep
+    """
+
+    def __init__(self, interval, targets):
+        self.interval = interval
+        self.targets = list(targets)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sweeper', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for target in self.targets:
+                try:
+                    target()
+                except Exception as e:
+                    print(f"Sweep with {getattr(target, '__qualname__', target)} failed: {str(e)}")
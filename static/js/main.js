@@ -109,6 +109,118 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Follow the background job on the processing page until it finishes
+    const jobStatus = document.getElementById('job-status');
+    if (jobStatus) {
+        const statusUrl = jobStatus.dataset.statusUrl;
+        const eventsUrl = jobStatus.dataset.eventsUrl;
+        const stateText = document.getElementById('job-state');
+        const stageList = document.getElementById('job-stages');
+        const errorBox = document.getElementById('job-error');
+        const spinner = document.getElementById('job-spinner');
+        const stateMessages = {
+            queued: 'Your request is queued...',
+            running: 'Optimizing your resume... This may take a minute'
+        };
+        const stageLabels = {
+            parse: 'Reading your resume',
+            analyze: 'Analyzing the job listing',
+            optimize: 'Tailoring your resume',
+            generate: 'Building your document'
+        };
+        const stageItems = {};
+        
+        const showError = function(message) {
+            spinner.classList.add('d-none');
+            stateText.classList.add('d-none');
+            errorBox.innerHTML = '';
+            errorBox.appendChild(document.createTextNode(message + ' '));
+            const retryLink = document.createElement('a');
+            retryLink.href = jobStatus.dataset.uploadUrl;
+            retryLink.textContent = 'Try again';
+            errorBox.appendChild(retryLink);
+            errorBox.classList.remove('d-none');
+        };
+        
+        // Show one list entry per stage, updated as its events arrive
+        const showStage = function(event) {
+            const label = stageLabels[event.stage];
+            if (!label) {
+                return;
+            }
+            let item = stageItems[event.stage];
+            if (!item) {
+                item = document.createElement('li');
+                item.className = 'list-group-item d-flex justify-content-between';
+                item.appendChild(document.createElement('span'));
+                item.appendChild(document.createElement('span'));
+                stageItems[event.stage] = item;
+                stageList.appendChild(item);
+                stageList.classList.remove('d-none');
+            }
+            let detail = '...';
+            if (event.status === 'done') {
+                detail = '✓ ' + event.duration.toFixed(2) + 's';
+            } else if (event.status === 'cached') {
+                detail = '✓ cached';
+            } else if (event.status === 'failed') {
+                detail = '✗';
+            }
+            item.firstChild.textContent = label;
+            item.lastChild.textContent = detail;
+            stateText.textContent = stateMessages.running + ' (' + event.elapsed.toFixed(1) + 's)';
+        };
+        
+        const pollStatus = function() {
+            fetch(statusUrl, { headers: { 'Accept': 'application/json' } })
+                .then(function(response) { return response.json(); })
+                .then(function(job) {
+                    if (job.state === 'done') {
+                        window.location.href = job.result_url;
+                    } else if (job.state === 'failed') {
+                        showError('Error optimizing resume: ' + job.error);
+                    } else if (job.error) {
+                        showError(job.error);
+                    } else {
+                        stateText.textContent = stateMessages[job.state] || stateText.textContent;
+                        setTimeout(pollStatus, 1500);
+                    }
+                })
+                .catch(function() {
+                    // Transient network error; keep polling
+                    setTimeout(pollStatus, 3000);
+                });
+        };
+        
+        if (window.EventSource && eventsUrl) {
+            const source = new EventSource(eventsUrl);
+            source.addEventListener('stage', function(message) {
+                const event = JSON.parse(message.data);
+                if (event.stage !== 'job') {
+                    showStage(event);
+                    return;
+                }
+                source.close();
+                if (event.status === 'done') {
+                    window.location.href = event.result_url;
+                } else {
+                    showError('Error optimizing resume: ' + event.error);
+                }
+            });
+            source.addEventListener('end', function() {
+                source.close();
+                pollStatus();
+            });
+            source.onerror = function() {
+                // Stream unavailable (e.g. job expired or proxy buffering); fall back to polling
+                source.close();
+                pollStatus();
+            };
+        } else {
+            pollStatus();
+        }
+    }
+    
     // Download button auto-click on result page after 2 seconds
     const downloadButton = document.querySelector('a[href*="download"]');
     if (downloadButton && window.location.pathname.includes('/result')) {